@@ -0,0 +1,29 @@
+"""GIN indexes on array and JSONB columns
+
+Revision ID: 002_gin_indexes
+Revises: 001_initial_schema
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '002_gin_indexes'
+down_revision = '001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_outings_target_amenities', 'outings', ['target_amenities'], unique=False, postgresql_using='gin')
+    op.create_index('ix_outings_invited_friends', 'outings', ['invited_friends'], unique=False, postgresql_using='gin')
+    op.create_index('ix_outings_rsvp_status', 'outings', ['rsvp_status'], unique=False, postgresql_using='gin', postgresql_ops={'rsvp_status': 'jsonb_path_ops'})
+    op.create_index('ix_marinas_rental_inventory', 'marinas', ['rental_inventory'], unique=False, postgresql_using='gin', postgresql_ops={'rental_inventory': 'jsonb_path_ops'})
+    op.create_index('ix_users_schedule_preferences', 'users', ['schedule_preferences'], unique=False, postgresql_using='gin', postgresql_ops={'schedule_preferences': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_schedule_preferences', table_name='users')
+    op.drop_index('ix_marinas_rental_inventory', table_name='marinas')
+    op.drop_index('ix_outings_rsvp_status', table_name='outings')
+    op.drop_index('ix_outings_invited_friends', table_name='outings')
+    op.drop_index('ix_outings_target_amenities', table_name='outings')
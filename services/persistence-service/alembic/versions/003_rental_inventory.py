@@ -0,0 +1,58 @@
+"""Marina rental inventory and bookings
+
+Revision ID: 003_rental_inventory
+Revises: 002_gin_indexes
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '003_rental_inventory'
+down_revision = '002_gin_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('rental_inventory',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('marina_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('boat_type', sa.String(length=50), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('time_slot', sa.String(length=20), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.Column('available', sa.Integer(), nullable=False),
+    sa.CheckConstraint('available >= 0 AND available <= capacity', name='ck_rental_inventory_available'),
+    sa.ForeignKeyConstraint(['marina_id'], ['marinas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('marina_id', 'boat_type', 'date', 'time_slot', name='uq_rental_inventory_slot')
+    )
+    op.create_index(op.f('ix_rental_inventory_date'), 'rental_inventory', ['date'], unique=False)
+    op.create_index(op.f('ix_rental_inventory_marina_id'), 'rental_inventory', ['marina_id'], unique=False)
+
+    op.create_table('rental_bookings',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('inventory_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['inventory_id'], ['rental_inventory.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rental_bookings_inventory_id'), 'rental_bookings', ['inventory_id'], unique=False)
+    op.create_index(op.f('ix_rental_bookings_user_id'), 'rental_bookings', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_rental_bookings_user_id'), table_name='rental_bookings')
+    op.drop_index(op.f('ix_rental_bookings_inventory_id'), table_name='rental_bookings')
+    op.drop_table('rental_bookings')
+    op.drop_index(op.f('ix_rental_inventory_marina_id'), table_name='rental_inventory')
+    op.drop_index(op.f('ix_rental_inventory_date'), table_name='rental_inventory')
+    op.drop_table('rental_inventory')
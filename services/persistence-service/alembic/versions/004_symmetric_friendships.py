@@ -0,0 +1,40 @@
+"""Symmetric friendship adjacency with covering indexes
+
+Revision ID: 004_symmetric_friendships
+Revises: 003_rental_inventory
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '004_symmetric_friendships'
+down_revision = '003_rental_inventory'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Accepted friendships are stored in both directions from now on.
+    op.execute("""
+        INSERT INTO friendships (id, created_at, updated_at, user_id, friend_id, status)
+        SELECT gen_random_uuid(), created_at, updated_at, friend_id, user_id, status
+        FROM friendships
+        WHERE status = 'accepted'
+        ON CONFLICT ON CONSTRAINT uq_user_friend DO UPDATE SET status = 'accepted'
+    """)
+    op.create_check_constraint('ck_friendships_not_self', 'friendships', 'user_id <> friend_id')
+
+    op.create_index('ix_friendships_user_status_friend', 'friendships', ['user_id', 'status', 'friend_id'], unique=False)
+    op.create_index('ix_friendships_friend_status', 'friendships', ['friend_id', 'status'], unique=False, postgresql_include=['user_id'])
+    op.drop_index('ix_friendships_user_id', table_name='friendships')
+    op.drop_index('ix_friendships_friend_id', table_name='friendships')
+    op.drop_index('ix_friendships_status', table_name='friendships')
+
+
+def downgrade() -> None:
+    op.create_index('ix_friendships_status', 'friendships', ['status'], unique=False)
+    op.create_index('ix_friendships_friend_id', 'friendships', ['friend_id'], unique=False)
+    op.create_index('ix_friendships_user_id', 'friendships', ['user_id'], unique=False)
+    op.drop_index('ix_friendships_friend_status', table_name='friendships')
+    op.drop_index('ix_friendships_user_status_friend', table_name='friendships')
+    op.drop_constraint('ck_friendships_not_self', 'friendships', type_='check')
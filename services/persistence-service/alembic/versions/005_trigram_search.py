@@ -0,0 +1,29 @@
+"""Trigram and prefix search indexes on user and lake names
+
+Revision ID: 005_trigram_search
+Revises: 004_symmetric_friendships
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '005_trigram_search'
+down_revision = '004_symmetric_friendships'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_users_username_trgm', 'users', ['username'], unique=False, postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+    op.create_index('ix_users_username_prefix', 'users', [sa.text('lower(username) COLLATE "C"'), 'id'], unique=False)
+    op.create_index('ix_lakes_name_trgm', 'lakes', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_lakes_name_prefix', 'lakes', [sa.text('lower(name) COLLATE "C"'), 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lakes_name_prefix', table_name='lakes')
+    op.drop_index('ix_lakes_name_trgm', table_name='lakes')
+    op.drop_index('ix_users_username_prefix', table_name='users')
+    op.drop_index('ix_users_username_trgm', table_name='users')
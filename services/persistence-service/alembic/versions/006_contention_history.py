@@ -0,0 +1,70 @@
+"""Partitioned amenity contention history and rolled-up baselines
+
+Revision ID: 006_contention_history
+Revises: 005_trigram_search
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '006_contention_history'
+down_revision = '005_trigram_search'
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created up front; the rollup job keeps creating them
+# ahead of time from then on. Rows outside every monthly partition land in
+# the default partition until their month is created.
+INITIAL_MONTHS_BEFORE = 1
+INITIAL_MONTHS_AFTER = 12
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table('amenity_contention_history',
+    sa.Column('amenity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('observed_on', sa.Date(), nullable=False),
+    sa.Column('slot', sa.SmallInteger(), nullable=False),
+    sa.Column('kind', sa.SmallInteger(), nullable=False),
+    sa.Column('planned_groups', sa.SmallInteger(), nullable=True),
+    sa.Column('attendance', sa.SmallInteger(), nullable=True),
+    sa.Column('score_centi', sa.SmallInteger(), nullable=True),
+    postgresql_partition_by='RANGE (observed_on)'
+    )
+    op.execute('CREATE TABLE amenity_contention_history_default PARTITION OF amenity_contention_history DEFAULT')
+    first = _add_months(date.today().replace(day=1), -INITIAL_MONTHS_BEFORE)
+    for offset in range(INITIAL_MONTHS_BEFORE + INITIAL_MONTHS_AFTER + 1):
+        month = _add_months(first, offset)
+        op.execute(
+            f"CREATE TABLE amenity_contention_history_{month:%Y%m} PARTITION OF amenity_contention_history "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+
+    op.create_table('amenity_contention_baselines',
+    sa.Column('amenity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('day_of_week', sa.SmallInteger(), nullable=False),
+    sa.Column('slot', sa.SmallInteger(), nullable=False),
+    sa.Column('sample_days', sa.Integer(), nullable=False),
+    sa.Column('avg_planned_groups', sa.REAL(), nullable=True),
+    sa.Column('avg_attendance', sa.REAL(), nullable=True),
+    sa.Column('p90_attendance', sa.REAL(), nullable=True),
+    sa.Column('avg_score', sa.REAL(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['amenity_id'], ['amenities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('amenity_id', 'day_of_week', 'slot')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('amenity_contention_baselines')
+    # Dropping the parent drops every partition with it.
+    op.drop_table('amenity_contention_history')
@@ -0,0 +1,51 @@
+"""Normalized facility schedules and precomputed availability windows
+
+Revision ID: 007_availability_windows
+Revises: 006_contention_history
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '007_availability_windows'
+down_revision = '006_contention_history'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('facility_schedules',
+    sa.Column('facility_type', sa.String(length=20), nullable=False),
+    sa.Column('facility_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('day_of_week', sa.SmallInteger(), nullable=False),
+    sa.Column('lake_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('opens_kind', sa.SmallInteger(), nullable=False),
+    sa.Column('opens_minute', sa.SmallInteger(), nullable=False),
+    sa.Column('closes_kind', sa.SmallInteger(), nullable=False),
+    sa.Column('closes_minute', sa.SmallInteger(), nullable=False),
+    sa.Column('season_start', sa.SmallInteger(), nullable=True),
+    sa.Column('season_end', sa.SmallInteger(), nullable=True),
+    sa.Column('source_updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('facility_type', 'facility_id', 'day_of_week')
+    )
+    op.create_index('ix_facility_schedules_lake_day', 'facility_schedules', ['lake_id', 'day_of_week'], unique=False)
+
+    op.create_table('availability_windows',
+    sa.Column('facility_type', sa.String(length=20), nullable=False),
+    sa.Column('facility_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('lake_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('opens_minute', sa.SmallInteger(), nullable=False),
+    sa.Column('closes_minute', sa.SmallInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('facility_type', 'facility_id', 'day')
+    )
+    op.create_index('ix_availability_windows_day_lake', 'availability_windows', ['day', 'lake_id', 'facility_type', 'opens_minute'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_availability_windows_day_lake', table_name='availability_windows')
+    op.drop_table('availability_windows')
+    op.drop_index('ix_facility_schedules_lake_day', table_name='facility_schedules')
+    op.drop_table('facility_schedules')
@@ -0,0 +1,89 @@
+"""Move outing invitees and RSVPs into outing_participants
+
+Revision ID: 008_outing_participants
+Revises: 007_availability_windows
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '008_outing_participants'
+down_revision = '007_availability_windows'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('outing_participants',
+    sa.Column('outing_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('responded_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['outing_id'], ['outings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('outing_id', 'user_id')
+    )
+
+    # Invitees first, then RSVPs on top. Free-form RSVP values are mapped
+    # onto the statuses the API accepts; ids that aren't users are dropped.
+    op.execute("""
+        INSERT INTO outing_participants (outing_id, user_id, status, created_at, updated_at)
+        SELECT DISTINCT ON (outings.id, users.id) outings.id, users.id, 'invited', outings.created_at, outings.updated_at
+        FROM outings
+        CROSS JOIN LATERAL unnest(outings.invited_friends) AS invited(user_id)
+        JOIN users ON users.id = invited.user_id
+    """)
+    op.execute("""
+        INSERT INTO outing_participants (outing_id, user_id, status, responded_at, created_at, updated_at)
+        SELECT outings.id, users.id, rsvp.status,
+               CASE WHEN rsvp.status <> 'invited' THEN outings.updated_at END,
+               outings.created_at, outings.updated_at
+        FROM outings
+        CROSS JOIN LATERAL (
+            SELECT key,
+                   CASE
+                       WHEN lower(value) IN ('accepted', 'accept', 'yes', 'going', 'attending') THEN 'accepted'
+                       WHEN lower(value) IN ('declined', 'decline', 'no', 'not going') THEN 'declined'
+                       WHEN lower(value) IN ('maybe', 'tentative') THEN 'maybe'
+                       ELSE 'invited'
+                   END AS status
+            FROM jsonb_each_text(CASE WHEN jsonb_typeof(outings.rsvp_status) = 'object' THEN outings.rsvp_status END)
+        ) AS rsvp
+        JOIN users ON users.id::text = rsvp.key
+        ON CONFLICT (outing_id, user_id) DO UPDATE SET
+            status = excluded.status,
+            responded_at = excluded.responded_at
+    """)
+    op.create_index('ix_outing_participants_user_status', 'outing_participants', ['user_id', 'status'], unique=False, postgresql_include=['outing_id'])
+
+    op.drop_index('ix_outings_rsvp_status', table_name='outings')
+    op.drop_index('ix_outings_invited_friends', table_name='outings')
+    op.drop_column('outings', 'rsvp_status')
+    op.drop_column('outings', 'invited_friends')
+
+
+def downgrade() -> None:
+    op.add_column('outings', sa.Column('invited_friends', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=True))
+    op.add_column('outings', sa.Column('rsvp_status', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.execute("""
+        UPDATE outings
+        SET invited_friends = participants.invited_friends,
+            rsvp_status = participants.rsvp_status
+        FROM (
+            SELECT outing_id,
+                   array_agg(user_id ORDER BY created_at) AS invited_friends,
+                   jsonb_object_agg(user_id::text, status) FILTER (WHERE status <> 'invited') AS rsvp_status
+            FROM outing_participants
+            GROUP BY outing_id
+        ) AS participants
+        WHERE outings.id = participants.outing_id
+    """)
+    op.create_index('ix_outings_invited_friends', 'outings', ['invited_friends'], unique=False, postgresql_using='gin')
+    op.create_index('ix_outings_rsvp_status', 'outings', ['rsvp_status'], unique=False, postgresql_using='gin', postgresql_ops={'rsvp_status': 'jsonb_path_ops'})
+
+    op.drop_index('ix_outing_participants_user_status', table_name='outing_participants')
+    op.drop_table('outing_participants')
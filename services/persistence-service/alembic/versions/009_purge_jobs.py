@@ -0,0 +1,41 @@
+"""Background purge jobs
+
+Revision ID: 009_purge_jobs
+Revises: 008_outing_participants
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '009_purge_jobs'
+down_revision = '008_outing_participants'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('purge_jobs',
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=False),
+    sa.Column('deleted_rows', sa.Integer(), nullable=False),
+    sa.Column('current_table', sa.String(length=100), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_purge_jobs_entity_id'), 'purge_jobs', ['entity_id'], unique=False)
+    op.create_index(op.f('ix_purge_jobs_status'), 'purge_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_purge_jobs_status'), table_name='purge_jobs')
+    op.drop_index(op.f('ix_purge_jobs_entity_id'), table_name='purge_jobs')
+    op.drop_table('purge_jobs')
@@ -0,0 +1,84 @@
+"""Lake boundary geometry, simplified tiles and tile invalidation
+
+Revision ID: 010_lake_boundaries
+Revises: 009_purge_jobs
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.geometry import Geometry
+
+revision = '010_lake_boundaries'
+down_revision = '009_purge_jobs'
+branch_labels = None
+depends_on = None
+
+POINT_TABLES = ('amenities', 'boat_ramps', 'marinas')
+# Columns rendered into tiles; updates touching only other columns (e.g.
+# marina rental inventory) leave cached tiles valid.
+TILE_SOURCE_COLUMNS = {
+    'lakes': ('name', 'boundary'),
+    'amenities': ('lake_id', 'type', 'name', 'latitude', 'longitude'),
+    'boat_ramps': ('lake_id', 'name', 'latitude', 'longitude', 'is_active'),
+    'marinas': ('lake_id', 'name', 'latitude', 'longitude', 'is_active'),
+    'lake_boundaries_simplified': ('lake_id', 'zoom', 'geom'),
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    op.add_column('lakes', sa.Column('boundary', Geometry('MULTIPOLYGON', 4326), nullable=True))
+    op.create_index('ix_lakes_boundary', 'lakes', ['boundary'], unique=False, postgresql_using='gist')
+
+    op.create_table('lake_boundaries_simplified',
+    sa.Column('lake_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('zoom', sa.SmallInteger(), nullable=False),
+    sa.Column('geom', Geometry('MULTIPOLYGON', 3857), nullable=False),
+    sa.ForeignKeyConstraint(['lake_id'], ['lakes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('lake_id', 'zoom')
+    )
+    op.create_index('ix_lake_boundaries_simplified_geom', 'lake_boundaries_simplified', ['geom'], unique=False, postgresql_using='gist')
+
+    for table in POINT_TABLES:
+        op.create_index(f'ix_{table}_location', table, [sa.text(f'ST_SetSRID(ST_MakePoint({table}.longitude::float8, {table}.latitude::float8), 4326)')], unique=False, postgresql_using='gist')
+
+    # Tile cache invalidation: any write to a table that feeds the vector
+    # tiles bumps a single generation counter, which every API process
+    # compares against the generation its cached tiles were rendered at.
+    op.create_table('tile_generation',
+    sa.Column('id', sa.SmallInteger(), autoincrement=False, nullable=False),
+    sa.Column('generation', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO tile_generation (id, generation) VALUES (1, 0)")
+    op.execute("""
+        CREATE FUNCTION bump_tile_generation() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tile_generation SET generation = generation + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table, columns in TILE_SOURCE_COLUMNS.items():
+        op.execute(f"""
+            CREATE TRIGGER {table}_tile_generation
+            AFTER INSERT OR UPDATE OF {', '.join(columns)} OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_tile_generation()
+        """)
+
+
+def downgrade() -> None:
+    for table in TILE_SOURCE_COLUMNS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tile_generation ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_tile_generation()")
+    op.drop_table('tile_generation')
+    for table in POINT_TABLES:
+        op.drop_index(f'ix_{table}_location', table_name=table)
+    op.drop_index('ix_lake_boundaries_simplified_geom', table_name='lake_boundaries_simplified')
+    op.drop_table('lake_boundaries_simplified')
+    op.drop_index('ix_lakes_boundary', table_name='lakes')
+    op.drop_column('lakes', 'boundary')
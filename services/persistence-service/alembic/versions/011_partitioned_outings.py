@@ -0,0 +1,129 @@
+"""Range-partition outings by planned_date
+
+Revision ID: 011_partitioned_outings
+Revises: 010_lake_boundaries
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '011_partitioned_outings'
+down_revision = '010_lake_boundaries'
+branch_labels = None
+depends_on = None
+
+# Monthly partitions are created from the month of the oldest existing
+# outing through this many months ahead; app.jobs.outing_partitions keeps
+# creating them ahead of time from then on.
+INITIAL_MONTHS_AHEAD = 24
+
+COLUMNS = 'id, created_at, updated_at, user_id, lake_id, planned_date, time_slot, target_amenities, notes'
+
+
+def _outing_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('lake_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('planned_date', sa.Date(), nullable=False),
+        sa.Column('time_slot', sa.String(length=20), nullable=False),
+        sa.Column('target_amenities', postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['lake_id'], ['lakes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def upgrade() -> None:
+    op.drop_constraint('outing_participants_outing_id_fkey', 'outing_participants', type_='foreignkey')
+    op.drop_index('ix_outings_target_amenities', table_name='outings')
+    op.drop_index('ix_outings_user_id', table_name='outings')
+    op.drop_index('ix_outings_time_slot', table_name='outings')
+    op.drop_index('ix_outings_planned_date', table_name='outings')
+    op.drop_index('ix_outings_lake_id', table_name='outings')
+    op.rename_table('outings', 'outings_unpartitioned')
+    op.execute('ALTER INDEX outings_pkey RENAME TO outings_unpartitioned_pkey')
+
+    op.create_table('outings',
+    *_outing_columns(),
+    sa.PrimaryKeyConstraint('id', 'planned_date'),
+    postgresql_partition_by='RANGE (planned_date)'
+    )
+    # There is deliberately no default partition: rows can't be moved out
+    # of one without cascading their participants, so an outing on a month
+    # without a partition is rejected instead.
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date := date_trunc('month', least(
+                (SELECT min(planned_date) FROM outings_unpartitioned), current_date
+            ))::date;
+            last_month date := date_trunc('month', greatest(
+                (SELECT max(planned_date) FROM outings_unpartitioned),
+                current_date + interval '{INITIAL_MONTHS_AHEAD} months'
+            ))::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF outings FOR VALUES FROM (%L) TO (%L)',
+                    'outings_' || to_char(month, 'YYYYMM'), month, (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END
+        $$
+    """)
+    op.execute(f'INSERT INTO outings ({COLUMNS}) SELECT {COLUMNS} FROM outings_unpartitioned')
+
+    # Indexes match the query shapes: a user's or a lake's outings over a
+    # date range (optionally one slot), and amenity overlap for contention.
+    op.create_index('ix_outings_user_date', 'outings', ['user_id', 'planned_date'], unique=False)
+    op.create_index('ix_outings_lake_date_slot', 'outings', ['lake_id', 'planned_date', 'time_slot'], unique=False)
+    op.create_index('ix_outings_target_amenities', 'outings', ['target_amenities'], unique=False, postgresql_using='gin')
+
+    op.add_column('outing_participants', sa.Column('planned_date', sa.Date(), nullable=True))
+    op.execute("""
+        UPDATE outing_participants
+        SET planned_date = outings.planned_date
+        FROM outings
+        WHERE outings.id = outing_participants.outing_id
+    """)
+    op.alter_column('outing_participants', 'planned_date', nullable=False)
+    op.create_foreign_key(
+        'outing_participants_outing_fkey', 'outing_participants', 'outings',
+        ['outing_id', 'planned_date'], ['id', 'planned_date'], ondelete='CASCADE', onupdate='CASCADE'
+    )
+    op.drop_index('ix_outing_participants_user_status', table_name='outing_participants')
+    op.create_index('ix_outing_participants_user_status', 'outing_participants', ['user_id', 'status', 'planned_date'], unique=False, postgresql_include=['outing_id'])
+
+    op.drop_table('outings_unpartitioned')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outing_participants_user_status', table_name='outing_participants')
+    op.create_index('ix_outing_participants_user_status', 'outing_participants', ['user_id', 'status'], unique=False, postgresql_include=['outing_id'])
+    op.drop_constraint('outing_participants_outing_fkey', 'outing_participants', type_='foreignkey')
+    op.drop_column('outing_participants', 'planned_date')
+
+    op.create_table('outings_unpartitioned',
+    *_outing_columns(),
+    sa.PrimaryKeyConstraint('id', name='outings_unpartitioned_pkey')
+    )
+    op.execute(f'INSERT INTO outings_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM outings')
+    # Dropping the parent drops every partition with it.
+    op.drop_table('outings')
+    op.rename_table('outings_unpartitioned', 'outings')
+    op.execute('ALTER INDEX outings_unpartitioned_pkey RENAME TO outings_pkey')
+
+    op.create_index(op.f('ix_outings_lake_id'), 'outings', ['lake_id'], unique=False)
+    op.create_index(op.f('ix_outings_planned_date'), 'outings', ['planned_date'], unique=False)
+    op.create_index(op.f('ix_outings_time_slot'), 'outings', ['time_slot'], unique=False)
+    op.create_index(op.f('ix_outings_user_id'), 'outings', ['user_id'], unique=False)
+    op.create_index('ix_outings_target_amenities', 'outings', ['target_amenities'], unique=False, postgresql_using='gin')
+    op.create_foreign_key(
+        'outing_participants_outing_id_fkey', 'outing_participants', 'outings', ['outing_id'], ['id'], ondelete='CASCADE'
+    )
@@ -0,0 +1,41 @@
+"""Add outing_reassignments for the weekend allocation optimizer
+
+Revision ID: 012_outing_reassignments
+Revises: 011_partitioned_outings
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '012_outing_reassignments'
+down_revision = '011_partitioned_outings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('outing_reassignments',
+    sa.Column('outing_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('from_amenity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('planned_date', sa.Date(), nullable=False),
+    sa.Column('lake_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('to_amenity_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('distance_m', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['outing_id', 'planned_date'], ['outings.id', 'outings.planned_date'], name='outing_reassignments_outing_fkey', ondelete='CASCADE', onupdate='CASCADE'),
+    sa.ForeignKeyConstraint(['from_amenity_id'], ['amenities.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['to_amenity_id'], ['amenities.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['lake_id'], ['lakes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('outing_id', 'from_amenity_id')
+    )
+    op.create_index('ix_outing_reassignments_lake_date', 'outing_reassignments', ['lake_id', 'planned_date'], unique=False)
+    op.create_index('ix_outing_reassignments_to_amenity', 'outing_reassignments', ['to_amenity_id', 'planned_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outing_reassignments_to_amenity', table_name='outing_reassignments')
+    op.drop_index('ix_outing_reassignments_lake_date', table_name='outing_reassignments')
+    op.drop_table('outing_reassignments')
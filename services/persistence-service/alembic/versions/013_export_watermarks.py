@@ -0,0 +1,36 @@
+"""Add export_watermarks and watermark indexes for the analytics export
+
+Revision ID: 013_export_watermarks
+Revises: 012_outing_reassignments
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '013_export_watermarks'
+down_revision = '012_outing_reassignments'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('export_watermarks',
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('exported_through', sa.DateTime(), nullable=False),
+    sa.Column('rows_exported', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('source')
+    )
+    # Each export run reads one watermark range per source table.
+    # audit_log.created_at is indexed already.
+    op.create_index('ix_outings_updated_at', 'outings', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_amenity_contention_updated_at'), 'amenity_contention', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_weather_forecasts_fetched_at'), 'weather_forecasts', ['fetched_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_weather_forecasts_fetched_at'), table_name='weather_forecasts')
+    op.drop_index(op.f('ix_amenity_contention_updated_at'), table_name='amenity_contention')
+    op.drop_index('ix_outings_updated_at', table_name='outings')
+    op.drop_table('export_watermarks')
@@ -0,0 +1,75 @@
+"""Stripe tile_generation counters per table and backend
+
+Revision ID: 014_striped_tile_generation
+Revises: 013_export_watermarks
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '014_striped_tile_generation'
+down_revision = '013_export_watermarks'
+branch_labels = None
+depends_on = None
+
+TILE_SOURCE_TABLES = ('lakes', 'amenities', 'boat_ramps', 'marinas', 'lake_boundaries_simplified')
+STRIPES = 16
+
+
+def upgrade() -> None:
+    # Every write to a tile source used to update the one tile_generation
+    # row and hold its lock until commit, serializing all writers of those
+    # tables. Each statement now bumps one of STRIPES rows of its own table,
+    # picked by backend, so concurrent transactions rarely share a row. The
+    # generation is the sum of the counters: it still only moves when a
+    # writer commits, so tiles are never cached under a generation whose
+    # changes were not yet visible, as they could be with a sequence.
+    op.add_column('tile_generation', sa.Column('source_table', sa.String(length=63), nullable=True))
+    op.add_column('tile_generation', sa.Column('stripe', sa.SmallInteger(), nullable=True))
+    # The existing count stays in the first row, so that the sum, which tile
+    # ETags are built from, never goes back to a value clients have seen.
+    op.execute(f"UPDATE tile_generation SET source_table = '{TILE_SOURCE_TABLES[0]}', stripe = 0")
+    op.drop_constraint('tile_generation_pkey', 'tile_generation', type_='primary')
+    op.drop_column('tile_generation', 'id')
+    op.alter_column('tile_generation', 'source_table', nullable=False)
+    op.alter_column('tile_generation', 'stripe', nullable=False)
+    op.create_primary_key('tile_generation_pkey', 'tile_generation', ['source_table', 'stripe'])
+    op.execute(f"""
+        INSERT INTO tile_generation (source_table, stripe, generation)
+        SELECT source_table, stripe, 0
+        FROM unnest(ARRAY{list(TILE_SOURCE_TABLES)}::text[]) AS source_table,
+             generate_series(0, {STRIPES - 1}) AS stripe
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_tile_generation() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tile_generation SET generation = generation + 1
+            WHERE source_table = TG_TABLE_NAME AND stripe = pg_backend_pid() % {STRIPES};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_tile_generation() RETURNS trigger AS $$
+        BEGIN
+            UPDATE tile_generation SET generation = generation + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        UPDATE tile_generation SET generation = (SELECT sum(generation) FROM tile_generation)
+        WHERE source_table = '{TILE_SOURCE_TABLES[0]}' AND stripe = 0
+    """)
+    op.execute(f"DELETE FROM tile_generation WHERE NOT (source_table = '{TILE_SOURCE_TABLES[0]}' AND stripe = 0)")
+    op.drop_constraint('tile_generation_pkey', 'tile_generation', type_='primary')
+    op.add_column('tile_generation', sa.Column('id', sa.SmallInteger(), server_default='1', nullable=False))
+    op.alter_column('tile_generation', 'id', server_default=None)
+    op.drop_column('tile_generation', 'stripe')
+    op.drop_column('tile_generation', 'source_table')
+    op.create_primary_key('tile_generation_pkey', 'tile_generation', ['id'])
@@ -1,14 +1,29 @@
-from fastapi import APIRouter
-from .users import router as users_router
+from fastapi import APIRouter, Depends
+from .auth import require_auth, router as auth_router
+from .users import public_router as users_public_router, router as users_router
 from .lakes import router as lakes_router
 from .amenities import router as amenities_router
 from .boat_ramps import router as boat_ramps_router
+from .marinas import router as marinas_router
 from .outings import router as outings_router
+from .friends import router as friends_router
+from .purge_jobs import router as purge_jobs_router
+from .live import router as live_router
+from .tiles import router as tiles_router
 
 api_router = APIRouter()
 
-api_router.include_router(users_router, prefix="/users", tags=["users"])
-api_router.include_router(lakes_router, prefix="/lakes", tags=["lakes"])
-api_router.include_router(amenities_router, prefix="/amenities", tags=["amenities"])
-api_router.include_router(boat_ramps_router, prefix="/boat-ramps", tags=["boat-ramps"])
-api_router.include_router(outings_router, prefix="/outings", tags=["outings"])
+AUTHENTICATED = [Depends(require_auth)]
+
+api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
+api_router.include_router(users_public_router, prefix="/users", tags=["users"])
+api_router.include_router(users_router, prefix="/users", tags=["users"], dependencies=AUTHENTICATED)
+api_router.include_router(lakes_router, prefix="/lakes", tags=["lakes"], dependencies=AUTHENTICATED)
+api_router.include_router(amenities_router, prefix="/amenities", tags=["amenities"], dependencies=AUTHENTICATED)
+api_router.include_router(boat_ramps_router, prefix="/boat-ramps", tags=["boat-ramps"], dependencies=AUTHENTICATED)
+api_router.include_router(marinas_router, prefix="/marinas", tags=["marinas"], dependencies=AUTHENTICATED)
+api_router.include_router(outings_router, prefix="/outings", tags=["outings"], dependencies=AUTHENTICATED)
+api_router.include_router(friends_router, prefix="/friends", tags=["friends"], dependencies=AUTHENTICATED)
+api_router.include_router(purge_jobs_router, prefix="/purge-jobs", tags=["purge-jobs"], dependencies=AUTHENTICATED)
+api_router.include_router(live_router, prefix="/live", tags=["live"], dependencies=AUTHENTICATED)
+api_router.include_router(tiles_router, prefix="/tiles", tags=["tiles"], dependencies=AUTHENTICATED)
@@ -1,59 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
+from app.api.bulk import bulk_insert
+from app.api.caching import (
+    REFERENCE_CACHE_CONTROL, entity_etag, entity_not_modified, is_not_modified, not_modified,
+    set_validators, statement_version,
+)
+from app.api.coalescing import SharedResponse, request_key, single_flight
+from app.api.formats import msgpack_response, wants_msgpack
+from app.api.lookups import exists_by_id, get_by_id
+from app.api.patching import patch_entity
+from app.api.streaming import stream_ndjson, stream_paged, wants_ndjson
 from app.core import get_db
-from app.models import Amenity
+from app.core.time_slots import slot_name
+from app.models import Amenity, AmenityContentionBaseline
+from app.schemas import AmenityCreate, AmenityUpdate, AttendanceCreate
+from app.services import purge
+from app.services.contention import record_attendance
 
 router = APIRouter()
 
 
+def _serialize_amenity(amenity) -> dict:
+    return {
+        "id": str(amenity.id),
+        "lake_id": str(amenity.lake_id),
+        "type": amenity.type,
+        "name": amenity.name,
+        "latitude": float(amenity.latitude),
+        "longitude": float(amenity.longitude),
+        "capacity_score": amenity.capacity_score,
+        "hours_of_operation": amenity.hours_of_operation,
+    }
+
+
+def _serialize_amenity_summary(amenity) -> dict:
+    return {
+        "id": str(amenity.id),
+        "lake_id": str(amenity.lake_id),
+        "type": amenity.type,
+        "name": amenity.name,
+        "latitude": float(amenity.latitude),
+        "longitude": float(amenity.longitude),
+        "capacity_score": amenity.capacity_score,
+    }
+
+
+# Lake and type filters as lambda statements (see app/api/lookups.py), so
+# each combination is cached without rebuilding its cache key per request.
+def _amenity_filters(stmt, lake_id: Optional[UUID], amenity_type: Optional[str]):
+    if lake_id:
+        stmt += lambda s: s.where(Amenity.lake_id == lake_id)
+    if amenity_type:
+        stmt += lambda s: s.where(Amenity.type == amenity_type)
+    return stmt
+
+
 @router.get("/", response_model=List[dict])
 def list_amenities(
+    request: Request,
+    response: Response,
     lake_id: Optional[UUID] = Query(None),
     amenity_type: Optional[str] = Query(None),
+    stream: bool = Query(False),
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Amenity)
+    stmt = _amenity_filters(lambda_stmt(lambda: select(Amenity)), lake_id, amenity_type)
+    version = _amenity_filters(
+        lambda_stmt(lambda: select(func.count(Amenity.id), func.max(Amenity.updated_at))), lake_id, amenity_type
+    )
 
-    if lake_id:
-        query = query.filter(Amenity.lake_id == lake_id)
-    if amenity_type:
-        query = query.filter(Amenity.type == amenity_type)
+    # Identical concurrent requests (a trending lake) share the version query
+    # and then, per version, one rendered page; see app/api/coalescing.py.
+    ndjson = wants_ndjson(request, stream)
+    use_msgpack = not ndjson and wants_msgpack(request)
+    variant = "ndjson" if ndjson else "msgpack" if use_msgpack else ""
+    key = request_key(request, variant)
+    etag = single_flight.do(key + ("version",), lambda: statement_version(request, db, version, variant))
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, REFERENCE_CACHE_CONTROL, "Accept")
+    set_validators(response, etag, None, REFERENCE_CACHE_CONTROL, "Accept")
 
-    amenities = query.offset(skip).limit(limit).all()
-    return [
-        {
-            "id": str(amenity.id),
-            "lake_id": str(amenity.lake_id),
-            "type": amenity.type,
-            "name": amenity.name,
-            "latitude": float(amenity.latitude),
-            "longitude": float(amenity.longitude),
-            "capacity_score": amenity.capacity_score,
-        }
-        for amenity in amenities
-    ]
+    stmt += lambda s: s.order_by(Amenity.id)
+    if ndjson:
+        if stream_paged(request):
+            stmt += lambda s: s.offset(skip).limit(limit)
+        return stream_ndjson(stmt, _serialize_amenity_summary, response.headers)
+
+    def render() -> SharedResponse:
+        amenities = db.scalars(stmt + (lambda s: s.offset(skip).limit(limit))).all()
+        content = [_serialize_amenity_summary(amenity) for amenity in amenities]
+        rendered = msgpack_response(content) if use_msgpack else JSONResponse(content)
+        return SharedResponse.of(rendered, etag, None)
+
+    return single_flight.do(key + (etag,), render).respond(request, REFERENCE_CACHE_CONTROL, "Accept")
 
 
 @router.get("/{amenity_id}", response_model=dict)
-def get_amenity(amenity_id: UUID, db: Session = Depends(get_db)):
-    amenity = db.query(Amenity).filter(Amenity.id == amenity_id).first()
+def get_amenity(amenity_id: UUID, request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = entity_not_modified(request, db, Amenity, amenity_id, REFERENCE_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    amenity = get_by_id(db, Amenity, amenity_id)
     if not amenity:
         raise HTTPException(status_code=404, detail="Amenity not found")
-    return {
-        "id": str(amenity.id),
-        "lake_id": str(amenity.lake_id),
-        "type": amenity.type,
-        "name": amenity.name,
-        "latitude": float(amenity.latitude),
-        "longitude": float(amenity.longitude),
-        "capacity_score": amenity.capacity_score,
-        "hours_of_operation": amenity.hours_of_operation,
-    }
+    set_validators(response, entity_etag(amenity.id, amenity.updated_at), amenity.updated_at, REFERENCE_CACHE_CONTROL)
+    return _serialize_amenity(amenity)
 
 
 @router.post(
@@ -89,12 +148,108 @@ def create_amenity(amenity_data: dict, db: Session = Depends(get_db)):
     return {"id": str(amenity.id), "type": amenity.type, "name": amenity.name}
 
 
+@router.post(
+    "/bulk",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"lake_id": "00000000-0000-0000-0000-000000000000", "type": "rope_swing", "name": "Boone Lake Rope Swing", "latitude": 36.433912, "longitude": -82.397390, "capacity_score": 15},
+                        {"lake_id": "00000000-0000-0000-0000-000000000000", "type": "picnic_area", "name": "Pickens Bridge Picnic Area", "latitude": 36.452104, "longitude": -82.409331, "capacity_score": 30}
+                    ]
+                }
+            }
+        }
+    }
+)
+def create_amenities_bulk(
+    amenities_data: List[dict],
+    response: Response,
+    atomic: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    return bulk_insert(
+        db,
+        response,
+        Amenity,
+        AmenityCreate,
+        amenities_data,
+        returning=[Amenity.id, Amenity.type, Amenity.name],
+        serialize=lambda amenity: {"id": str(amenity.id), "type": amenity.type, "name": amenity.name},
+        atomic=atomic,
+    )
+
+
+@router.patch("/{amenity_id}", response_model=dict)
+def update_amenity(
+    amenity_id: UUID,
+    amenity_data: dict,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    return patch_entity(
+        db,
+        request,
+        response,
+        Amenity,
+        AmenityUpdate,
+        amenity_id,
+        amenity_data,
+        returning=[Amenity.id, Amenity.lake_id, Amenity.type, Amenity.name, Amenity.latitude, Amenity.longitude, Amenity.capacity_score, Amenity.hours_of_operation],
+        serialize=_serialize_amenity,
+        not_found="Amenity not found",
+    )
+
+
 @router.delete("/{amenity_id}", status_code=204)
 def delete_amenity(amenity_id: UUID, db: Session = Depends(get_db)):
-    amenity = db.query(Amenity).filter(Amenity.id == amenity_id).first()
+    amenity = get_by_id(db, Amenity, amenity_id)
     if not amenity:
         raise HTTPException(status_code=404, detail="Amenity not found")
 
+    purge.delete_facility_rows(db, "amenity", amenity_id)
     db.delete(amenity)
     db.commit()
     return None
+
+
+@router.post("/{amenity_id}/attendance", response_model=dict, status_code=201)
+def create_attendance(amenity_id: UUID, attendance: AttendanceCreate, db: Session = Depends(get_db)):
+    if not exists_by_id(db, Amenity, amenity_id):
+        raise HTTPException(status_code=404, detail="Amenity not found")
+
+    record_attendance(db, amenity_id, attendance.date, attendance.time_slot, attendance.attendance)
+    db.commit()
+    return {
+        "amenity_id": str(amenity_id),
+        "date": attendance.date.isoformat(),
+        "time_slot": attendance.time_slot,
+        "attendance": attendance.attendance,
+    }
+
+
+@router.get("/{amenity_id}/baselines", response_model=List[dict])
+def list_contention_baselines(amenity_id: UUID, db: Session = Depends(get_db)):
+    baselines = (
+        db.query(AmenityContentionBaseline)
+        .filter(AmenityContentionBaseline.amenity_id == amenity_id)
+        .order_by(AmenityContentionBaseline.day_of_week, AmenityContentionBaseline.slot)
+        .all()
+    )
+    return [
+        {
+            "day_of_week": baseline.day_of_week,
+            "time_slot": slot_name(baseline.slot),
+            "sample_days": baseline.sample_days,
+            "avg_planned_groups": baseline.avg_planned_groups,
+            "avg_attendance": baseline.avg_attendance,
+            "p90_attendance": baseline.p90_attendance,
+            "avg_score": baseline.avg_score,
+            "updated_at": baseline.updated_at.isoformat(),
+        }
+        for baseline in baselines
+    ]
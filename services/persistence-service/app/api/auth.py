@@ -0,0 +1,111 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocketException, status
+from fastapi.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+
+from app.core import SessionLocal
+from app.core.config import settings
+from app.core.passwords import PasswordHashingBusy, password_hasher
+from app.core.security import TokenError, issue_token, verify_token
+from app.models import User
+from app.schemas import TokenRequest
+
+router = APIRouter()
+
+# EventSource and browser WebSockets cannot set an Authorization header, so
+# live streams also accept the token as ?access_token=.
+QUERY_TOKEN_PATHS = ("/api/v1/live/",)
+
+
+def _unauthorized(connection: HTTPConnection, detail: str) -> Exception:
+    if connection.scope["type"] == "websocket":
+        return WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=detail)
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+def _bearer_token(connection: HTTPConnection) -> Optional[str]:
+    authorization = connection.headers.get("authorization")
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        return token.strip() if scheme.lower() == "bearer" else None
+    if connection.scope["path"].startswith(QUERY_TOKEN_PATHS):
+        return connection.query_params.get("access_token")
+    return None
+
+
+# Router-level dependency for every authenticated route. Returns the token
+# claims, or None when AUTH_REQUIRED is off and no token was sent. It is
+# async so that verification, a cache hit for a token seen before, runs
+# inline on the event loop instead of hopping to the threadpool.
+async def require_auth(connection: HTTPConnection) -> Optional[dict]:
+    token = _bearer_token(connection)
+    if not token:
+        if not settings.AUTH_REQUIRED:
+            return None
+        raise _unauthorized(connection, "Not authenticated")
+    try:
+        return verify_token(token)
+    except TokenError as e:
+        raise _unauthorized(connection, str(e))
+
+
+# Routes that act on other users' accounts. Like require_auth, lets every
+# request through while AUTH_REQUIRED is off and no token was sent.
+async def require_admin(claims: Optional[dict] = Depends(require_auth)) -> Optional[dict]:
+    if claims is not None and not claims.get("admin"):
+        raise HTTPException(status_code=403, detail="Administrator token required")
+    return claims
+
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many password operations in progress, retry later",
+        headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+    )
+
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+
+
+# Opens its own session so that no pooled connection is held while the
+# password is checked.
+def _find_user(username: str):
+    with SessionLocal() as db:
+        return db.query(User.id, User.username, User.password_hash).filter(User.username == username).first()
+
+
+@router.post(
+    "/token",
+    response_model=dict,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": {"username": "hsimpson", "password": "correct horse battery staple"}
+                }
+            }
+        }
+    }
+)
+async def create_token(credentials: TokenRequest):
+    user = await run_in_threadpool(_find_user, credentials.username)
+    try:
+        verified = await password_hasher.verify(credentials.password, user.password_hash if user else None)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    if not verified:
+        raise HTTPException(
+            status_code=401, detail="Incorrect username or password", headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    extra_claims = {"username": user.username}
+    if user.username in settings.ADMIN_USERNAMES:
+        extra_claims["admin"] = True
+    token, expires_in = issue_token(str(user.id), extra_claims)
+    return {"access_token": token, "token_type": "bearer", "expires_in": expires_in}
@@ -1,17 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
+from app.api.bulk import bulk_insert
+from app.api.caching import (
+    REFERENCE_CACHE_CONTROL, collection_version, entity_etag, entity_not_modified,
+    is_not_modified, not_modified, set_validators,
+)
+from app.api.lookups import get_by_id
+from app.api.patching import patch_entity
+from app.api.streaming import stream_ndjson, stream_paged, wants_ndjson
 from app.core import get_db
 from app.models import BoatRamp
+from app.schemas import BoatRampCreate, BoatRampUpdate
+from app.services import purge
 
 router = APIRouter()
 
 
+def _serialize_boat_ramp(ramp) -> dict:
+    return {
+        "id": str(ramp.id),
+        "lake_id": str(ramp.lake_id),
+        "name": ramp.name,
+        "latitude": float(ramp.latitude),
+        "longitude": float(ramp.longitude),
+        "hours_of_operation": ramp.hours_of_operation,
+        "seasonal_availability": ramp.seasonal_availability,
+        "is_active": ramp.is_active,
+    }
+
+
+def _serialize_boat_ramp_summary(ramp) -> dict:
+    return {
+        "id": str(ramp.id),
+        "lake_id": str(ramp.lake_id),
+        "name": ramp.name,
+        "latitude": float(ramp.latitude),
+        "longitude": float(ramp.longitude),
+        "is_active": ramp.is_active,
+    }
+
+
 @router.get("/", response_model=List[dict])
 def list_boat_ramps(
+    request: Request,
+    response: Response,
     lake_id: Optional[UUID] = Query(None),
+    stream: bool = Query(False),
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
@@ -21,35 +58,33 @@ def list_boat_ramps(
     if lake_id:
         query = query.filter(BoatRamp.lake_id == lake_id)
 
+    ndjson = wants_ndjson(request, stream)
+    etag = collection_version(request, query, BoatRamp, "ndjson" if ndjson else "")
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, REFERENCE_CACHE_CONTROL, "Accept")
+    set_validators(response, etag, None, REFERENCE_CACHE_CONTROL, "Accept")
+
+    query = query.order_by(BoatRamp.id)
+    if ndjson:
+        if stream_paged(request):
+            query = query.offset(skip).limit(limit)
+        return stream_ndjson(query, _serialize_boat_ramp_summary, response.headers)
+
     ramps = query.offset(skip).limit(limit).all()
-    return [
-        {
-            "id": str(ramp.id),
-            "lake_id": str(ramp.lake_id),
-            "name": ramp.name,
-            "latitude": float(ramp.latitude),
-            "longitude": float(ramp.longitude),
-            "is_active": ramp.is_active,
-        }
-        for ramp in ramps
-    ]
+    return [_serialize_boat_ramp_summary(ramp) for ramp in ramps]
 
 
 @router.get("/{ramp_id}", response_model=dict)
-def get_boat_ramp(ramp_id: UUID, db: Session = Depends(get_db)):
-    ramp = db.query(BoatRamp).filter(BoatRamp.id == ramp_id).first()
+def get_boat_ramp(ramp_id: UUID, request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = entity_not_modified(request, db, BoatRamp, ramp_id, REFERENCE_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    ramp = get_by_id(db, BoatRamp, ramp_id)
     if not ramp:
         raise HTTPException(status_code=404, detail="Boat ramp not found")
-    return {
-        "id": str(ramp.id),
-        "lake_id": str(ramp.lake_id),
-        "name": ramp.name,
-        "latitude": float(ramp.latitude),
-        "longitude": float(ramp.longitude),
-        "hours_of_operation": ramp.hours_of_operation,
-        "seasonal_availability": ramp.seasonal_availability,
-        "is_active": ramp.is_active,
-    }
+    set_validators(response, entity_etag(ramp.id, ramp.updated_at), ramp.updated_at, REFERENCE_CACHE_CONTROL)
+    return _serialize_boat_ramp(ramp)
 
 
 @router.post(
@@ -87,12 +122,70 @@ def create_boat_ramp(ramp_data: dict, db: Session = Depends(get_db)):
     return {"id": str(ramp.id), "name": ramp.name}
 
 
+@router.post(
+    "/bulk",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"lake_id": "00000000-0000-0000-0000-000000000000", "name": "Boone Lake Main Ramp", "latitude": 36.447359, "longitude": -82.428104},
+                        {"lake_id": "00000000-0000-0000-0000-000000000000", "name": "Winged Deer Park Ramp", "latitude": 36.365212, "longitude": -82.330810}
+                    ]
+                }
+            }
+        }
+    }
+)
+def create_boat_ramps_bulk(
+    ramps_data: List[dict],
+    response: Response,
+    atomic: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    return bulk_insert(
+        db,
+        response,
+        BoatRamp,
+        BoatRampCreate,
+        ramps_data,
+        returning=[BoatRamp.id, BoatRamp.name],
+        serialize=lambda ramp: {"id": str(ramp.id), "name": ramp.name},
+        atomic=atomic,
+    )
+
+
+@router.patch("/{ramp_id}", response_model=dict)
+def update_boat_ramp(
+    ramp_id: UUID,
+    ramp_data: dict,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    return patch_entity(
+        db,
+        request,
+        response,
+        BoatRamp,
+        BoatRampUpdate,
+        ramp_id,
+        ramp_data,
+        returning=[BoatRamp.id, BoatRamp.lake_id, BoatRamp.name, BoatRamp.latitude, BoatRamp.longitude, BoatRamp.hours_of_operation, BoatRamp.seasonal_availability, BoatRamp.is_active],
+        serialize=_serialize_boat_ramp,
+        not_found="Boat ramp not found",
+    )
+
+
 @router.delete("/{ramp_id}", status_code=204)
 def delete_boat_ramp(ramp_id: UUID, db: Session = Depends(get_db)):
-    ramp = db.query(BoatRamp).filter(BoatRamp.id == ramp_id).first()
+    ramp = get_by_id(db, BoatRamp, ramp_id)
     if not ramp:
         raise HTTPException(status_code=404, detail="Boat ramp not found")
 
+    purge.delete_facility_rows(db, "boat_ramp", ramp_id)
     db.delete(ramp)
     db.commit()
     return None
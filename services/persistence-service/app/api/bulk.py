@@ -0,0 +1,88 @@
+import logging
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _db_error_detail(error: DBAPIError) -> str:
+    return str(error.orig).strip().splitlines()[0] if error.orig else str(error)
+
+
+def bulk_insert(
+    db: Session,
+    response: Response,
+    model,
+    schema: Type[BaseModel],
+    items: List[dict],
+    returning: list,
+    serialize: Callable,
+    atomic: bool = True,
+    related_fields: Tuple[str, ...] = (),
+    insert_related: Optional[Callable] = None,
+) -> dict:
+    # related_fields are validated with the item but stored elsewhere:
+    # they are split off before the INSERT and passed, with the inserted
+    # rows, to insert_related(db, rows, related) in the same savepoint.
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+
+    errors = []
+    groups: Dict[Tuple[str, ...], List[Tuple[int, dict]]] = {}
+    related: Dict[int, dict] = {}
+    for index, item in enumerate(items):
+        try:
+            row = schema.model_validate(item).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.errors(include_url=False, include_context=False)})
+            continue
+        related[index] = {field: row.pop(field) for field in related_fields if field in row}
+        # Rows are grouped by the columns they set so omitted columns keep
+        # their defaults; in practice a batch is a single group.
+        groups.setdefault(tuple(sorted(row)), []).append((index, row))
+
+    if atomic and errors:
+        raise HTTPException(status_code=422, detail={"errors": errors})
+
+    created = []
+    for group in groups.values():
+        indexes = [index for index, _ in group]
+        rows = [row for _, row in group]
+        stmt = insert(model).returning(*returning, sort_by_parameter_order=True)
+        try:
+            with db.begin_nested():
+                results = db.execute(stmt, rows).all()
+                if insert_related:
+                    insert_related(db, results, [related[index] for index in indexes])
+            created.extend(zip(indexes, results))
+        except DBAPIError:
+            # Retry row by row to pinpoint the offending items.
+            for index, row in group:
+                try:
+                    with db.begin_nested():
+                        result = db.execute(stmt, [row]).one()
+                        if insert_related:
+                            insert_related(db, [result], [related[index]])
+                    created.append((index, result))
+                except DBAPIError as e:
+                    errors.append({"index": index, "errors": [{"msg": _db_error_detail(e)}]})
+
+    if atomic and errors:
+        db.rollback()
+        raise HTTPException(status_code=422, detail={"errors": sorted(errors, key=lambda error: error["index"])})
+
+    db.commit()
+    if errors:
+        response.status_code = 207
+    logger.info(f"Bulk inserted {len(created)} {model.__tablename__} rows ({len(errors)} rejected)")
+    return {
+        "created": [{"index": index, **serialize(row)} for index, row in sorted(created, key=lambda pair: pair[0])],
+        "errors": sorted(errors, key=lambda error: error["index"]),
+    }
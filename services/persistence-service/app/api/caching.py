@@ -0,0 +1,136 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlencode
+from uuid import UUID
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.api.lookups import updated_at_by_id
+from app.core.config import settings
+
+REFERENCE_CACHE_CONTROL = f"public, max-age={settings.REFERENCE_CACHE_MAX_AGE}"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return 0
+    return (value - _EPOCH) // (datetime.resolution)
+
+
+def entity_etag(entity_id: UUID, updated_at: datetime) -> str:
+    return f'"{entity_id.hex}-{_micros(updated_at):x}"'
+
+
+def parse_entity_etag(etag: str, entity_id: UUID) -> Optional[datetime]:
+    # Inverse of entity_etag: the updated_at a strong ETag for this entity
+    # was issued for, or None if the tag is weak, malformed or for another
+    # entity.
+    etag = etag.strip()
+    if etag.startswith("W/") or len(etag) < 2 or etag[0] != '"' or etag[-1] != '"':
+        return None
+    entity_hex, _, micros = etag[1:-1].partition("-")
+    if entity_hex != entity_id.hex:
+        return None
+    try:
+        return _EPOCH + int(micros, 16) * datetime.resolution
+    except ValueError:
+        return None
+
+
+def collection_etag(request: Request, count: int, max_updated_at: Optional[datetime], variant: str = "") -> str:
+    params = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{params}#{variant}".encode()).hexdigest()[:16]
+    return f'"{count:x}-{_micros(max_updated_at):x}-{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def has_validators(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).astimezone(timezone.utc).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _validator_headers(etag: str, last_modified: Optional[datetime], cache_control: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+# vary names the request headers that select the representation; it is
+# appended to Vary, and sent on 304s too so caches key them the same way.
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime], cache_control: str,
+                   vary: Optional[str] = None):
+    response.headers.update(_validator_headers(etag, last_modified, cache_control))
+    if vary:
+        response.headers.add_vary_header(vary)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime], cache_control: str,
+                 vary: Optional[str] = None) -> Response:
+    response = Response(status_code=304, headers=_validator_headers(etag, last_modified, cache_control))
+    if vary:
+        response.headers.add_vary_header(vary)
+    return response
+
+
+# Answers a conditional GET for one row from its updated_at alone. Returns a
+# 304 response when the client's validators still match, or None when the
+# caller should load and return the full entity.
+def entity_not_modified(request: Request, db: Session, model, entity_id: UUID, cache_control: str) -> Optional[Response]:
+    if not has_validators(request):
+        return None
+    updated_at = updated_at_by_id(db, model, entity_id)
+    if updated_at is None:
+        return None
+    etag = entity_etag(entity_id, updated_at)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(etag, updated_at, cache_control)
+    return None
+
+
+# ETag for a filtered collection, from count(*) and max(updated_at) over the
+# same filters as the list query, so an unchanged collection is detected
+# without loading rows. variant distinguishes representations of the same
+# collection (e.g. JSON and MessagePack).
+#
+# Collections get no Last-Modified: deleting a row lowers the count but not
+# max(updated_at), so If-Modified-Since alone would answer 304 for a list
+# that lost rows. Only the ETag catches that.
+def collection_version(request: Request, query: Query, model, variant: str = "") -> str:
+    count, max_updated_at = query.with_entities(func.count(model.id), func.max(model.updated_at)).one()
+    return collection_etag(request, count, max_updated_at, variant)
+
+
+# collection_version for lists built as statements: version_statement
+# selects (count, max(updated_at)) with the same filters as the list.
+def statement_version(request: Request, db: Session, version_statement, variant: str = "") -> str:
+    count, max_updated_at = db.execute(version_statement).one()
+    return collection_etag(request, count, max_updated_at, variant)
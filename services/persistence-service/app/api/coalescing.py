@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.api.caching import is_not_modified, not_modified, set_validators
+from app.core.config import settings
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "finished_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished_at: Optional[float] = None
+
+
+class SingleFlight:
+    # Coalesces identical concurrent calls. The first caller for a key runs
+    # the function; callers arriving while it runs wait for it and share its
+    # result (or the exception it raised). A window_seconds above 0 also
+    # reuses a finished result for that long, which makes it a short-lived
+    # cache: writers must forget() the keys they change. Request handlers
+    # are sync and run on the threadpool, so waiting holds a worker thread
+    # but not a database connection: sessions only check one out on their
+    # first query.
+    def __init__(self, window_seconds: float, enabled: bool = True):
+        self.window_seconds = window_seconds
+        self.enabled = enabled
+        self._calls: Dict[Hashable, _Call] = {}
+        # Finished calls in the order they finished, to expire them.
+        self._finished: Deque[Tuple[float, Hashable, _Call]] = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._finished and now - self._finished[0][0] > self.window_seconds:
+            _, key, call = self._finished.popleft()
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return function()
+
+        with self._lock:
+            self._expire(time.monotonic())
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                call.finished_at = time.monotonic()
+                if call.error is None and self.window_seconds > 0:
+                    self._finished.append((call.finished_at, key, call))
+                elif self._calls.get(key) is call:
+                    # Failures are shared with the callers already waiting,
+                    # but the next caller tries again.
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    # Called after a write commits: later callers start a new call instead
+    # of joining one that may have read the old row. Callers already waiting
+    # still get the result of the call they joined.
+    def forget(self, key: Hashable):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+            self._finished.clear()
+
+
+single_flight = SingleFlight(settings.SINGLE_FLIGHT_WINDOW_MS / 1000, settings.SINGLE_FLIGHT_ENABLED)
+
+
+# Identifies a request by path, sorted query parameters and representation
+# variant, normalized the same way as collection ETags, so that requests
+# sharing a key would also have been given the same ETag.
+def request_key(request: Request, variant: str = "") -> Hashable:
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())), variant)
+
+
+@dataclass(frozen=True)
+class SharedResponse:
+    # A rendered body with its validators, shared between coalesced
+    # requests. Each request gets its own Response (and its own 304 check).
+    body: bytes
+    media_type: str
+    etag: str
+    last_modified: Optional[datetime]
+
+    @classmethod
+    def of(cls, response: Response, etag: str, last_modified: Optional[datetime]) -> "SharedResponse":
+        return cls(response.body, response.media_type, etag, last_modified)
+
+    def respond(self, request: Request, cache_control: str, vary: Optional[str] = None) -> Response:
+        if is_not_modified(request, self.etag, self.last_modified):
+            return not_modified(self.etag, self.last_modified, cache_control, vary)
+        response = Response(content=self.body, media_type=self.media_type)
+        set_validators(response, self.etag, self.last_modified, cache_control, vary)
+        return response
@@ -0,0 +1,31 @@
+from typing import Any, Mapping, Optional
+
+from fastapi import Request, Response
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is an optional wire format
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True, default=str)
+
+
+def wants_msgpack(request: Request) -> bool:
+    # Clients opt in explicitly; without the msgpack package the Accept
+    # header is ignored and JSON is returned as usual.
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def msgpack_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> MsgPackResponse:
+    return MsgPackResponse(content, headers=dict(headers or {}))
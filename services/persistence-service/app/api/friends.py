@@ -0,0 +1,131 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from datetime import date
+
+from app.api.lookups import exists_by_id
+from app.core import get_db
+from app.models import User
+from app.services import social_graph
+
+router = APIRouter()
+
+MAX_NETWORK_HOPS = 3
+
+
+def _require_user(db: Session, user_id: UUID):
+    if not exists_by_id(db, User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+
+
+def _parse_uuid(value, field: str) -> UUID:
+    try:
+        return UUID(str(value))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid {field}: {value}")
+
+
+@router.get("/{user_id}", response_model=List[dict])
+def list_friends(user_id: UUID, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    friends = social_graph.list_friends(db, user_id, skip, limit)
+    return [
+        {"id": str(friend.id), "username": friend.username, "since": friend.since.isoformat()}
+        for friend in friends
+    ]
+
+
+@router.get("/{user_id}/requests", response_model=List[dict])
+def list_friend_requests(
+    user_id: UUID,
+    direction: str = Query("incoming", pattern="^(incoming|outgoing)$"),
+    db: Session = Depends(get_db)
+):
+    requests = social_graph.list_requests(db, user_id, outgoing=direction == "outgoing")
+    return [
+        {"id": str(request.id), "username": request.username, "requested_at": request.requested_at.isoformat()}
+        for request in requests
+    ]
+
+
+@router.post(
+    "/{user_id}/requests",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": {"friend_id": "00000000-0000-0000-0000-000000000000"}
+                }
+            }
+        }
+    }
+)
+def send_friend_request(user_id: UUID, request_data: dict, db: Session = Depends(get_db)):
+    if request_data.get("friend_id") is None:
+        raise HTTPException(status_code=422, detail="Missing required fields: friend_id")
+    friend_id = _parse_uuid(request_data["friend_id"], "friend_id")
+    if friend_id == user_id:
+        raise HTTPException(status_code=422, detail="Users cannot befriend themselves")
+    _require_user(db, user_id)
+    _require_user(db, friend_id)
+
+    status = social_graph.request_friendship(db, user_id, friend_id)
+    db.commit()
+    return {"user_id": str(user_id), "friend_id": str(friend_id), "status": status}
+
+
+@router.post("/{user_id}/requests/{requester_id}/accept", response_model=dict)
+def accept_friend_request(user_id: UUID, requester_id: UUID, db: Session = Depends(get_db)):
+    if not social_graph.accept_friendship(db, user_id, requester_id):
+        raise HTTPException(status_code=404, detail="Friend request not found")
+    db.commit()
+    return {"user_id": str(user_id), "friend_id": str(requester_id), "status": social_graph.ACCEPTED}
+
+
+@router.delete("/{user_id}/{friend_id}", status_code=204)
+def remove_friend(user_id: UUID, friend_id: UUID, db: Session = Depends(get_db)):
+    if not social_graph.remove_friendship(db, user_id, friend_id):
+        raise HTTPException(status_code=404, detail="Friendship not found")
+    db.commit()
+    return None
+
+
+@router.get("/{user_id}/mutuals/{other_id}", response_model=List[dict])
+def list_mutual_friends(user_id: UUID, other_id: UUID, db: Session = Depends(get_db)):
+    return [
+        {"id": str(friend.id), "username": friend.username}
+        for friend in social_graph.mutual_friends(db, user_id, other_id)
+    ]
+
+
+@router.get("/{user_id}/suggestions", response_model=List[dict])
+def list_friend_suggestions(user_id: UUID, limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db)):
+    return [
+        {"id": str(candidate.id), "username": candidate.username, "mutual_friends": candidate.mutual_friends}
+        for candidate in social_graph.friend_suggestions(db, user_id, limit)
+    ]
+
+
+@router.get("/{user_id}/network/outings", response_model=List[dict])
+def list_network_outings(
+    user_id: UUID,
+    lake_id: UUID = Query(...),
+    planned_date: date = Query(...),
+    time_slot: Optional[str] = Query(None),
+    max_hops: int = Query(2, ge=1, le=MAX_NETWORK_HOPS),
+    db: Session = Depends(get_db)
+):
+    outings = social_graph.network_outings(db, user_id, lake_id, planned_date, max_hops, time_slot)
+    return [
+        {
+            "outing_id": str(outing.id),
+            "user_id": str(outing.user_id),
+            "username": outing.username,
+            "hops": outing.hops,
+            "time_slot": outing.time_slot,
+            "target_amenities": [str(amenity_id) for amenity_id in outing.target_amenities or []],
+        }
+        for outing in outings
+    ]
@@ -1,33 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, timedelta
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
+from app.api.bulk import bulk_insert
+from app.api.caching import (
+    REFERENCE_CACHE_CONTROL, collection_version, entity_etag, is_not_modified, not_modified, set_validators,
+)
+from app.api.coalescing import SharedResponse, single_flight
+from app.api.lookups import exists_by_id, get_by_id
+from app.api.patching import patch_entity
+from app.api.purge_jobs import delete_entity
+from app.api.streaming import stream_ndjson, stream_paged, wants_ndjson
+from app.api.search import SEARCH_MODE_PATTERN, trigram_search
 from app.core import get_db
-from app.models import Lake
+from app.core.config import settings
+from app.models import AvailabilityWindow, Lake, OutingReassignment
+from app.models.availability import FACILITY_MODELS
+from app.schemas import LakeBoundaryUpdate, LakeCreate, LakeUpdate
+from app.services import allocation, boundaries
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
-def list_lakes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    lakes = db.query(Lake).offset(skip).limit(limit).all()
-    return [
-        {
-            "id": str(lake.id),
-            "name": lake.name,
-            "latitude": float(lake.latitude),
-            "longitude": float(lake.longitude),
-        }
-        for lake in lakes
-    ]
+FACILITY_TYPE_PATTERN = "^(" + "|".join(FACILITY_MODELS) + ")$"
 
 
-@router.get("/{lake_id}", response_model=dict)
-def get_lake(lake_id: UUID, db: Session = Depends(get_db)):
-    lake = db.query(Lake).filter(Lake.id == lake_id).first()
-    if not lake:
-        raise HTTPException(status_code=404, detail="Lake not found")
+def _clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _serialize_lake(lake) -> dict:
     return {
         "id": str(lake.id),
         "name": lake.name,
@@ -36,6 +42,188 @@ def get_lake(lake_id: UUID, db: Session = Depends(get_db)):
     }
 
 
+@router.get("/", response_model=List[dict])
+def list_lakes(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    query = db.query(Lake)
+
+    # NDJSON and JSON are separate representations of the same URL.
+    ndjson = wants_ndjson(request, stream)
+    etag = collection_version(request, query, Lake, "ndjson" if ndjson else "")
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, REFERENCE_CACHE_CONTROL, "Accept")
+    set_validators(response, etag, None, REFERENCE_CACHE_CONTROL, "Accept")
+
+    query = query.order_by(Lake.id)
+    if ndjson:
+        if stream_paged(request):
+            query = query.offset(skip).limit(limit)
+        return stream_ndjson(query, _serialize_lake, response.headers)
+
+    lakes = query.offset(skip).limit(limit).all()
+    return [_serialize_lake(lake) for lake in lakes]
+
+
+@router.get("/search", response_model=dict)
+def search_lakes(
+    q: str = Query(..., min_length=1, max_length=255),
+    mode: str = Query("fuzzy", pattern=SEARCH_MODE_PATTERN),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    return trigram_search(db, Lake, Lake.name, q, mode, limit, cursor, _serialize_lake)
+
+
+@router.get("/{lake_id}", response_model=dict)
+def get_lake(lake_id: UUID, request: Request, db: Session = Depends(get_db)):
+    # A trending lake gets many identical requests at once: they share one
+    # query and one rendered body (see app/api/coalescing.py). Loading the
+    # row by primary key costs the same as checking only its updated_at, so
+    # conditional requests go through the same call.
+    def load() -> SharedResponse:
+        lake = get_by_id(db, Lake, lake_id)
+        if not lake:
+            raise HTTPException(status_code=404, detail="Lake not found")
+        return SharedResponse.of(
+            JSONResponse(_serialize_lake(lake)), entity_etag(lake.id, lake.updated_at), lake.updated_at
+        )
+
+    return single_flight.do(("lake", lake_id), load).respond(request, REFERENCE_CACHE_CONTROL)
+
+
+# Facilities open on a day (and optionally at a time of day) from the
+# precomputed availability_windows; see app.jobs.availability_windows.
+@router.get("/{lake_id}/availability", response_model=dict)
+def get_lake_availability(
+    lake_id: UUID,
+    on: Optional[date] = Query(None, alias="date"),
+    at: Optional[str] = Query(None, alias="time", pattern=r"^([01]\d|2[0-3]):[0-5]\d$"),
+    facility_type: Optional[str] = Query(None, pattern=FACILITY_TYPE_PATTERN),
+    db: Session = Depends(get_db)
+):
+    today = date.today()
+    on = on or today
+    if not today <= on <= today + timedelta(days=settings.AVAILABILITY_HORIZON_DAYS):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Availability is only known for the next {settings.AVAILABILITY_HORIZON_DAYS} days",
+        )
+    if not exists_by_id(db, Lake, lake_id):
+        raise HTTPException(status_code=404, detail="Lake not found")
+
+    query = db.query(
+        AvailabilityWindow.facility_type,
+        AvailabilityWindow.facility_id,
+        AvailabilityWindow.opens_minute,
+        AvailabilityWindow.closes_minute,
+    ).filter(AvailabilityWindow.day == on, AvailabilityWindow.lake_id == lake_id)
+    if facility_type:
+        query = query.filter(AvailabilityWindow.facility_type == facility_type)
+    if at:
+        hour, minute = at.split(":")
+        minutes = int(hour) * 60 + int(minute)
+        query = query.filter(AvailabilityWindow.opens_minute <= minutes, AvailabilityWindow.closes_minute > minutes)
+    windows = query.order_by(AvailabilityWindow.facility_type, AvailabilityWindow.opens_minute).all()
+
+    names = {}
+    for type_name, model in FACILITY_MODELS.items():
+        ids = [window.facility_id for window in windows if window.facility_type == type_name]
+        if ids:
+            names.update(db.query(model.id, model.name).filter(model.id.in_(ids)).all())
+
+    return {
+        "lake_id": str(lake_id),
+        "date": on.isoformat(),
+        "time": at,
+        "facilities": [
+            {
+                "facility_type": window.facility_type,
+                "id": str(window.facility_id),
+                "name": names.get(window.facility_id),
+                "opens": _clock(window.opens_minute),
+                "closes": _clock(window.closes_minute),
+            }
+            for window in windows
+        ],
+    }
+
+
+@router.get("/{lake_id}/boundary", response_model=dict)
+def get_lake_boundary(
+    lake_id: UUID,
+    zoom: Optional[int] = Query(None, ge=0, le=boundaries.MAX_ZOOM),
+    db: Session = Depends(get_db)
+):
+    if not exists_by_id(db, Lake, lake_id):
+        raise HTTPException(status_code=404, detail="Lake not found")
+    geometry = boundaries.get_boundary_geojson(db, lake_id, zoom)
+    if geometry is None:
+        raise HTTPException(status_code=404, detail="Lake has no boundary")
+    return geometry
+
+
+@router.put("/{lake_id}/boundary", status_code=204)
+def set_lake_boundary(lake_id: UUID, boundary: LakeBoundaryUpdate, db: Session = Depends(get_db)):
+    try:
+        found = boundaries.set_boundary(db, lake_id, boundary.model_dump())
+    except DBAPIError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=f"Invalid boundary geometry: {str(e.orig).strip().splitlines()[0]}")
+    if not found:
+        raise HTTPException(status_code=404, detail="Lake not found")
+    db.commit()
+    return Response(status_code=204)
+
+
+# Runs the weekend allocation optimizer for the weekend on or after the
+# given date (default: the coming one) and returns per-slot results.
+@router.post("/{lake_id}/allocation", response_model=dict)
+def optimize_lake_allocation(
+    lake_id: UUID,
+    on: Optional[date] = Query(None, alias="date"),
+    db: Session = Depends(get_db)
+):
+    if not exists_by_id(db, Lake, lake_id):
+        raise HTTPException(status_code=404, detail="Lake not found")
+    summary = allocation.optimize_weekend(db, lake_id, on or date.today())
+    db.commit()
+    return summary
+
+
+@router.get("/{lake_id}/reassignments", response_model=List[dict])
+def list_lake_reassignments(
+    lake_id: UUID,
+    on: Optional[date] = Query(None, alias="date"),
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    query = db.query(OutingReassignment).filter(
+        OutingReassignment.lake_id == lake_id,
+        OutingReassignment.planned_date.in_(allocation.weekend_dates(on or date.today())),
+    )
+    reassignments = query.order_by(
+        OutingReassignment.planned_date, OutingReassignment.outing_id, OutingReassignment.from_amenity_id
+    ).offset(skip).limit(limit).all()
+    return [
+        {
+            "outing_id": str(reassignment.outing_id),
+            "planned_date": reassignment.planned_date.isoformat(),
+            "from_amenity_id": str(reassignment.from_amenity_id),
+            "to_amenity_id": str(reassignment.to_amenity_id),
+            "distance_m": reassignment.distance_m,
+        }
+        for reassignment in reassignments
+    ]
+
+
 @router.post(
     "/",
     response_model=dict,
@@ -59,39 +247,64 @@ def create_lake(lake_data: dict, db: Session = Depends(get_db)):
     db.add(lake)
     db.commit()
     db.refresh(lake)
-    return {
-        "id": str(lake.id),
-        "name": lake.name,
-        "latitude": float(lake.latitude),
-        "longitude": float(lake.longitude),
-    }
-
+    return _serialize_lake(lake)
 
-@router.put("/{lake_id}", response_model=dict)
-def update_lake(lake_id: UUID, lake_data: dict, db: Session = Depends(get_db)):
-    lake = db.query(Lake).filter(Lake.id == lake_id).first()
-    if not lake:
-        raise HTTPException(status_code=404, detail="Lake not found")
-
-    for key, value in lake_data.items():
-        setattr(lake, key, value)
 
-    db.commit()
-    db.refresh(lake)
-    return {
-        "id": str(lake.id),
-        "name": lake.name,
-        "latitude": float(lake.latitude),
-        "longitude": float(lake.longitude),
+@router.post(
+    "/bulk",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"name": "Boone Lake", "latitude": 36.4667, "longitude": -82.4167},
+                        {"name": "South Holston Lake", "latitude": 36.5237, "longitude": -82.0929}
+                    ]
+                }
+            }
+        }
     }
+)
+def create_lakes_bulk(
+    lakes_data: List[dict],
+    response: Response,
+    atomic: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    return bulk_insert(
+        db,
+        response,
+        Lake,
+        LakeCreate,
+        lakes_data,
+        returning=[Lake.id, Lake.name, Lake.latitude, Lake.longitude],
+        serialize=_serialize_lake,
+        atomic=atomic,
+    )
 
 
-@router.delete("/{lake_id}", status_code=204)
-def delete_lake(lake_id: UUID, db: Session = Depends(get_db)):
-    lake = db.query(Lake).filter(Lake.id == lake_id).first()
-    if not lake:
-        raise HTTPException(status_code=404, detail="Lake not found")
+@router.patch("/{lake_id}", response_model=dict)
+@router.put("/{lake_id}", response_model=dict)
+def update_lake(lake_id: UUID, lake_data: dict, request: Request, response: Response, db: Session = Depends(get_db)):
+    return patch_entity(
+        db,
+        request,
+        response,
+        Lake,
+        LakeUpdate,
+        lake_id,
+        lake_data,
+        returning=[Lake.id, Lake.name, Lake.latitude, Lake.longitude],
+        serialize=_serialize_lake,
+        not_found="Lake not found",
+        on_update=lambda lake: single_flight.forget(("lake", lake_id)),
+    )
 
-    db.delete(lake)
-    db.commit()
-    return None
+
+@router.delete("/{lake_id}", status_code=204, responses={202: {"description": "Purge job queued"}})
+def delete_lake(lake_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    deleted = delete_entity(db, background_tasks, "lake", lake_id, not_found="Lake not found")
+    single_flight.forget(("lake", lake_id))
+    return deleted
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.messaging.live import live_hub
+
+router = APIRouter()
+
+# Sent to SSE clients so that EventSource reconnects after 3s.
+RECONNECT_MS = 3000
+# WebSocket close code 1013: try again later.
+TRY_AGAIN_LATER = 1013
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+def _too_many_connections() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many live connections, retry later",
+        headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+    )
+
+
+# Server-sent events for one lake: "outing", "contention" and "rental"
+# events with the broker payload as data, plus "resync" when the client
+# fell behind and should refetch. Comments are sent as heartbeats.
+@router.get("/lakes/{lake_id}")
+async def stream_lake_updates(lake_id: UUID):
+    subscription = live_hub.subscribe(str(lake_id))
+    if subscription is None:
+        raise _too_many_connections()
+
+    async def events():
+        try:
+            yield f"retry: {RECONNECT_MS}\n\n"
+            while True:
+                batch = await subscription.next_batch(settings.LIVE_HEARTBEAT_SECONDS)
+                if batch is None:
+                    return
+                if not batch:
+                    yield ": ping\n\n"
+                    continue
+                yield "".join(f"event: {event}\ndata: {_dumps(data)}\n\n" for event, data in batch)
+        finally:
+            live_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Same updates over a WebSocket, one text frame per coalesced batch:
+# [{"event": ..., "data": {...}}, ...]. Keep-alive is left to the server's
+# WebSocket pings.
+@router.websocket("/lakes/{lake_id}/ws")
+async def lake_updates_socket(websocket: WebSocket, lake_id: UUID):
+    subscription = live_hub.subscribe(str(lake_id))
+    if subscription is None:
+        await websocket.close(code=TRY_AGAIN_LATER)
+        return
+
+    async def watch_disconnect():
+        # Clients have nothing to say; anything they send is discarded.
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+        subscription.close()
+
+    await websocket.accept()
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        while True:
+            batch = await subscription.next_batch(settings.LIVE_HEARTBEAT_SECONDS)
+            if batch is None:
+                break
+            if batch:
+                await websocket.send_text(_dumps([{"event": event, "data": data} for event, data in batch]))
+    except Exception:
+        subscription.close()
+    finally:
+        watcher.cancel()
+        live_hub.unsubscribe(subscription)
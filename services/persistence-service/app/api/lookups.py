@@ -0,0 +1,33 @@
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+# Lookups by primary key, the most frequent queries of the API.
+#
+# SQLAlchemy caches the compiled SQL of every statement, but a Query or
+# select() is still rebuilt and its cache key recomputed from the whole
+# expression on every request. A lambda statement is built once per code
+# location and model: its cache key comes from the lambda's code and the
+# model in its closure, and only entity_id is extracted per call, as a
+# bound parameter. list_outings and list_amenities compose their filters
+# from lambdas the same way.
+
+
+def get_by_id(db: Session, model, entity_id: UUID) -> Optional[Any]:
+    return db.execute(
+        lambda_stmt(lambda: select(model).where(model.id == entity_id).limit(1))
+    ).scalars().first()
+
+
+def exists_by_id(db: Session, model, entity_id: UUID) -> bool:
+    return db.execute(
+        lambda_stmt(lambda: select(model.id).where(model.id == entity_id).limit(1))
+    ).first() is not None
+
+
+def updated_at_by_id(db: Session, model, entity_id: UUID):
+    return db.execute(
+        lambda_stmt(lambda: select(model.updated_at).where(model.id == entity_id))
+    ).scalar()
@@ -0,0 +1,373 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID, uuid4
+from datetime import date, datetime
+
+from app.api.lookups import exists_by_id, get_by_id
+from app.api.patching import patch_entity
+from app.api.streaming import stream_ndjson, stream_paged, wants_ndjson
+from app.core import get_db
+from app.messaging.rabbitmq import rabbitmq_client
+from app.models import Marina, RentalInventory, RentalBooking
+from app.schemas import MarinaUpdate, RentalBookingCreate, RentalSlotSet
+from app.services import purge
+
+router = APIRouter()
+
+
+def _serialize_marina(marina) -> dict:
+    return {
+        "id": str(marina.id),
+        "lake_id": str(marina.lake_id),
+        "name": marina.name,
+        "latitude": float(marina.latitude),
+        "longitude": float(marina.longitude),
+        "rental_inventory": marina.rental_inventory,
+        "hours_of_operation": marina.hours_of_operation,
+        "is_active": marina.is_active,
+    }
+
+
+def _serialize_marina_summary(marina) -> dict:
+    return {
+        "id": str(marina.id),
+        "lake_id": str(marina.lake_id),
+        "name": marina.name,
+        "latitude": float(marina.latitude),
+        "longitude": float(marina.longitude),
+        "is_active": marina.is_active,
+    }
+
+
+@router.get("/", response_model=List[dict])
+def list_marinas(
+    request: Request,
+    response: Response,
+    lake_id: Optional[UUID] = Query(None),
+    rental_type: Optional[str] = Query(None),
+    stream: bool = Query(False),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    query = db.query(Marina)
+
+    if lake_id:
+        query = query.filter(Marina.lake_id == lake_id)
+    if rental_type:
+        query = query.filter(Marina.rental_inventory.contains([{"boat_type": rental_type}]))
+
+    response.headers.add_vary_header("Accept")
+    if wants_ndjson(request, stream):
+        query = query.order_by(Marina.id)
+        if stream_paged(request):
+            query = query.offset(skip).limit(limit)
+        return stream_ndjson(query, _serialize_marina_summary, response.headers)
+
+    marinas = query.offset(skip).limit(limit).all()
+    return [_serialize_marina_summary(marina) for marina in marinas]
+
+
+@router.get("/{marina_id}", response_model=dict)
+def get_marina(marina_id: UUID, db: Session = Depends(get_db)):
+    marina = get_by_id(db, Marina, marina_id)
+    if not marina:
+        raise HTTPException(status_code=404, detail="Marina not found")
+    return _serialize_marina(marina)
+
+
+@router.post(
+    "/",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": {
+                        "lake_id": "00000000-0000-0000-0000-000000000000",
+                        "name": "Boone Lake Marina",
+                        "latitude": 36.440512,
+                        "longitude": -82.437421,
+                        "rental_inventory": [
+                            {"boat_type": "pontoon", "quantity": 4},
+                            {"boat_type": "kayak", "quantity": 12}
+                        ],
+                        "hours_of_operation": {
+                            "open": "7:00 AM",
+                            "close": "8:00 PM"
+                        },
+                        "is_active": True
+                    }
+                }
+            }
+        }
+    }
+)
+def create_marina(marina_data: dict, db: Session = Depends(get_db)):
+    marina = Marina(**marina_data)
+    db.add(marina)
+    db.commit()
+    db.refresh(marina)
+    return {"id": str(marina.id), "name": marina.name}
+
+
+@router.patch("/{marina_id}", response_model=dict)
+def update_marina(
+    marina_id: UUID,
+    marina_data: dict,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    return patch_entity(
+        db,
+        request,
+        response,
+        Marina,
+        MarinaUpdate,
+        marina_id,
+        marina_data,
+        returning=[Marina.id, Marina.lake_id, Marina.name, Marina.latitude, Marina.longitude, Marina.rental_inventory, Marina.hours_of_operation, Marina.is_active],
+        serialize=_serialize_marina,
+        not_found="Marina not found",
+    )
+
+
+@router.delete("/{marina_id}", status_code=204)
+def delete_marina(marina_id: UUID, db: Session = Depends(get_db)):
+    marina = get_by_id(db, Marina, marina_id)
+    if not marina:
+        raise HTTPException(status_code=404, detail="Marina not found")
+
+    purge.delete_facility_rows(db, "marina", marina_id)
+    db.delete(marina)
+    db.commit()
+    return None
+
+
+@router.get("/{marina_id}/availability", response_model=List[dict])
+def get_rental_availability(
+    marina_id: UUID,
+    rental_date: Optional[date] = Query(None, alias="date"),
+    boat_type: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    query = db.query(RentalInventory).filter(RentalInventory.marina_id == marina_id)
+
+    if rental_date:
+        query = query.filter(RentalInventory.date == rental_date)
+    if boat_type:
+        query = query.filter(RentalInventory.boat_type == boat_type)
+
+    slots = query.order_by(RentalInventory.date, RentalInventory.time_slot, RentalInventory.boat_type).all()
+    return [
+        {
+            "boat_type": slot.boat_type,
+            "date": slot.date.isoformat(),
+            "time_slot": slot.time_slot,
+            "capacity": slot.capacity,
+            "available": slot.available,
+        }
+        for slot in slots
+    ]
+
+
+@router.put(
+    "/{marina_id}/inventory",
+    response_model=List[dict],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"boat_type": "pontoon", "date": "2026-07-04", "time_slot": "morning", "capacity": 4},
+                        {"boat_type": "pontoon", "date": "2026-07-04", "time_slot": "afternoon", "capacity": 4}
+                    ]
+                }
+            }
+        }
+    }
+)
+def set_rental_inventory(marina_id: UUID, inventory_data: List[RentalSlotSet], db: Session = Depends(get_db)):
+    if not exists_by_id(db, Marina, marina_id):
+        raise HTTPException(status_code=404, detail="Marina not found")
+    if not inventory_data:
+        return []
+
+    # ON CONFLICT cannot update the same row twice in one statement, so a
+    # slot listed twice would fail the whole upsert.
+    rows = {}
+    for item in inventory_data:
+        slot = (item.boat_type, item.date, item.time_slot)
+        if slot in rows:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Duplicate slot: {item.boat_type} {item.date.isoformat()} {item.time_slot}",
+            )
+        rows[slot] = {
+            "marina_id": marina_id,
+            "boat_type": item.boat_type,
+            "date": item.date,
+            "time_slot": item.time_slot,
+            "capacity": item.capacity,
+            "available": item.capacity,
+        }
+
+    # Changing capacity shifts availability by the same amount so that
+    # existing bookings stay counted against the slot.
+    stmt = insert(RentalInventory).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_rental_inventory_slot",
+        set_={
+            "capacity": stmt.excluded.capacity,
+            "available": func.greatest(RentalInventory.available + stmt.excluded.capacity - RentalInventory.capacity, 0),
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(
+        RentalInventory.boat_type,
+        RentalInventory.date,
+        RentalInventory.time_slot,
+        RentalInventory.capacity,
+        RentalInventory.available,
+    )
+    slots = db.execute(stmt).all()
+    db.commit()
+    return [
+        {
+            "boat_type": slot.boat_type,
+            "date": slot.date.isoformat(),
+            "time_slot": slot.time_slot,
+            "capacity": slot.capacity,
+            "available": slot.available,
+        }
+        for slot in slots
+    ]
+
+
+@router.post(
+    "/{marina_id}/bookings",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": {
+                        "user_id": "00000000-0000-0000-0000-000000000000",
+                        "boat_type": "pontoon",
+                        "date": "2026-07-04",
+                        "time_slot": "morning"
+                    }
+                }
+            }
+        }
+    }
+)
+def book_rental(
+    marina_id: UUID,
+    booking: RentalBookingCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+
+    # A single conditional UPDATE claims one unit; concurrent bookings for
+    # the same slot serialize on that row only and can never oversell.
+    slot = db.execute(
+        update(RentalInventory)
+        .where(
+            RentalInventory.marina_id == marina_id,
+            RentalInventory.boat_type == booking.boat_type,
+            RentalInventory.date == booking.date,
+            RentalInventory.time_slot == booking.time_slot,
+            RentalInventory.available > 0,
+        )
+        .values(available=RentalInventory.available - 1)
+        .returning(RentalInventory.id, RentalInventory.available)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if not slot:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="No rentals available for the requested slot")
+
+    booking_id = uuid4()
+    db.add(RentalBooking(id=booking_id, inventory_id=slot.id, user_id=booking.user_id))
+    # Rolling back also releases the unit claimed above.
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+    lake_id = db.query(Marina.lake_id).filter(Marina.id == marina_id).scalar()
+    db.commit()
+
+    background_tasks.add_task(
+        rabbitmq_client.publish_event,
+        "rental.booked",
+        {
+            "booking_id": str(booking_id),
+            "marina_id": str(marina_id),
+            "lake_id": str(lake_id),
+            "user_id": str(booking.user_id),
+            "boat_type": booking.boat_type,
+            "date": booking.date.isoformat(),
+            "time_slot": booking.time_slot,
+            "available": slot.available,
+        },
+    )
+    return {"id": str(booking_id), "inventory_id": str(slot.id), "available": slot.available}
+
+
+@router.delete("/{marina_id}/bookings/{booking_id}", status_code=204)
+def cancel_rental_booking(
+    marina_id: UUID,
+    booking_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    inventory_id = db.execute(
+        update(RentalBooking)
+        .where(
+            RentalBooking.id == booking_id,
+            RentalBooking.status == "confirmed",
+            RentalBooking.inventory_id.in_(
+                select(RentalInventory.id).where(RentalInventory.marina_id == marina_id)
+            ),
+        )
+        .values(status="cancelled")
+        .returning(RentalBooking.inventory_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if not inventory_id:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    slot = db.execute(
+        update(RentalInventory)
+        .where(RentalInventory.id == inventory_id, RentalInventory.available < RentalInventory.capacity)
+        .values(available=RentalInventory.available + 1)
+        .returning(RentalInventory.boat_type, RentalInventory.date, RentalInventory.time_slot, RentalInventory.available)
+        .execution_options(synchronize_session=False)
+    ).first()
+    lake_id = db.query(Marina.lake_id).filter(Marina.id == marina_id).scalar()
+    db.commit()
+
+    if slot:
+        background_tasks.add_task(
+            rabbitmq_client.publish_event,
+            "rental.cancelled",
+            {
+                "booking_id": str(booking_id),
+                "marina_id": str(marina_id),
+                "lake_id": str(lake_id),
+                "boat_type": slot.boat_type,
+                "date": slot.date.isoformat(),
+                "time_slot": slot.time_slot,
+                "available": slot.available,
+            },
+        )
+    return None
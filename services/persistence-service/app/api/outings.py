@@ -1,80 +1,287 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import exists, lambda_stmt, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
+from app.api.bulk import bulk_insert
+from app.api.formats import msgpack_response, wants_msgpack
+from app.api.lookups import exists_by_id, get_by_id
+from app.api.patching import patch_entity
+from app.api.streaming import stream_ndjson, stream_paged, wants_ndjson
 from app.core import get_db
-from app.models import Outing
+from app.messaging.rabbitmq import rabbitmq_client
+from app.models import Outing, OutingParticipant
+from app.schemas import OutingCreate, OutingUpdate, ParticipantsInvite, ParticipantStatusUpdate
+from app.services import participants
 
 router = APIRouter()
 
 
+def _serialize_outing(outing) -> dict:
+    return {
+        "id": str(outing.id),
+        "user_id": str(outing.user_id),
+        "lake_id": str(outing.lake_id),
+        "planned_date": outing.planned_date.isoformat(),
+        "time_slot": outing.time_slot,
+        "target_amenities": [str(a) for a in outing.target_amenities] if outing.target_amenities else [],
+        "notes": outing.notes,
+    }
+
+
+def _publish_outing_event(background_tasks: BackgroundTasks, routing_key: str, outing: dict):
+    background_tasks.add_task(rabbitmq_client.publish_event, routing_key, {"outing_id": outing["id"], **outing})
+
+
+def _serialize_participant(participant) -> dict:
+    return {
+        "user_id": str(participant.user_id),
+        "status": participant.status,
+        "responded_at": participant.responded_at.isoformat() if participant.responded_at else None,
+    }
+
+
+def _require_outing(db: Session, outing_id: UUID):
+    if not exists_by_id(db, Outing, outing_id):
+        raise HTTPException(status_code=404, detail="Outing not found")
+
+
+def _invite_friends(db: Session, outings, related: List[dict]):
+    for outing, fields in zip(outings, related):
+        participants.invite(db, outing.id, fields.get("invited_friends") or [])
+
+
+def _serialize_outing_summary(outing) -> dict:
+    return {
+        "id": str(outing.id),
+        "user_id": str(outing.user_id),
+        "lake_id": str(outing.lake_id),
+        "planned_date": outing.planned_date.isoformat(),
+        "time_slot": outing.time_slot,
+        "target_amenities": [str(a) for a in outing.target_amenities] if outing.target_amenities else [],
+    }
+
+
 @router.get("/", response_model=List[dict])
 def list_outings(
+    request: Request,
+    response: Response,
     user_id: Optional[UUID] = Query(None),
     lake_id: Optional[UUID] = Query(None),
     start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    invited_user_id: Optional[UUID] = Query(None),
+    amenity_id: Optional[List[UUID]] = Query(None),
+    stream: bool = Query(False),
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Outing)
-
+    # Each filter is a lambda (see app/api/lookups.py): every combination of
+    # filters is a cached statement, and per request only the values are
+    # extracted.
+    stmt = lambda_stmt(lambda: select(Outing))
     if user_id:
-        query = query.filter(Outing.user_id == user_id)
+        stmt += lambda s: s.where(Outing.user_id == user_id)
     if lake_id:
-        query = query.filter(Outing.lake_id == lake_id)
+        stmt += lambda s: s.where(Outing.lake_id == lake_id)
     if start_date:
-        query = query.filter(Outing.planned_date >= start_date)
-
-    outings = query.offset(skip).limit(limit).all()
-    return [
-        {
-            "id": str(outing.id),
-            "user_id": str(outing.user_id),
-            "lake_id": str(outing.lake_id),
-            "planned_date": outing.planned_date.isoformat(),
-            "time_slot": outing.time_slot,
-            "target_amenities": [str(a) for a in outing.target_amenities] if outing.target_amenities else [],
-        }
-        for outing in outings
-    ]
+        stmt += lambda s: s.where(Outing.planned_date >= start_date)
+    if end_date:
+        stmt += lambda s: s.where(Outing.planned_date <= end_date)
+    if invited_user_id:
+        stmt += lambda s: s.where(exists().where(
+            OutingParticipant.outing_id == Outing.id,
+            OutingParticipant.planned_date == Outing.planned_date,
+            OutingParticipant.user_id == invited_user_id,
+        ))
+    if amenity_id:
+        stmt += lambda s: s.where(Outing.target_amenities.overlap(amenity_id))
+
+    # outings is partitioned by month of planned_date: a date range only
+    # scans the partitions it covers, in index order.
+    stmt += lambda s: s.order_by(Outing.planned_date, Outing.id)
+    response.headers.add_vary_header("Accept")
+    if wants_ndjson(request, stream):
+        if stream_paged(request):
+            stmt += lambda s: s.offset(skip).limit(limit)
+        return stream_ndjson(stmt, _serialize_outing_summary, response.headers)
+
+    outings = db.scalars(stmt + (lambda s: s.offset(skip).limit(limit))).all()
+    if wants_msgpack(request):
+        return msgpack_response([_serialize_outing_summary(outing) for outing in outings], response.headers)
+    return [_serialize_outing_summary(outing) for outing in outings]
+
+
+@router.get("/invites/{user_id}", response_model=List[dict])
+def list_pending_invites(
+    user_id: UUID,
+    start_date: Optional[date] = Query(None),
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    outings = participants.pending_invites(db, user_id, start_date or date.today(), skip, limit)
+    return [_serialize_outing_summary(outing) for outing in outings]
 
 
+# RSVP counts by status are always included; the full invitee list only
+# with include_rsvp, since popular outings have many invitees.
 @router.get("/{outing_id}", response_model=dict)
-def get_outing(outing_id: UUID, db: Session = Depends(get_db)):
-    outing = db.query(Outing).filter(Outing.id == outing_id).first()
+def get_outing(outing_id: UUID, include_rsvp: bool = Query(False), db: Session = Depends(get_db)):
+    outing = get_by_id(db, Outing, outing_id)
     if not outing:
         raise HTTPException(status_code=404, detail="Outing not found")
-    return {
-        "id": str(outing.id),
-        "user_id": str(outing.user_id),
-        "lake_id": str(outing.lake_id),
-        "planned_date": outing.planned_date.isoformat(),
-        "time_slot": outing.time_slot,
-        "target_amenities": [str(a) for a in outing.target_amenities] if outing.target_amenities else [],
-        "invited_friends": [str(f) for f in outing.invited_friends] if outing.invited_friends else [],
-        "rsvp_status": outing.rsvp_status,
-        "notes": outing.notes,
-    }
+    result = _serialize_outing(outing)
+    result["rsvp_counts"] = participants.status_counts(db, outing_id)
+    if include_rsvp:
+        result["rsvp_status"] = {
+            str(participant.user_id): participant.status
+            for participant in participants.list_participants(db, outing_id, limit=None)
+        }
+    return result
+
+
+@router.get("/{outing_id}/participants", response_model=List[dict])
+def list_outing_participants(
+    outing_id: UUID,
+    status: Optional[str] = Query(None, pattern=f"^({'|'.join(participants.STATUSES)})$"),
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    _require_outing(db, outing_id)
+    rows = participants.list_participants(db, outing_id, status, skip, limit)
+    return [{**_serialize_participant(row), "username": row.username} for row in rows]
+
+
+@router.post("/{outing_id}/participants", response_model=dict)
+def invite_participants(outing_id: UUID, invite: ParticipantsInvite, db: Session = Depends(get_db)):
+    _require_outing(db, outing_id)
+    invited = participants.invite(db, outing_id, invite.user_ids)
+    db.commit()
+    return {"invited": invited}
+
+
+@router.put("/{outing_id}/participants/{user_id}", response_model=dict)
+def set_participant_status(
+    outing_id: UUID,
+    user_id: UUID,
+    update: ParticipantStatusUpdate,
+    db: Session = Depends(get_db)
+):
+    try:
+        participant = participants.set_status(db, outing_id, user_id, update.status)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+    if participant is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Outing not found")
+    db.commit()
+    return _serialize_participant(participant)
+
+
+@router.delete("/{outing_id}/participants/{user_id}", status_code=204)
+def remove_participant(outing_id: UUID, user_id: UUID, db: Session = Depends(get_db)):
+    if not participants.remove(db, outing_id, user_id):
+        raise HTTPException(status_code=404, detail="Participant not found")
+    db.commit()
+    return None
 
 
 @router.post("/", response_model=dict, status_code=201)
-def create_outing(outing_data: dict, db: Session = Depends(get_db)):
-    outing = Outing(**outing_data)
+def create_outing(outing_data: OutingCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    values = outing_data.model_dump(exclude_unset=True)
+    invited_friends = values.pop("invited_friends", [])
+    outing = Outing(**values)
     db.add(outing)
+    # Also rejects dates no outings partition covers yet (see
+    # app/jobs/outing_partitions.py).
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(e.orig).strip().splitlines()[0])
+    participants.invite(db, outing.id, invited_friends)
     db.commit()
     db.refresh(outing)
+    _publish_outing_event(background_tasks, "outing.created", _serialize_outing_summary(outing))
     return {"id": str(outing.id), "planned_date": outing.planned_date.isoformat()}
 
 
+@router.post(
+    "/bulk",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"user_id": "00000000-0000-0000-0000-000000000000", "lake_id": "00000000-0000-0000-0000-000000000000", "planned_date": "2026-07-04", "time_slot": "morning"},
+                        {"user_id": "00000000-0000-0000-0000-000000000000", "lake_id": "00000000-0000-0000-0000-000000000000", "planned_date": "2026-07-05", "time_slot": "afternoon"}
+                    ]
+                }
+            }
+        }
+    }
+)
+def create_outings_bulk(
+    outings_data: List[dict],
+    response: Response,
+    atomic: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    return bulk_insert(
+        db,
+        response,
+        Outing,
+        OutingCreate,
+        outings_data,
+        returning=[Outing.id, Outing.planned_date],
+        serialize=lambda outing: {"id": str(outing.id), "planned_date": outing.planned_date.isoformat()},
+        atomic=atomic,
+        related_fields=("invited_friends",),
+        insert_related=_invite_friends,
+    )
+
+
+@router.patch("/{outing_id}", response_model=dict)
+def update_outing(
+    outing_id: UUID,
+    outing_data: dict,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    return patch_entity(
+        db,
+        request,
+        response,
+        Outing,
+        OutingUpdate,
+        outing_id,
+        outing_data,
+        returning=[Outing.id, Outing.user_id, Outing.lake_id, Outing.planned_date, Outing.time_slot, Outing.target_amenities, Outing.notes],
+        serialize=_serialize_outing,
+        not_found="Outing not found",
+        on_update=lambda outing: _publish_outing_event(background_tasks, "outing.updated", outing),
+    )
+
+
 @router.delete("/{outing_id}", status_code=204)
-def delete_outing(outing_id: UUID, db: Session = Depends(get_db)):
-    outing = db.query(Outing).filter(Outing.id == outing_id).first()
+def delete_outing(outing_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    outing = get_by_id(db, Outing, outing_id)
     if not outing:
         raise HTTPException(status_code=404, detail="Outing not found")
 
+    deleted = _serialize_outing_summary(outing)
     db.delete(outing)
     db.commit()
+    _publish_outing_event(background_tasks, "outing.deleted", deleted)
     return None
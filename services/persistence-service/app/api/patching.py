@@ -0,0 +1,71 @@
+from typing import Callable, List, Optional, Type
+from uuid import UUID
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.caching import entity_etag, parse_entity_etag
+from app.api.lookups import exists_by_id
+
+
+# on_update is called with the serialized row once an update has been
+# committed; an empty body changes nothing and does not call it.
+def patch_entity(
+    db: Session,
+    request: Request,
+    response: Response,
+    model,
+    schema: Type[BaseModel],
+    entity_id: UUID,
+    data: dict,
+    returning: List,
+    serialize: Callable,
+    not_found: str,
+    on_update: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    try:
+        values = schema.model_validate(data).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+    if not values:
+        row = db.query(*returning, model.updated_at).filter(model.id == entity_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail=not_found)
+        response.headers["ETag"] = entity_etag(entity_id, row.updated_at)
+        return serialize(row)
+
+    stmt = update(model).where(model.id == entity_id)
+
+    # Optimistic concurrency: the update only applies if the row still has
+    # the updated_at the client's ETag was issued for.
+    if_match = request.headers.get("if-match")
+    if if_match is not None and if_match.strip() != "*":
+        expected = [parse_entity_etag(tag, entity_id) for tag in if_match.split(",")]
+        expected = [updated_at for updated_at in expected if updated_at is not None]
+        if not expected:
+            raise HTTPException(status_code=412, detail="If-Match does not match the current version")
+        stmt = stmt.where(model.updated_at.in_(expected))
+
+    stmt = stmt.values(**values).returning(*returning, model.updated_at).execution_options(synchronize_session=False)
+    try:
+        row = db.execute(stmt).first()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e.orig).strip().splitlines()[0])
+
+    if row is None:
+        db.rollback()
+        if not exists_by_id(db, model, entity_id):
+            raise HTTPException(status_code=404, detail=not_found)
+        raise HTTPException(status_code=412, detail="If-Match does not match the current version")
+
+    db.commit()
+    response.headers["ETag"] = entity_etag(entity_id, row.updated_at)
+    entity = serialize(row)
+    if on_update:
+        on_update(entity)
+    return entity
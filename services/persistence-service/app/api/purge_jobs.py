@@ -0,0 +1,55 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.api.lookups import get_by_id
+from app.core import get_db
+from app.models import PurgeJob
+from app.services import purge
+
+router = APIRouter()
+
+
+def _serialize_purge_job(job) -> dict:
+    return {
+        "id": str(job.id),
+        "entity_type": job.entity_type,
+        "entity_id": str(job.entity_id),
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "deleted_rows": job.deleted_rows,
+        "progress": round(min(job.deleted_rows / job.total_rows, 1.0), 4) if job.total_rows else 0.0,
+        "current_table": job.current_table,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+# Shared by DELETE /lakes/{id} and /users/{id}: 204 when the entity was
+# deleted inline, 202 with the purge job (and a Location to poll) otherwise.
+def delete_entity(db: Session, background_tasks: BackgroundTasks, entity_type: str, entity_id: UUID, not_found: str):
+    try:
+        job = purge.delete_or_queue(db, entity_type, entity_id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail=not_found)
+    if job is None:
+        return Response(status_code=204)
+
+    if job.status == purge.QUEUED:
+        background_tasks.add_task(purge.run_purge_job, job.id)
+    return JSONResponse(
+        status_code=202,
+        content=_serialize_purge_job(job),
+        headers={"Location": f"/api/v1/purge-jobs/{job.id}"},
+    )
+
+
+@router.get("/{job_id}", response_model=dict)
+def get_purge_job(job_id: UUID, db: Session = Depends(get_db)):
+    job = get_by_id(db, PurgeJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Purge job not found")
+    return _serialize_purge_job(job)
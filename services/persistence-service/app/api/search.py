@@ -0,0 +1,98 @@
+import base64
+import json
+from typing import Callable, Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import Float, and_, cast, func, or_, tuple_
+from sqlalchemy.orm import Session
+
+SEARCH_MODE_PATTERN = "^(prefix|fuzzy)$"
+# Trigram similarity is meaningless below three characters, so shorter
+# fuzzy queries are answered as prefix searches.
+MIN_FUZZY_LENGTH = 3
+
+
+def encode_cursor(*values) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+    return values
+
+
+def _parse_cursor(cursor: str, key_type: type) -> tuple:
+    values = decode_cursor(cursor)
+    try:
+        key, entity_id = values
+        if not isinstance(key, key_type):
+            raise TypeError
+        return key, UUID(entity_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+# Ranked name search with keyset paging.
+#
+# prefix: case-insensitive prefix match ordered by (lower(column), id), a
+#   range scan on the lower(column) COLLATE "C" btree index.
+# fuzzy: trigram match (the pg_trgm % operator, served by the gin_trgm_ops
+#   index) ordered by similarity, best first.
+#
+# next_cursor encodes the sort key of the last row returned and is passed
+# back as ?cursor= to fetch the following page.
+def trigram_search(
+    db: Session,
+    model,
+    column,
+    q: str,
+    mode: str,
+    limit: int,
+    cursor: Optional[str],
+    serialize: Callable,
+) -> dict:
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=422, detail="Search query must not be empty")
+
+    # similarity() returns real. The cursor carries the last score as a
+    # JSON float, bound as double precision, so the score is compared and
+    # ordered as double precision too: rows tied with the last row of a page
+    # are then neither skipped nor repeated.
+    score = cast(func.similarity(column, q), Float(53))
+    if mode == "fuzzy" and len(q) >= MIN_FUZZY_LENGTH:
+        query = db.query(model, score.label("score"), score.label("sort_key")).filter(column.op("%")(q))
+        if cursor:
+            last_score, last_id = _parse_cursor(cursor, float)
+            query = query.filter(or_(score < last_score, and_(score == last_score, model.id > last_id)))
+        query = query.order_by(score.desc(), model.id)
+    else:
+        key = func.lower(column).collate("C")
+        query = db.query(model, score.label("score"), key.label("sort_key"))
+        query = query.filter(key.like(_escape_like(q.lower()) + "%", escape="/"))
+        if cursor:
+            last_key, last_id = _parse_cursor(cursor, str)
+            query = query.filter(tuple_(key, model.id) > tuple_(last_key, last_id))
+        query = query.order_by(key, model.id)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].sort_key, str(rows[-1][0].id))
+
+    return {
+        "results": [{**serialize(entity), "score": round(row_score, 4)} for entity, row_score, _ in rows],
+        "next_cursor": next_cursor,
+    }
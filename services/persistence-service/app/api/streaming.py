@@ -0,0 +1,70 @@
+import json
+import logging
+from typing import Callable, Mapping, Optional, Union
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Executable
+
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows fetched per round trip from the server-side cursor.
+STREAM_BATCH_SIZE = 1000
+# Lines are buffered up to this size before being handed to the server, so
+# each chunk is not a separate threadpool hop and socket write.
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+# Streams return every matching row; skip and limit only page them when the
+# client sends them explicitly, since their defaults are for JSON pages.
+def stream_paged(request: Request) -> bool:
+    return "skip" in request.query_params or "limit" in request.query_params
+
+
+# Streams every row of query (a Query, or a statement selecting one entity)
+# as newline-delimited JSON.
+#
+# The request's session from get_db is closed before a StreamingResponse
+# body runs, so the query is re-bound to a session owned by the generator.
+# yield_per makes the ORM fetch through a server-side cursor, keeping memory
+# flat regardless of the result size.
+def stream_ndjson(query: Union[Query, Executable], serialize: Callable,
+                  headers: Optional[Mapping[str, str]] = None) -> StreamingResponse:
+    def lines():
+        db = SessionLocal()
+        buffer = []
+        size = 0
+        count = 0
+        try:
+            if isinstance(query, Query):
+                rows = query.with_session(db).yield_per(STREAM_BATCH_SIZE)
+            else:
+                rows = db.scalars(query, execution_options={"yield_per": STREAM_BATCH_SIZE})
+            for row in rows:
+                line = json.dumps(serialize(row), separators=(",", ":"), default=str) + "\n"
+                buffer.append(line)
+                size += len(line)
+                count += 1
+                # Flush the first row straight away for a low time-to-first-byte.
+                if size >= STREAM_CHUNK_BYTES or count == 1:
+                    yield "".join(buffer)
+                    buffer = []
+                    size = 0
+            if buffer:
+                yield "".join(buffer)
+        except Exception as e:
+            # Headers are already sent, so the client sees a truncated body.
+            logger.error(f"Error streaming {count} rows so far: {e}")
+            raise
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=dict(headers or {}))
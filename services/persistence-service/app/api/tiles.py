@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.caching import REFERENCE_CACHE_CONTROL, is_not_modified, not_modified
+from app.core import get_db
+from app.services import boundaries
+
+router = APIRouter()
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+# Lakes, amenities, boat ramps and marinas as a Mapbox vector tile. The
+# ETag is the tile generation, so clients and CDNs revalidate for free
+# until a feature in any tile changes; empty tiles are 204.
+@router.get(
+    "/{z}/{x}/{y}.mvt",
+    response_class=Response,
+    responses={200: {"content": {MVT_MEDIA_TYPE: {}}}, 204: {"description": "Empty tile"}},
+)
+def get_tile(
+    request: Request,
+    z: int = Path(ge=0, le=boundaries.MAX_ZOOM),
+    x: int = Path(ge=0),
+    y: int = Path(ge=0),
+    db: Session = Depends(get_db)
+):
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    generation = boundaries.tile_cache.current_generation(db)
+    etag = f'"{generation:x}-{z}-{x}-{y}"'
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, REFERENCE_CACHE_CONTROL)
+
+    tile = boundaries.get_tile(db, z, x, y, generation)
+    headers = {"ETag": etag, "Cache-Control": REFERENCE_CACHE_CONTROL}
+    if not tile:
+        return Response(status_code=204, headers=headers)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
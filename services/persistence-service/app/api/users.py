@@ -1,33 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from app.core import get_db
+from app.api.auth import hash_password, require_admin, require_auth
+from app.api.bulk import bulk_insert
+from app.api.caching import (
+    PRIVATE_CACHE_CONTROL, collection_version, entity_etag, entity_not_modified,
+    is_not_modified, not_modified, set_validators,
+)
+from app.api.lookups import get_by_id
+from app.api.patching import patch_entity
+from app.api.purge_jobs import delete_entity
+from app.api.streaming import stream_ndjson, stream_paged, wants_ndjson
+from app.api.search import SEARCH_MODE_PATTERN, trigram_search
+from app.core import SessionLocal, get_db
 from app.models import User
+from app.schemas import PasswordUpdate, UserCreate, UserImport, UserUpdate
 
 router = APIRouter()
+# Sign-up needs no token; everything on router does.
+public_router = APIRouter()
+
+
+def _serialize_user_summary(user) -> dict:
+    return {
+        "id": str(user.id),
+        "username": user.username,
+        "email": user.email,
+        "owns_boat": user.owns_boat,
+    }
 
 
 @router.get("/", response_model=List[dict])
-def list_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = db.query(User).offset(skip).limit(limit).all()
-    return [
-        {
-            "id": str(user.id),
-            "username": user.username,
-            "email": user.email,
-            "owns_boat": user.owns_boat,
-        }
-        for user in users
-    ]
+def list_users(
+    request: Request,
+    response: Response,
+    stream: bool = Query(False),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    query = db.query(User)
+
+    ndjson = wants_ndjson(request, stream)
+    etag = collection_version(request, query, User, "ndjson" if ndjson else "")
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, PRIVATE_CACHE_CONTROL, "Accept")
+    set_validators(response, etag, None, PRIVATE_CACHE_CONTROL, "Accept")
+
+    query = query.order_by(User.id)
+    if ndjson:
+        if stream_paged(request):
+            query = query.offset(skip).limit(limit)
+        return stream_ndjson(query, _serialize_user_summary, response.headers)
+
+    users = query.offset(skip).limit(limit).all()
+    return [_serialize_user_summary(user) for user in users]
+
+
+@router.get("/search", response_model=dict)
+def search_users(
+    q: str = Query(..., min_length=1, max_length=255),
+    mode: str = Query("fuzzy", pattern=SEARCH_MODE_PATTERN),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    return trigram_search(db, User, User.username, q, mode, limit, cursor, lambda user: {"id": str(user.id), "username": user.username})
 
 
 @router.get("/{user_id}", response_model=dict)
-def get_user(user_id: UUID, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+def get_user(user_id: UUID, request: Request, response: Response, db: Session = Depends(get_db)):
+    cached = entity_not_modified(request, db, User, user_id, PRIVATE_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    user = get_by_id(db, User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    set_validators(response, entity_etag(user.id, user.updated_at), user.updated_at, PRIVATE_CACHE_CONTROL)
     return {
         "id": str(user.id),
         "username": user.username,
@@ -38,7 +93,7 @@ def get_user(user_id: UUID, db: Session = Depends(get_db)):
     }
 
 
-@router.post(
+@public_router.post(
     "/",
     response_model=dict,
     status_code=201,
@@ -49,7 +104,7 @@ def get_user(user_id: UUID, db: Session = Depends(get_db)):
                     "example": {
                         "username": "hsimpson",
                         "email": "homer@example.com",
-                        "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5NU7t.6cLxHQW",
+                        "password": "correct horse battery staple",
                         "preferred_lake_id": "00000000-0000-0000-0000-000000000000",
                         "owns_boat": True,
                         "schedule_preferences": {
@@ -76,34 +131,116 @@ def get_user(user_id: UUID, db: Session = Depends(get_db)):
         }
     }
 )
-def create_user(user_data: dict, db: Session = Depends(get_db)):
-    user = User(**user_data)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return {"id": str(user.id), "username": user.username, "email": user.email}
+async def create_user(user_data: UserCreate):
+    values = user_data.model_dump(exclude_unset=True)
+    values["password_hash"] = await hash_password(values.pop("password"))
+    return await run_in_threadpool(_insert_user, values)
 
 
-@router.put("/{user_id}", response_model=dict)
-def update_user(user_id: UUID, user_data: dict, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+def _insert_user(values: dict) -> dict:
+    with SessionLocal() as db:
+        user = User(**values)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return {"id": str(user.id), "username": user.username, "email": user.email}
 
-    for key, value in user_data.items():
-        setattr(user, key, value)
 
-    db.commit()
-    db.refresh(user)
-    return {"id": str(user.id), "username": user.username, "email": user.email}
+@router.post(
+    "/bulk",
+    response_model=dict,
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"username": "hsimpson", "email": "homer@example.com", "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5NU7t.6cLxHQW"},
+                        {"username": "mszyslak", "email": "moe@example.com", "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5NU7t.6cLxHQW"}
+                    ]
+                }
+            }
+        }
+    }
+)
+def create_users_bulk(
+    users_data: List[dict],
+    response: Response,
+    atomic: bool = Query(True),
+    db: Session = Depends(get_db),
+    claims: Optional[dict] = Depends(require_admin),
+):
+    return bulk_insert(
+        db,
+        response,
+        User,
+        UserImport,
+        users_data,
+        returning=[User.id, User.username, User.email],
+        serialize=lambda user: {"id": str(user.id), "username": user.username, "email": user.email},
+        atomic=atomic,
+    )
 
 
-@router.delete("/{user_id}", status_code=204)
-def delete_user(user_id: UUID, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+# Users may only change or delete their own account, unless their token
+# is an admin's (anyone's while AUTH_REQUIRED is off).
+def _require_self(claims: Optional[dict], user_id: UUID, detail: str):
+    if claims is not None and claims["sub"] != str(user_id) and not claims.get("admin"):
+        raise HTTPException(status_code=403, detail=detail)
+
+
+@router.patch("/{user_id}", response_model=dict)
+@router.put("/{user_id}", response_model=dict)
+def update_user(
+    user_id: UUID,
+    user_data: dict,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    claims: Optional[dict] = Depends(require_auth),
+):
+    _require_self(claims, user_id, "Cannot change another user's account")
+    return patch_entity(
+        db,
+        request,
+        response,
+        User,
+        UserUpdate,
+        user_id,
+        user_data,
+        returning=[User.id, User.username, User.email],
+        serialize=lambda user: {"id": str(user.id), "username": user.username, "email": user.email},
+        not_found="User not found",
+    )
+
+
+# Users may only change their own password (any password while
+# AUTH_REQUIRED is off).
+@router.put("/{user_id}/password", status_code=204)
+async def set_user_password(user_id: UUID, update_data: PasswordUpdate, claims: Optional[dict] = Depends(require_auth)):
+    if claims is not None and claims["sub"] != str(user_id):
+        raise HTTPException(status_code=403, detail="Cannot change another user's password")
+    password_hash = await hash_password(update_data.password)
+    if not await run_in_threadpool(_update_password, user_id, password_hash):
         raise HTTPException(status_code=404, detail="User not found")
+    return Response(status_code=204)
+
+
+def _update_password(user_id: UUID, password_hash: str) -> bool:
+    with SessionLocal() as db:
+        updated = db.execute(
+            update(User).where(User.id == user_id).values(password_hash=password_hash, updated_at=datetime.utcnow())
+        ).rowcount
+        db.commit()
+        return bool(updated)
+
 
-    db.delete(user)
-    db.commit()
-    return None
+@router.delete("/{user_id}", status_code=204, responses={202: {"description": "Purge job queued"}})
+def delete_user(
+    user_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    claims: Optional[dict] = Depends(require_auth),
+):
+    _require_self(claims, user_id, "Cannot delete another user's account")
+    return delete_entity(db, background_tasks, "user", user_id, not_found="User not found")
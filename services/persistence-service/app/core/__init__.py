@@ -1,4 +1,10 @@
 from .config import settings
-from .database import get_db, engine
+from .database import get_db, get_engine, SessionLocal
 
-__all__ = ["settings", "get_db", "engine"]
+__all__ = ["settings", "get_db", "get_engine", "SessionLocal", "engine"]
+
+
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
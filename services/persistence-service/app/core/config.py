@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -11,6 +12,142 @@ class Settings(BaseSettings):
 
     LOG_LEVEL: str = "INFO"
 
+    # "api" serves HTTP only, "worker" runs the RabbitMQ consumers only,
+    # "all" does both in one process.
+    RUN_MODE: str = "all"
+    RABBITMQ_CONNECT_TIMEOUT: float = 5.0
+    RABBITMQ_RETRY_MAX_DELAY: float = 30.0
+
+    # API authentication. Tokens from POST /api/v1/auth/token are HS256 JWTs
+    # signed with JWT_SECRET and valid for JWT_EXPIRE_SECONDS; claims of
+    # verified tokens are cached per process (JWT_CACHE_SIZE tokens) until
+    # they expire. AUTH_REQUIRED=false leaves the API open for local use;
+    # otherwise the API refuses to start unless JWT_SECRET is set to a
+    # random value of at least 32 characters. Tokens of ADMIN_USERNAMES
+    # carry an admin claim, e.g. ["importer"], which POST /users/bulk needs.
+    AUTH_REQUIRED: bool = True
+    JWT_SECRET: str = "change-me"
+    JWT_ISSUER: str = "lake-platform"
+    JWT_EXPIRE_SECONDS: int = 3600
+    JWT_LEEWAY_SECONDS: int = 30
+    JWT_CACHE_SIZE: int = 10000
+    ADMIN_USERNAMES: List[str] = []
+
+    # bcrypt runs in PASSWORD_HASH_WORKERS dedicated processes; requests
+    # beyond PASSWORD_HASH_MAX_PENDING queued hashes get 503.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Cache-Control max-age for reference data (lakes, amenities, ramps).
+    REFERENCE_CACHE_MAX_AGE: int = 60
+
+    # Identical concurrent reads of hot endpoints (a lake, a lake's amenity
+    # list) share one query and response. SINGLE_FLIGHT_WINDOW_MS > 0 also
+    # reuses a finished result for requests arriving that long after it,
+    # at the cost of serving data up to that old.
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_WINDOW_MS: float = 0.0
+
+    # Maximum number of items accepted by the POST /{resource}/bulk endpoints.
+    BULK_MAX_ITEMS: int = 1000
+
+    # Consumer worker pool (python -m app.worker). WORKER_QUEUE_PROCESSES
+    # overrides the per-queue default, e.g. {"persistence_audit_queue": 4}.
+    WORKER_PROCESSES: int = 1
+    WORKER_QUEUE_PROCESSES: Dict[str, int] = {}
+    WORKER_SHUTDOWN_TIMEOUT: float = 30.0
+
+    # Per-client token bucket for /api requests: RATE_LIMIT_RATE requests per
+    # second sustained, bursts of up to RATE_LIMIT_BURST. "redis" shares the
+    # buckets between instances (requires the redis package).
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_RATE: float = 20.0
+    RATE_LIMIT_BURST: int = 40
+    RATE_LIMIT_BACKEND: str = "local"
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Load shedding: /api requests get 503 + Retry-After once this many are
+    # in flight, or when waiting for a database connection takes longer than
+    # LOAD_SHED_POOL_WAIT_MS on average.
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_MAX_IN_FLIGHT: int = 200
+    LOAD_SHED_POOL_WAIT_MS: float = 250.0
+    LOAD_SHED_RETRY_AFTER: int = 2
+
+    # Responses smaller than COMPRESSION_MIN_SIZE bytes are sent as-is.
+    # Brotli is used when the client accepts it and the brotli package is
+    # installed, gzip otherwise.
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Contention history rollup (python -m app.jobs.contention_rollup):
+    # baselines average the last CONTENTION_BASELINE_WEEKS of history; raw
+    # history partitions older than the retention are dropped.
+    CONTENTION_BASELINE_WEEKS: int = 26
+    CONTENTION_HISTORY_RETENTION_MONTHS: int = 24
+
+    # Outing partitions (python -m app.jobs.outing_partitions): monthly
+    # partitions are kept OUTINGS_PARTITION_MONTHS_AHEAD months ahead;
+    # partitions older than OUTINGS_ARCHIVE_AFTER_MONTHS are moved to
+    # OUTINGS_ARCHIVE_TABLESPACE when one is set.
+    OUTINGS_PARTITION_MONTHS_AHEAD: int = 24
+    OUTINGS_ARCHIVE_AFTER_MONTHS: int = 12
+    OUTINGS_ARCHIVE_TABLESPACE: str = ""
+
+    # Demand simulation (python -m app.jobs.demand_simulation): scenarios
+    # per run, processes they are spread over, and weeks of outing history
+    # the demand is calibrated on.
+    SIMULATION_SCENARIOS: int = 10000
+    SIMULATION_WORKERS: int = 4
+    SIMULATION_HISTORY_WEEKS: int = 104
+
+    # Analytics export (python -m app.jobs.analytics_export): Parquet files
+    # go under EXPORT_DIR. Each run reads up to EXPORT_SAFETY_LAG_SECONDS
+    # ago, EXPORT_BATCH_ROWS rows per Arrow record batch.
+    EXPORT_DIR: str = "exports"
+    EXPORT_BATCH_ROWS: int = 50000
+    EXPORT_SAFETY_LAG_SECONDS: int = 300
+    EXPORT_COMPRESSION: str = "zstd"
+
+    # Facility availability (python -m app.jobs.availability_windows): open
+    # windows are precomputed this many days ahead, with sunrise and sunset
+    # resolved in LAKE_TIMEZONE.
+    AVAILABILITY_HORIZON_DAYS: int = 240
+    LAKE_TIMEZONE: str = "America/New_York"
+
+    # DELETE /lakes/{id} and /users/{id}: entities with more dependent rows
+    # than PURGE_SYNC_MAX_ROWS are purged by a background job (202) in
+    # batches of PURGE_BATCH_SIZE rows. Running jobs that made no progress
+    # for PURGE_STALE_SECONDS are resumed by python -m app.jobs.purge.
+    PURGE_SYNC_MAX_ROWS: int = 10000
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_STALE_SECONDS: int = 300
+
+    # Live lake updates (/api/v1/live/...): open streams per process, updates
+    # a slow client may fall behind by before it is told to resync, the
+    # coalescing window, and the idle heartbeat interval.
+    LIVE_MAX_CONNECTIONS: int = 20000
+    LIVE_MAX_PENDING: int = 100
+    LIVE_COALESCE_MS: int = 250
+    LIVE_HEARTBEAT_SECONDS: float = 15.0
+    LIVE_QUEUE_MAX_LENGTH: int = 10000
+
+    # Vector tiles (/api/v1/tiles/{z}/{x}/{y}.mvt): rendered tiles cached per
+    # process up to TILE_CACHE_MAX_BYTES, points drawn from
+    # TILE_POINTS_MIN_ZOOM, and the tile generation re-read at most every
+    # TILE_GENERATION_CHECK_SECONDS to drop tiles made stale by edits.
+    TILE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TILE_POINTS_MIN_ZOOM: int = 10
+    TILE_GENERATION_CHECK_SECONDS: float = 1.0
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,17 +1,91 @@
+import math
+import threading
+import time
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from typing import Generator
 from .config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=False
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class PoolStats:
+    # Exponentially weighted average of connection checkout waits. Between
+    # checkouts the average also decays with time, so it recovers once load
+    # drops even if shedding means no new connections are checked out.
+    SMOOTHING = 0.2
+    DECAY_SECONDS = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._average = 0.0
+        self._updated = time.monotonic()
+        self.waiting = 0
+
+    def _decayed(self, now: float) -> float:
+        return self._average * math.exp(-(now - self._updated) / self.DECAY_SECONDS)
+
+    def start_wait(self):
+        with self._lock:
+            self.waiting += 1
+
+    def finish_wait(self, seconds: float):
+        now = time.monotonic()
+        with self._lock:
+            self.waiting -= 1
+            self._average = self._decayed(now) * (1 - self.SMOOTHING) + seconds * self.SMOOTHING
+            self._updated = now
+
+    @property
+    def average_wait(self) -> float:
+        with self._lock:
+            return self._decayed(time.monotonic())
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # Times every checkout so load shedding can react to pool saturation
+    # before requests pile up waiting for a connection.
+    def _do_get(self):
+        pool_stats.start_wait()
+        started = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.finish_wait(time.monotonic() - started)
+
+
+@lru_cache()
+def get_engine() -> Engine:
+    return create_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=False
+    )
+
+
+@lru_cache()
+def get_session_factory() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def SessionLocal() -> Session:
+    return get_session_factory()()
+
+
+def __getattr__(name: str):
+    # The engine is built on first use rather than at import so that run
+    # modes and tooling that never touch the database start faster.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db() -> Generator[Session, None, None]:
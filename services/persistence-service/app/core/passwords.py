@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(Exception):
+    pass
+
+
+# bcrypt is imported in the pool processes only; the API process never
+# hashes, so it neither loads bcrypt nor holds the GIL for ~250 ms a hash.
+def _hash(password: str, rounds: int) -> str:
+    import bcrypt
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode("ascii")
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    import bcrypt
+    try:
+        return bcrypt.checkpw(password.encode(), password_hash.encode("ascii"))
+    except ValueError:
+        # Not a bcrypt hash (e.g. a placeholder on a seeded account).
+        return False
+
+
+class PasswordHasher:
+    # Runs bcrypt in a dedicated pool of spawned processes, so hashing
+    # blocks neither the event loop nor the request threadpool. At most
+    # max_pending hashes may be queued or running; beyond that callers get
+    # PasswordHashingBusy instead of joining a queue that a burst of logins
+    # could grow to minutes. The pool starts on first use.
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dummy_hash: Optional[str] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"Started password hashing pool with {self.workers} processes")
+        return self._executor
+
+    async def _run(self, function, *args):
+        if self.pending >= self.max_pending:
+            raise PasswordHashingBusy()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), function, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, password_hash: Optional[str]) -> bool:
+        # Unknown users are checked against a throwaway hash of the same
+        # cost, so response times don't reveal which usernames exist.
+        if password_hash is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash(secrets.token_urlsafe(16))
+            await self._run(_verify, password, self._dummy_hash)
+            return False
+        return await self._run(_verify, password, password_hash)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING, settings.PASSWORD_BCRYPT_ROUNDS
+)
@@ -0,0 +1,48 @@
+import time
+from typing import Dict, Iterable, Optional
+
+# Captured when the process first imports the service package, which is as
+# close to interpreter start as the application can observe.
+PROCESS_STARTED_AT = time.monotonic()
+
+
+class Readiness:
+    def __init__(self):
+        self.components: Dict[str, bool] = {}
+        self.required: set = set()
+        self.startup_seconds: Optional[float] = None
+        self.first_request_seconds: Optional[float] = None
+
+    def require(self, names: Iterable[str]):
+        for name in names:
+            self.required.add(name)
+            self.components.setdefault(name, False)
+
+    def mark(self, name: str, ready: bool = True):
+        self.components[name] = ready
+
+    def mark_started(self):
+        self.startup_seconds = time.monotonic() - PROCESS_STARTED_AT
+
+    def mark_first_request(self):
+        if self.first_request_seconds is None:
+            self.first_request_seconds = time.monotonic() - PROCESS_STARTED_AT
+
+    @property
+    def is_ready(self) -> bool:
+        return all(self.components.get(name, False) for name in self.required)
+
+    def snapshot(self) -> dict:
+        if self.is_ready:
+            status = "ready" if all(self.components.values()) else "degraded"
+        else:
+            status = "starting"
+        return {
+            "status": status,
+            "components": dict(self.components),
+            "startup_seconds": self.startup_seconds,
+            "first_request_seconds": self.first_request_seconds,
+        }
+
+
+readiness = Readiness()
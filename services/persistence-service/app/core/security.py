@@ -0,0 +1,163 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+# API tokens are compact HS256 JWTs signed with JWT_SECRET. They are
+# verified on every request, so verification is kept to microseconds: the
+# keyed HMAC state is built once per secret and copied per token, headers
+# are parsed once per distinct encoding, and the claims of verified tokens
+# are cached until they expire.
+ALGORITHM = "HS256"
+# Anyone can forge tokens signed with the published default, and HS256
+# secrets shorter than the 256-bit hash are easier to brute-force.
+DEFAULT_JWT_SECRET = "change-me"
+MIN_JWT_SECRET_LENGTH = 32
+
+
+class TokenError(ValueError):
+    pass
+
+
+# Called before the API starts serving: with authentication required, a
+# default or short JWT_SECRET would let anyone sign valid tokens.
+def check_jwt_secret():
+    if not settings.AUTH_REQUIRED:
+        return
+    if settings.JWT_SECRET == DEFAULT_JWT_SECRET or len(settings.JWT_SECRET) < MIN_JWT_SECRET_LENGTH:
+        raise RuntimeError(
+            f"JWT_SECRET must be set to a random value of at least {MIN_JWT_SECRET_LENGTH} characters "
+            f"when AUTH_REQUIRED is true, e.g. python -c 'import secrets; print(secrets.token_urlsafe(48))'"
+        )
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    except (binascii.Error, ValueError):
+        raise TokenError("Malformed token")
+
+
+def _json(value: dict) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+_HEADER = _b64encode(_json({"alg": ALGORITHM, "typ": "JWT"}))
+
+
+# Keyed HMAC-SHA256 state for a secret; copies of it sign and verify tokens.
+@lru_cache(maxsize=8)
+def _keyed_mac(secret: str) -> "hmac.HMAC":
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+def _signature(signing_input: bytes, secret: str) -> bytes:
+    mac = _keyed_mac(secret).copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+# Tokens from other issuers may serialize the same header differently, so
+# headers are parsed, but only once per distinct encoding.
+@lru_cache(maxsize=64)
+def _header_algorithm(header: str) -> Optional[str]:
+    try:
+        return json.loads(_b64decode(header)).get("alg")
+    except (TokenError, ValueError, AttributeError):
+        return None
+
+
+def issue_token(subject: str, extra_claims: Optional[dict] = None, now: Optional[float] = None) -> Tuple[str, int]:
+    issued_at = int(now if now is not None else time.time())
+    claims = {
+        "sub": subject,
+        "iss": settings.JWT_ISSUER,
+        "iat": issued_at,
+        "exp": issued_at + settings.JWT_EXPIRE_SECONDS,
+        **(extra_claims or {}),
+    }
+    signing_input = f"{_HEADER}.{_b64encode(_json(claims))}"
+    signature = _signature(signing_input.encode("ascii"), settings.JWT_SECRET)
+    return f"{signing_input}.{_b64encode(signature)}", settings.JWT_EXPIRE_SECONDS
+
+
+# Verifies a token's signature, issuer and lifetime and returns its claims.
+def decode_token(token: str, now: Optional[float] = None) -> dict:
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise TokenError("Malformed token")
+    header, payload, signature = parts
+    if _header_algorithm(header) != ALGORITHM:
+        raise TokenError("Unsupported token algorithm")
+
+    expected = _signature(f"{header}.{payload}".encode("ascii", "replace"), settings.JWT_SECRET)
+    if not hmac.compare_digest(expected, _b64decode(signature)):
+        raise TokenError("Invalid token signature")
+
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        raise TokenError("Malformed token")
+    if not isinstance(claims, dict) or not isinstance(claims.get("sub"), str):
+        raise TokenError("Token has no subject")
+    if claims.get("iss") != settings.JWT_ISSUER:
+        raise TokenError("Token issuer not accepted")
+
+    now = now if now is not None else time.time()
+    expires_at = claims.get("exp")
+    if not isinstance(expires_at, (int, float)) or now > expires_at + settings.JWT_LEEWAY_SECONDS:
+        raise TokenError("Token expired")
+    not_before = claims.get("nbf")
+    if isinstance(not_before, (int, float)) and now < not_before - settings.JWT_LEEWAY_SECONDS:
+        raise TokenError("Token not yet valid")
+    return claims
+
+
+class TokenCache:
+    # LRU of token -> claims for tokens that verified. Entries are dropped
+    # when their token expires. Only used from the event loop thread (the
+    # auth dependency is async), so it needs no lock.
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._claims: "OrderedDict[str, dict]" = OrderedDict()
+
+    def get(self, token: str, now: float) -> Optional[dict]:
+        claims = self._claims.get(token)
+        if claims is None:
+            return None
+        if now > claims["exp"] + settings.JWT_LEEWAY_SECONDS:
+            del self._claims[token]
+            return None
+        self._claims.move_to_end(token)
+        return claims
+
+    def put(self, token: str, claims: dict):
+        self._claims[token] = claims
+        if len(self._claims) > self.max_size:
+            self._claims.popitem(last=False)
+
+    def clear(self):
+        self._claims.clear()
+
+
+token_cache = TokenCache(settings.JWT_CACHE_SIZE)
+
+
+def verify_token(token: str) -> dict:
+    now = time.time()
+    claims = token_cache.get(token, now)
+    if claims is None:
+        claims = decode_token(token, now)
+        token_cache.put(token, claims)
+    return claims
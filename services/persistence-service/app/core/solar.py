@@ -0,0 +1,54 @@
+import math
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Solar zenith at sunrise/sunset: 90 degrees plus refraction and the sun's
+# apparent radius (NOAA's standard value).
+ZENITH = 90.833
+
+
+def _utc_event_minutes(latitude: float, longitude: float, day: date, rising: bool) -> Optional[float]:
+    # NOAA sunrise equation; accurate to about a minute at mid latitudes.
+    gamma = 2 * math.pi / 365 * (day.timetuple().tm_yday - 1)
+    equation_of_time = 229.18 * (
+        0.000075 + 0.001868 * math.cos(gamma) - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma) - 0.040849 * math.sin(2 * gamma)
+    )
+    declination = (
+        0.006918 - 0.399912 * math.cos(gamma) + 0.070257 * math.sin(gamma)
+        - 0.006758 * math.cos(2 * gamma) + 0.000907 * math.sin(2 * gamma)
+        - 0.002697 * math.cos(3 * gamma) + 0.00148 * math.sin(3 * gamma)
+    )
+    lat = math.radians(latitude)
+    cos_hour_angle = (
+        math.cos(math.radians(ZENITH)) / (math.cos(lat) * math.cos(declination))
+        - math.tan(lat) * math.tan(declination)
+    )
+    if not -1 <= cos_hour_angle <= 1:
+        return None  # polar day or night
+    hour_angle = math.degrees(math.acos(cos_hour_angle))
+    if not rising:
+        hour_angle = -hour_angle
+    return 720 - 4 * (longitude + hour_angle) - equation_of_time
+
+
+# Local sunrise and sunset on day, as minutes after local midnight. Cached
+# since every facility at a lake shares the lake's sun times.
+@lru_cache(maxsize=65536)
+def sun_times(latitude: float, longitude: float, day: date, timezone: str) -> Tuple[Optional[int], Optional[int]]:
+    tz = ZoneInfo(timezone)
+    midnight_utc = datetime(day.year, day.month, day.day, tzinfo=ZoneInfo("UTC"))
+    local_midnight = datetime(day.year, day.month, day.day, tzinfo=tz)
+
+    def local_minutes(utc_minutes: Optional[float]) -> Optional[int]:
+        if utc_minutes is None:
+            return None
+        local = (midnight_utc + timedelta(minutes=utc_minutes)).astimezone(tz)
+        return round((local.replace(tzinfo=None) - local_midnight.replace(tzinfo=None)).total_seconds() / 60)
+
+    return (
+        local_minutes(_utc_event_minutes(latitude, longitude, day, rising=True)),
+        local_minutes(_utc_event_minutes(latitude, longitude, day, rising=False)),
+    )
@@ -0,0 +1,18 @@
+from typing import Optional
+
+# Compact codes for time slots in high-volume tables. Codes are persisted,
+# so existing values must never be renumbered; add new slots at the end.
+TIME_SLOTS = ("morning", "afternoon", "evening")
+
+SLOT_CODES = {slot: code for code, slot in enumerate(TIME_SLOTS, start=1)}
+UNKNOWN_SLOT_CODE = 0
+
+
+def slot_code(time_slot: Optional[str]) -> int:
+    return SLOT_CODES.get((time_slot or "").lower(), UNKNOWN_SLOT_CODE)
+
+
+def slot_name(code: int) -> Optional[str]:
+    if 1 <= code <= len(TIME_SLOTS):
+        return TIME_SLOTS[code - 1]
+    return None
@@ -0,0 +1,73 @@
+"""
+Weekend amenity allocation.
+
+Runs the allocation optimizer (app/services/allocation.py) for every lake
+with outings planned on the coming weekend, or on the weekend on or after
+--date, and stores its recommended reassignments and contention scores:
+
+    python -m app.jobs.allocation
+    python -m app.jobs.allocation --date 2026-07-04 --lake-id <uuid>
+
+Each lake is optimized and committed in its own transaction, so one
+failing lake doesn't hold back the others. Schedule it a few times a week
+ahead of each weekend, e.g. from cron; a lake can also be optimized on
+demand with POST /api/v1/lakes/{lake_id}/allocation.
+"""
+import argparse
+import logging
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Outing
+from app.services.allocation import optimize_weekend, weekend_dates
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run_allocation(day: date, lake_id: Optional[UUID] = None) -> list:
+    db = SessionLocal()
+    try:
+        if lake_id:
+            lake_ids = [lake_id]
+        else:
+            lake_ids = db.execute(
+                select(Outing.lake_id).where(Outing.planned_date.in_(weekend_dates(day))).distinct()
+            ).scalars().all()
+    finally:
+        db.close()
+
+    logger.info(f"{len(lake_ids)} lakes to allocate for the weekend of {weekend_dates(day)[0]}")
+    summaries = []
+    for current in lake_ids:
+        db = SessionLocal()
+        try:
+            summaries.append(optimize_weekend(db, current, day))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Allocation failed for lake {current}: {e}")
+            db.rollback()
+        finally:
+            db.close()
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Optimize the weekend on or after this date")
+    parser.add_argument("--lake-id", type=UUID, default=None)
+    args = parser.parse_args()
+    run_allocation(args.date or date.today(), args.lake_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Incremental analytics export.
+
+Copies new and changed rows of outings, amenity_contention,
+weather_forecasts and audit_log into Parquet files, so analytics reads
+files instead of querying the production tables:
+
+    python -m app.jobs.analytics_export
+    python -m app.jobs.analytics_export --sources outings audit_log --output-dir /data/exports
+
+Each source has a watermark column (updated_at, or created_at / fetched_at
+for rows that are never updated) and a high-water mark in
+export_watermarks. A run reads the rows whose watermark falls after the
+mark and up to EXPORT_SAFETY_LAG_SECONDS ago through a server-side cursor.
+Rows are written as Arrow record batches, one file per run and date
+partition:
+
+    <output-dir>/<table>/day=YYYY-MM-DD/part-<run>.parquet
+
+The partition date is the outing's planned_date, the contention date, the
+forecast_date, or the day an audit event was created. The mark only moves
+once every file of the run is in place, so a failed run is simply redone by
+the next. Rows changed since their last export appear again in a later
+file: keep the latest by id and watermark. Deletions are not exported.
+Schedule it e.g. hourly from cron, one run at a time.
+"""
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.models import ExportWatermark
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+UUID_TYPE = pa.string()
+SCORE_TYPE = pa.decimal128(5, 2)
+
+
+@dataclass(frozen=True)
+class Source:
+    table: str
+    watermark: str
+    partition: str
+    # (name, SQL expression, Arrow type). UUIDs and JSONB are read as text.
+    columns: Tuple[Tuple[str, str, pa.DataType], ...]
+
+    @property
+    def schema(self) -> pa.Schema:
+        return pa.schema([(name, arrow_type) for name, _, arrow_type in self.columns])
+
+
+SOURCES = {
+    source.table: source for source in (
+        Source("outings", "updated_at", "planned_date", (
+            ("id", "id::text", UUID_TYPE),
+            ("user_id", "user_id::text", UUID_TYPE),
+            ("lake_id", "lake_id::text", UUID_TYPE),
+            ("planned_date", "planned_date", pa.date32()),
+            ("time_slot", "time_slot", pa.string()),
+            ("target_amenities", "target_amenities::text[]", pa.list_(UUID_TYPE)),
+            ("notes", "notes", pa.string()),
+            ("created_at", "created_at", pa.timestamp("us")),
+            ("updated_at", "updated_at", pa.timestamp("us")),
+        )),
+        Source("amenity_contention", "updated_at", "date", (
+            ("id", "id::text", UUID_TYPE),
+            ("amenity_id", "amenity_id::text", UUID_TYPE),
+            ("date", "date", pa.date32()),
+            ("time_slot", "time_slot", pa.string()),
+            ("planned_groups_count", "planned_groups_count", pa.int32()),
+            ("contention_score", "contention_score", SCORE_TYPE),
+            ("updated_at", "updated_at", pa.timestamp("us")),
+        )),
+        Source("weather_forecasts", "fetched_at", "forecast_date", (
+            ("id", "id::text", UUID_TYPE),
+            ("lake_id", "lake_id::text", UUID_TYPE),
+            ("forecast_date", "forecast_date", pa.date32()),
+            ("temperature_high", "temperature_high", SCORE_TYPE),
+            ("temperature_low", "temperature_low", SCORE_TYPE),
+            ("precipitation_probability", "precipitation_probability", pa.int32()),
+            ("wind_speed", "wind_speed", SCORE_TYPE),
+            ("conditions", "conditions", pa.string()),
+            ("raw_data", "raw_data::text", pa.string()),
+            ("fetched_at", "fetched_at", pa.timestamp("us")),
+        )),
+        Source("audit_log", "created_at", "created_at::date", (
+            ("id", "id::text", UUID_TYPE),
+            ("event_type", "event_type", pa.string()),
+            ("user_id", "user_id::text", UUID_TYPE),
+            ("entity_type", "entity_type", pa.string()),
+            ("entity_id", "entity_id::text", UUID_TYPE),
+            ("payload", "payload::text", pa.string()),
+            ("created_at", "created_at", pa.timestamp("us")),
+        )),
+    )
+}
+
+
+# Rows in (since, through], partition date first so that each partition's
+# rows arrive together and only one file is open at a time.
+def export_query(source: Source, incremental: bool):
+    columns = ", ".join(expression for _, expression, _ in source.columns)
+    lower = f"{source.watermark} > :since AND " if incremental else ""
+    return text(f"""
+        SELECT {source.partition} AS export_day, {columns}
+        FROM {source.table}
+        WHERE {lower}{source.watermark} <= :through
+        ORDER BY {source.partition}, {source.watermark}
+    """)
+
+
+def record_batch(rows: Sequence, schema: pa.Schema) -> pa.RecordBatch:
+    # Column 0 is the partition date, which is in the file's path.
+    columns = list(zip(*rows))[1:]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+    )
+
+
+def export_source(engine: Engine, source: Source, output_dir: Path, through: datetime,
+                  batch_rows: int, compression: str) -> dict:
+    with engine.connect() as conn:
+        since = conn.execute(
+            select(ExportWatermark.exported_through).where(ExportWatermark.source == source.table)
+        ).scalar()
+    if since is not None and since >= through:
+        return {"rows": 0, "files": 0}
+
+    schema = source.schema
+    run = through.strftime("%Y%m%dT%H%M%S%f")
+    # Files are written under a temporary name and renamed only once the
+    # whole run has succeeded, so readers never see a partial export.
+    files: List[Tuple[Path, Path]] = []
+    writer: Optional[pq.ParquetWriter] = None
+    current_day = None
+    rows = 0
+    try:
+        with engine.connect() as conn:
+            # yield_per streams the rows through a server-side cursor.
+            result = conn.execution_options(yield_per=batch_rows).execute(
+                export_query(source, since is not None), {"since": since, "through": through}
+            )
+            for chunk in result.partitions():
+                for day, group in groupby(chunk, key=itemgetter(0)):
+                    group = list(group)
+                    if day != current_day:
+                        if writer is not None:
+                            writer.close()
+                        final = output_dir / source.table / f"day={day.isoformat()}" / f"part-{run}.parquet"
+                        final.parent.mkdir(parents=True, exist_ok=True)
+                        temporary = final.with_name(final.name + ".tmp")
+                        files.append((temporary, final))
+                        writer = pq.ParquetWriter(temporary, schema, compression=compression)
+                        current_day = day
+                    writer.write_batch(record_batch(group, schema))
+                    rows += len(group)
+        if writer is not None:
+            writer.close()
+            writer = None
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        for temporary, _ in files:
+            temporary.unlink(missing_ok=True)
+        raise
+
+    for temporary, final in files:
+        temporary.replace(final)
+
+    with engine.begin() as conn:
+        stmt = pg_insert(ExportWatermark).values(
+            source=source.table, exported_through=through, rows_exported=rows, updated_at=datetime.utcnow()
+        )
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[ExportWatermark.source],
+            set_={
+                "exported_through": stmt.excluded.exported_through,
+                "rows_exported": ExportWatermark.rows_exported + stmt.excluded.rows_exported,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ))
+    return {"rows": rows, "files": len(files)}
+
+
+def run_export(sources: Sequence[str], output_dir: Path, batch_rows: int, safety_lag_seconds: int,
+               compression: str) -> dict:
+    started = time.monotonic()
+    engine = get_engine()
+    # Timestamps are taken when a transaction starts but only become visible
+    # when it commits; stopping short of now leaves time for transactions
+    # still in flight to commit before their rows are passed by the mark.
+    # Watermark columns hold naive UTC (datetime.utcnow), so the bound is
+    # taken in UTC too, whatever the server's TimeZone.
+    with engine.connect() as conn:
+        through = conn.execute(
+            text("SELECT (now() AT TIME ZONE 'utc') - make_interval(secs => :lag)"), {"lag": safety_lag_seconds}
+        ).scalar()
+
+    summary = {"through": through.isoformat()}
+    for name in sources:
+        source_started = time.monotonic()
+        exported = export_source(engine, SOURCES[name], output_dir, through, batch_rows, compression)
+        logger.info(f"Exported {exported['rows']} {name} rows to {exported['files']} files "
+                    f"in {time.monotonic() - source_started:.2f}s")
+        summary[name] = exported
+    summary["seconds"] = round(time.monotonic() - started, 2)
+    logger.info(f"Analytics export finished: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), default=list(SOURCES))
+    parser.add_argument("--output-dir", type=Path, default=Path(settings.EXPORT_DIR))
+    parser.add_argument("--batch-rows", type=int, default=settings.EXPORT_BATCH_ROWS)
+    parser.add_argument("--safety-lag-seconds", type=int, default=settings.EXPORT_SAFETY_LAG_SECONDS)
+    parser.add_argument("--compression", default=settings.EXPORT_COMPRESSION)
+    args = parser.parse_args()
+    run_export(args.sources, args.output_dir, args.batch_rows, args.safety_lag_seconds, args.compression)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Facility availability windows.
+
+Normalizes the free-form hours_of_operation / seasonal_availability JSON of
+amenities, boat ramps and marinas into facility_schedules, and expands the
+schedules into per-day open windows (availability_windows) for the next
+--horizon-days, resolving sunrise and sunset for each lake's coordinates:
+
+    python -m app.jobs.availability_windows
+    python -m app.jobs.availability_windows --horizon-days 240 --rebuild
+
+Only facilities whose updated_at changed since the last run are re-parsed
+and have their windows recomputed; for the rest, windows are only added for
+the days that came into the horizon. Days in the past are deleted. Pass
+--rebuild after changing lake coordinates or LAKE_TIMEZONE. Schedule it
+daily, e.g. from cron.
+"""
+import argparse
+import logging
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.models import Lake
+from app.models.availability import FACILITY_MODELS, AvailabilityWindow, FacilitySchedule
+from app.services.schedules import DaySchedule, ScheduleError, TimeSpec, open_window, parse_hours, parse_season
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+schedules_table = FacilitySchedule.__table__
+windows_table = AvailabilityWindow.__table__
+
+
+def _chunks(items: list, size: int = BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _schedule_rows(facility_type: str, facility) -> List[dict]:
+    if getattr(facility, "is_active", True) is False:
+        return []
+    hours = parse_hours(facility.hours_of_operation)
+    season = parse_season(getattr(facility, "seasonal_availability", None))
+    return [
+        {
+            "facility_type": facility_type,
+            "facility_id": facility.id,
+            "day_of_week": day_of_week,
+            "lake_id": facility.lake_id,
+            "opens_kind": day_schedule.opens.kind,
+            "opens_minute": day_schedule.opens.minute,
+            "closes_kind": day_schedule.closes.kind,
+            "closes_minute": day_schedule.closes.minute,
+            "season_start": season[0] if season else None,
+            "season_end": season[1] if season else None,
+            "source_updated_at": facility.updated_at,
+        }
+        for day_of_week, day_schedule in sorted(hours.items())
+    ]
+
+
+# Re-parses facilities that changed since their schedule was written and
+# drops schedules of deleted facilities. Returns the (type, id) pairs whose
+# windows have to be recomputed.
+def sync_schedules(conn: Connection, rebuild: bool) -> Set[Tuple[str, UUID]]:
+    changed: Set[Tuple[str, UUID]] = set()
+    for facility_type, model in FACILITY_MODELS.items():
+        current = dict(conn.execute(
+            select(FacilitySchedule.facility_id, func.max(FacilitySchedule.source_updated_at))
+            .where(FacilitySchedule.facility_type == facility_type)
+            .group_by(FacilitySchedule.facility_id)
+        ).all())
+        versions = dict(conn.execute(select(model.id, model.updated_at)).all())
+
+        stale = [facility_id for facility_id, updated_at in versions.items() if rebuild or current.get(facility_id) != updated_at]
+        removed = [facility_id for facility_id in current if facility_id not in versions]
+        changed.update((facility_type, facility_id) for facility_id in stale + removed)
+
+        columns = [model.id, model.lake_id, model.updated_at, model.hours_of_operation]
+        for optional in ("seasonal_availability", "is_active"):
+            if hasattr(model, optional):
+                columns.append(getattr(model, optional))
+
+        for ids in _chunks(stale + removed):
+            conn.execute(delete(schedules_table).where(
+                FacilitySchedule.facility_type == facility_type, FacilitySchedule.facility_id.in_(ids)
+            ))
+        for ids in _chunks(stale):
+            rows = []
+            for facility in conn.execute(select(*columns).where(model.id.in_(ids))):
+                try:
+                    rows.extend(_schedule_rows(facility_type, facility))
+                except ScheduleError as e:
+                    logger.warning(f"Skipping {facility_type} {facility.id}: {e}")
+            if rows:
+                conn.execute(insert(schedules_table), rows)
+
+        logger.info(f"{facility_type}: {len(stale)} schedules refreshed, {len(removed)} removed")
+    return changed
+
+
+def _load_schedules(conn: Connection) -> Dict[Tuple[str, UUID], dict]:
+    facilities: Dict[Tuple[str, UUID], dict] = {}
+    for row in conn.execute(select(schedules_table)):
+        facility = facilities.setdefault((row.facility_type, row.facility_id), {
+            "lake_id": row.lake_id,
+            "hours": {},
+            "season": (row.season_start, row.season_end) if row.season_start is not None else None,
+        })
+        facility["hours"][row.day_of_week] = DaySchedule(
+            TimeSpec(row.opens_kind, row.opens_minute), TimeSpec(row.closes_kind, row.closes_minute)
+        )
+    return facilities
+
+
+def run_refresh(horizon_days: int, rebuild: bool = False, today: Optional[date] = None) -> dict:
+    today = today or date.today()
+    until = today + timedelta(days=horizon_days)
+    started = time.monotonic()
+
+    with get_engine().begin() as conn:
+        covered_until = None if rebuild else conn.execute(select(func.max(AvailabilityWindow.day))).scalar()
+        changed = sync_schedules(conn, rebuild)
+
+        expired = conn.execute(delete(windows_table).where(AvailabilityWindow.day < today)).rowcount
+        if rebuild:
+            conn.execute(delete(windows_table))
+        else:
+            for pairs in _chunks(sorted(changed)):
+                conn.execute(delete(windows_table).where(
+                    tuple_(AvailabilityWindow.facility_type, AvailabilityWindow.facility_id).in_(pairs)
+                ))
+
+        lakes = {lake.id: (float(lake.latitude), float(lake.longitude)) for lake in conn.execute(
+            select(Lake.id, Lake.latitude, Lake.longitude)
+        )}
+        # Unchanged facilities already have windows up to covered_until.
+        extend_from = max(today, covered_until + timedelta(days=1)) if covered_until else today
+
+        rows = []
+        inserted = 0
+        for (facility_type, facility_id), facility in _load_schedules(conn).items():
+            latitude, longitude = lakes[facility["lake_id"]]
+            day = today if (facility_type, facility_id) in changed else extend_from
+            while day <= until:
+                window = open_window(facility["hours"], facility["season"], day, latitude, longitude, settings.LAKE_TIMEZONE)
+                if window:
+                    rows.append({
+                        "facility_type": facility_type,
+                        "facility_id": facility_id,
+                        "day": day,
+                        "lake_id": facility["lake_id"],
+                        "opens_minute": window[0],
+                        "closes_minute": window[1],
+                    })
+                day += timedelta(days=1)
+            if len(rows) >= BATCH_SIZE:
+                conn.execute(insert(windows_table), rows)
+                inserted += len(rows)
+                rows = []
+        if rows:
+            conn.execute(insert(windows_table), rows)
+            inserted += len(rows)
+
+    summary = {
+        "facilities_changed": len(changed),
+        "windows_inserted": inserted,
+        "windows_expired": expired,
+        "until": until.isoformat(),
+        "seconds": round(time.monotonic() - started, 2),
+    }
+    logger.info(f"Availability refresh finished: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizon-days", type=int, default=settings.AVAILABILITY_HORIZON_DAYS)
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse every schedule and recompute every window")
+    args = parser.parse_args()
+    run_refresh(args.horizon_days, args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Amenity contention rollup.
+
+Downsamples the raw amenity_contention_history into per amenity / ISO
+weekday / time slot baselines that the contention scorer reads:
+
+    python -m app.jobs.contention_rollup
+    python -m app.jobs.contention_rollup --window-weeks 26 --retention-months 24
+
+Each run first makes sure history partitions exist for the coming months,
+then recomputes every baseline from the last --window-weeks of history
+(one row per amenity/day/slot: the latest snapshot of the day and the
+highest attendance observed), and finally drops history partitions older
+than --retention-months. Schedule it daily, e.g. from cron.
+"""
+import argparse
+import logging
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.jobs.partitions import add_months, drop_partitions_before, ensure_monthly_partitions, month_start
+from app.models.contention_history import ATTENDANCE, SNAPSHOT
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TABLE = "amenity_contention_history"
+
+ROLLUP_SQL = text(f"""
+    WITH per_day AS (
+        SELECT amenity_id, observed_on, slot,
+               max(planned_groups) FILTER (WHERE kind = {SNAPSHOT}) AS planned_groups,
+               max(attendance) FILTER (WHERE kind = {ATTENDANCE}) AS attendance,
+               (array_agg(score_centi ORDER BY recorded_at DESC) FILTER (WHERE kind = {SNAPSHOT}))[1] AS score_centi
+        FROM amenity_contention_history
+        WHERE observed_on >= :since AND observed_on < :until
+        GROUP BY amenity_id, observed_on, slot
+    )
+    INSERT INTO amenity_contention_baselines (
+        amenity_id, day_of_week, slot, sample_days,
+        avg_planned_groups, avg_attendance, p90_attendance, avg_score, updated_at
+    )
+    SELECT per_day.amenity_id,
+           extract(isodow FROM per_day.observed_on)::smallint,
+           per_day.slot,
+           count(*),
+           avg(per_day.planned_groups),
+           avg(per_day.attendance),
+           percentile_cont(0.9) WITHIN GROUP (ORDER BY per_day.attendance),
+           avg(per_day.score_centi) / 100.0,
+           :run_started
+    FROM per_day
+    JOIN amenities ON amenities.id = per_day.amenity_id
+    GROUP BY per_day.amenity_id, extract(isodow FROM per_day.observed_on), per_day.slot
+    ON CONFLICT (amenity_id, day_of_week, slot) DO UPDATE SET
+        sample_days = excluded.sample_days,
+        avg_planned_groups = excluded.avg_planned_groups,
+        avg_attendance = excluded.avg_attendance,
+        p90_attendance = excluded.p90_attendance,
+        avg_score = excluded.avg_score,
+        updated_at = excluded.updated_at
+""")
+
+
+def run_rollup(window_weeks: int, retention_months: int, months_ahead: int, today: Optional[date] = None) -> dict:
+    today = today or date.today()
+    since = today - timedelta(weeks=window_weeks)
+    started = time.monotonic()
+
+    with get_engine().begin() as conn:
+        created = ensure_monthly_partitions(conn, HISTORY_TABLE, "observed_on", today, months_ahead)
+
+        run_started = conn.execute(text("SELECT localtimestamp")).scalar()
+        updated = conn.execute(ROLLUP_SQL, {"since": since, "until": today, "run_started": run_started}).rowcount
+        # Combinations with no history left in the window no longer have a
+        # meaningful baseline.
+        removed = conn.execute(
+            text("DELETE FROM amenity_contention_baselines WHERE updated_at < :run_started"),
+            {"run_started": run_started},
+        ).rowcount
+
+        dropped = drop_partitions_before(conn, HISTORY_TABLE, add_months(month_start(today), -retention_months))
+
+    summary = {
+        "baselines_updated": updated,
+        "baselines_removed": removed,
+        "partitions_created": created,
+        "partitions_dropped": dropped,
+        "seconds": round(time.monotonic() - started, 2),
+    }
+    logger.info(f"Contention rollup finished: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--window-weeks", type=int, default=settings.CONTENTION_BASELINE_WEEKS)
+    parser.add_argument("--retention-months", type=int, default=settings.CONTENTION_HISTORY_RETENTION_MONTHS)
+    parser.add_argument("--months-ahead", type=int, default=12, help="History partitions to create in advance")
+    args = parser.parse_args()
+    run_rollup(args.window_weeks, args.retention_months, args.months_ahead)
+
+
+if __name__ == "__main__":
+    main()
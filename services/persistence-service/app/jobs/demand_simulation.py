@@ -0,0 +1,98 @@
+"""
+Weekend demand simulation.
+
+Runs Monte Carlo scenarios of demand at a lake over upcoming dates and
+reports, per amenity and time slot, the probability that it saturates
+(app/services/demand_simulation.py describes the model):
+
+    python -m app.jobs.demand_simulation --lake-id <uuid>
+    python -m app.jobs.demand_simulation --lake-id <uuid> --date 2026-07-03 --days 3 \\
+        --demand-factor 1.8 --scenarios 20000 --json july4.json
+
+Dates default to the coming weekend. --demand-factor scales demand for
+holidays that same-weekday history doesn't reflect. Amenities whose
+saturation probability reaches --min-probability in some slot are printed,
+most likely first; --json writes the full result. Nothing is stored.
+"""
+import argparse
+import json
+import logging
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Amenity
+from app.services.allocation import weekend_dates
+from app.services.contention import MAX_SCORE
+from app.services.demand_simulation import build_model, simulate
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+
+def print_report(result: dict, names: dict, min_probability: float):
+    slots = [f"{slot['date'][5:]} {slot['time_slot'][:3]}" for slot in result["slots"]]
+    rows = [
+        amenity for amenity in result["amenities"]
+        if max(amenity["saturation_probability"], default=0.0) >= min_probability
+    ]
+    rows.sort(key=lambda amenity: max(amenity["saturation_probability"]), reverse=True)
+    print(f"{'amenity':40s} " + " ".join(f"{slot:>9s}" for slot in slots))
+    for amenity in rows:
+        name, amenity_type = names.get(amenity["amenity_id"], ("?", "?"))
+        label = f"{name or amenity['amenity_id'][:8]} ({amenity_type})"[:40]
+        print(f"{label:40s} " + " ".join(f"{probability:9.1%}" for probability in amenity["saturation_probability"]))
+    print(f"{len(rows)} of {len(result['amenities'])} amenities reach {min_probability:.0%} in some slot "
+          f"({result['scenarios']} scenarios, {result['seconds']}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lake-id", type=UUID, required=True)
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="First date (default: coming Saturday)")
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--demand-factor", type=float, default=1.0)
+    parser.add_argument("--scenarios", type=int, default=settings.SIMULATION_SCENARIOS)
+    parser.add_argument("--workers", type=int, default=settings.SIMULATION_WORKERS)
+    parser.add_argument("--history-weeks", type=int, default=settings.SIMULATION_HISTORY_WEEKS)
+    parser.add_argument("--threshold", type=float, default=MAX_SCORE, help="Score counted as saturated")
+    parser.add_argument("--min-probability", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="Write the full result to this file")
+    args = parser.parse_args()
+    if args.scenarios < 1:
+        parser.error("--scenarios must be at least 1")
+
+    start = args.date or weekend_dates(date.today())[0]
+    dates = [start + timedelta(days=offset) for offset in range(args.days)]
+
+    db = SessionLocal()
+    try:
+        model = build_model(db, args.lake_id, dates, args.history_weeks, args.demand_factor)
+        names = {
+            str(amenity_id): (name, amenity_type)
+            for amenity_id, name, amenity_type in db.execute(
+                select(Amenity.id, Amenity.name, Amenity.type).where(Amenity.lake_id == args.lake_id)
+            )
+        }
+    finally:
+        db.close()
+
+    result = simulate(model, args.scenarios, args.workers, args.threshold, args.seed)
+    result["lake_id"] = str(args.lake_id)
+    print_report(result, names, args.min_probability)
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(result, output, indent=2)
+        logger.info(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
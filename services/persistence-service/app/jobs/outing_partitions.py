@@ -0,0 +1,80 @@
+"""
+Outing partition maintenance.
+
+outings is range-partitioned by month of planned_date. This creates the
+partitions for the coming months and moves past seasons to cheaper storage:
+
+    python -m app.jobs.outing_partitions
+    python -m app.jobs.outing_partitions --months-ahead 24 --archive-after-months 12
+
+There is no default partition, so an outing planned for a month without a
+partition is rejected; --months-ahead must cover the furthest date users
+can plan for. When OUTINGS_ARCHIVE_TABLESPACE (or --archive-tablespace) is
+set, partitions whose month ended more than --archive-after-months ago are
+moved there with their indexes, one partition per transaction. The
+tablespace itself is created by the database administrator. Schedule it
+daily, e.g. from cron.
+"""
+import argparse
+import logging
+import time
+from datetime import date
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.jobs.partitions import add_months, ensure_monthly_partitions, month_start, monthly_partitions, move_partition
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+OUTINGS_TABLE = "outings"
+
+
+def run_maintenance(months_ahead: int, archive_after_months: int, archive_tablespace: str,
+                    today: Optional[date] = None) -> dict:
+    today = today or date.today()
+    started = time.monotonic()
+    engine = get_engine()
+
+    with engine.begin() as conn:
+        created = ensure_monthly_partitions(conn, OUTINGS_TABLE, "planned_date", today, months_ahead)
+        partitions = monthly_partitions(conn, OUTINGS_TABLE)
+
+    archived = []
+    if archive_tablespace:
+        cutoff = add_months(month_start(today), -archive_after_months)
+        for month, name in partitions:
+            if add_months(month, 1) > cutoff:
+                break
+            # Each move locks only its own partition, and only until its
+            # transaction commits.
+            with engine.begin() as conn:
+                if move_partition(conn, name, archive_tablespace):
+                    archived.append(name)
+
+    summary = {
+        "partitions_created": created,
+        "partitions_archived": archived,
+        "seconds": round(time.monotonic() - started, 2),
+    }
+    logger.info(f"Outing partition maintenance finished: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months-ahead", type=int, default=settings.OUTINGS_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--archive-after-months", type=int, default=settings.OUTINGS_ARCHIVE_AFTER_MONTHS)
+    parser.add_argument("--archive-tablespace", default=settings.OUTINGS_ARCHIVE_TABLESPACE,
+                        help="Tablespace for past partitions; empty to keep them in place")
+    args = parser.parse_args()
+    run_maintenance(args.months_ahead, args.archive_after_months, args.archive_tablespace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import logging
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y%m}"
+
+
+# Creates monthly range partitions of table covering the month of start
+# through months_ahead months later. Safe to run repeatedly. Rows that
+# landed in the table's default partition for a month that had no partition
+# yet are moved into the new partition before it is attached.
+def ensure_monthly_partitions(conn: Connection, table: str, column: str, start: date, months_ahead: int) -> List[str]:
+    created = []
+    default = f"{table}_default"
+    has_default = conn.execute(text("SELECT to_regclass(:name)"), {"name": default}).scalar() is not None
+    month = month_start(start)
+    for _ in range(months_ahead + 1):
+        name = partition_name(table, month)
+        exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists is None:
+            bounds = {"start": month, "end": add_months(month, 1)}
+            conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            if has_default:
+                moved = conn.execute(text(f"""
+                    WITH moved AS (
+                        DELETE FROM {default} WHERE {column} >= :start AND {column} < :end RETURNING *
+                    )
+                    INSERT INTO {name} SELECT * FROM moved
+                """), bounds).rowcount
+                if moved:
+                    logger.info(f"Moved {moved} rows from {default} into {name}")
+            conn.execute(text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+            ))
+            created.append(name)
+            logger.info(f"Created partition {name}")
+        month = add_months(month, 1)
+    return created
+
+
+def monthly_partitions(conn: Connection, table: str) -> List[tuple]:
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": table}).scalars()
+    pattern = re.compile(rf"^{re.escape(table)}_(\d{{4}})(\d{{2}})$")
+    partitions = []
+    for name in rows:
+        match = pattern.match(name)
+        if match:
+            partitions.append((date(int(match.group(1)), int(match.group(2)), 1), name))
+    return sorted(partitions)
+
+
+# Drops monthly partitions whose whole month lies before cutoff.
+def drop_partitions_before(conn: Connection, table: str, cutoff: date) -> List[str]:
+    dropped = []
+    for month, name in monthly_partitions(conn, table):
+        if add_months(month, 1) <= cutoff:
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+            logger.info(f"Dropped partition {name}")
+    return dropped
+
+
+# Moves a partition and its indexes to tablespace, taking an exclusive lock
+# on that partition only while its files are copied. Relations already in
+# the tablespace are skipped, so it is safe to run repeatedly. Returns
+# whether anything was moved.
+def move_partition(conn: Connection, name: str, tablespace: str) -> bool:
+    tablespace_oid = conn.execute(
+        text("SELECT oid FROM pg_tablespace WHERE spcname = :tablespace"), {"tablespace": tablespace}
+    ).scalar()
+    if tablespace_oid is None:
+        raise ValueError(f"Tablespace {tablespace} does not exist")
+    relations = conn.execute(text("""
+        SELECT relation.relname, relation.relkind
+        FROM pg_class relation
+        WHERE (relation.oid = to_regclass(:name)
+               OR relation.oid IN (SELECT indexrelid FROM pg_index WHERE indrelid = to_regclass(:name)))
+          AND relation.reltablespace <> :tablespace_oid
+        ORDER BY relation.relkind DESC
+    """), {"name": name, "tablespace_oid": tablespace_oid}).all()
+    for relname, relkind in relations:
+        kind = "TABLE" if relkind == "r" else "INDEX"
+        conn.execute(text(f'ALTER {kind} {relname} SET TABLESPACE "{tablespace}"'))
+    if relations:
+        logger.info(f"Moved {name} ({len(relations)} relations) to tablespace {tablespace}")
+    return bool(relations)
@@ -0,0 +1,44 @@
+"""
+Purge job runner.
+
+Purge jobs normally run in the API process right after DELETE /lakes/{id}
+or /users/{id} queues them. This picks up jobs that never started or whose
+process died mid-way (no progress for PURGE_STALE_SECONDS) and runs them to
+completion; already deleted batches are not repeated:
+
+    python -m app.jobs.purge
+
+Schedule it periodically, e.g. every few minutes from cron.
+"""
+import argparse
+import logging
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.purge import pending_job_ids, run_purge_job
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        job_ids = pending_job_ids(db)
+    finally:
+        db.close()
+
+    logger.info(f"{len(job_ids)} purge jobs to run")
+    for job_id in job_ids:
+        run_purge_job(job_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 
-from app.api import api_router
 from app.core.config import settings
+from app.core.database import get_engine
+from app.core.readiness import readiness
+from app.middleware import CompressionMiddleware, LoadSheddingMiddleware, RateLimitMiddleware
 from app.messaging.rabbitmq import rabbitmq_client
-from app.messaging.handlers import handle_audit_event, handle_outing_created, handle_weather_alert
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
@@ -15,25 +18,85 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+SERVES_API = settings.RUN_MODE in ("api", "all")
+RUNS_CONSUMERS = settings.RUN_MODE in ("worker", "all")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    logger.info("Starting persistence service...")
+
+def _check_database():
+    with get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+    readiness.mark("database")
+
+
+async def _start_database():
     try:
-        await rabbitmq_client.connect()
-        await rabbitmq_client.subscribe("audit.*", "persistence_audit_queue", handle_audit_event)
-        await rabbitmq_client.subscribe("outing.created", "persistence_outing_queue", handle_outing_created)
-        await rabbitmq_client.subscribe("weather.alert", "persistence_weather_queue", handle_weather_alert)
-        logger.info("Persistence service started successfully")
+        await asyncio.to_thread(_check_database)
     except Exception as e:
-        logger.error(f"Failed to start persistence service: {e}")
+        logger.error(f"Database not reachable at startup: {e}")
+
+
+async def _start_messaging():
+    await rabbitmq_client.connect_with_retry()
+    readiness.mark("messaging")
+    if SERVES_API:
+        from app.messaging.live import start_live_updates
+        await start_live_updates(rabbitmq_client)
+    if RUNS_CONSUMERS:
+        from app.messaging.consumers import start_consumers
+        await start_consumers(rabbitmq_client)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(f"Starting persistence service in {settings.RUN_MODE} mode...")
+    if SERVES_API:
+        from app.core.security import check_jwt_secret
+        check_jwt_secret()
+    readiness.require(["database"])
+    readiness.mark("messaging", False)
+    if RUNS_CONSUMERS:
+        from app.messaging.consumers import CONSUMERS
+        queue_names = [queue_name for _, queue_name, _ in CONSUMERS]
+        if SERVES_API:
+            for queue_name in queue_names:
+                readiness.mark(queue_name, False)
+        else:
+            readiness.require(["messaging", *queue_names])
+
+    # Database warm-up and broker connection/subscriptions run in the
+    # background so the service starts answering requests immediately.
+    startup_tasks = [
+        asyncio.create_task(_start_database()),
+        asyncio.create_task(_start_messaging()),
+    ]
+    readiness.mark_started()
+    logger.info(f"Persistence service accepting requests after {readiness.startup_seconds * 1000:.0f} ms")
 
     yield
 
     logger.info("Shutting down persistence service...")
+    if SERVES_API:
+        from app.core.passwords import password_hasher
+        from app.messaging.live import live_hub
+        live_hub.close_all()
+        password_hasher.shutdown()
+    for task in startup_tasks:
+        task.cancel()
+    await rabbitmq_client.drain(settings.WORKER_SHUTDOWN_TIMEOUT)
     await rabbitmq_client.close()
 
 
+class FirstRequestTimer:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and readiness.first_request_seconds is None:
+            readiness.mark_first_request()
+            logger.info(f"First request received {readiness.first_request_seconds * 1000:.0f} ms after process start")
+        await self.app(scope, receive, send)
+
+
 app = FastAPI(
     title="Lake Platform Persistence Service",
     description="Data persistence and management service for the lake recreation platform",
@@ -43,23 +106,44 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     openapi_tags=[
+        {"name": "auth", "description": "Access tokens (JWT) for the API"},
         {"name": "users", "description": "User management operations"},
         {"name": "lakes", "description": "Lake data operations"},
         {"name": "amenities", "description": "Lake amenity operations"},
         {"name": "boat-ramps", "description": "Boat ramp operations"},
+        {"name": "marinas", "description": "Marina and rental inventory operations"},
         {"name": "outings", "description": "Outing planning operations"},
+        {"name": "friends", "description": "Friend requests and social graph queries"},
+        {"name": "purge-jobs", "description": "Progress of background lake and user deletions"},
+        {"name": "live", "description": "Live outing, contention and rental updates per lake (SSE / WebSocket)"},
+        {"name": "tiles", "description": "Mapbox vector tiles of lakes, amenities, boat ramps and marinas"},
     ]
 )
 
+# Added before CORS so that 429/503 responses still carry CORS headers.
+# The rate limiter runs first, so rejected clients do not count as load.
+if settings.LOAD_SHED_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Location", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining"],
 )
 
-app.include_router(api_router, prefix="/api/v1")
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+app.add_middleware(FirstRequestTimer)
+
+if SERVES_API:
+    from app.api import api_router
+    app.include_router(api_router, prefix="/api/v1")
 
 
 @app.get("/health")
@@ -67,6 +151,23 @@ def health_check():
     return {"status": "healthy", "service": "persistence"}
 
 
+@app.get("/health/live")
+async def liveness_check():
+    return {"status": "alive", "service": "persistence", "mode": settings.RUN_MODE}
+
+
+@app.get("/health/ready")
+def readiness_check(response: Response):
+    if not readiness.components.get("database"):
+        try:
+            _check_database()
+        except Exception as e:
+            logger.warning(f"Readiness database check failed: {e}")
+    if not readiness.is_ready:
+        response.status_code = 503
+    return {"service": "persistence", "mode": settings.RUN_MODE, **readiness.snapshot()}
+
+
 @app.get("/metrics")
 def metrics():
     return {"message": "Metrics endpoint placeholder"}
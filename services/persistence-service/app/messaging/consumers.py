@@ -0,0 +1,27 @@
+import asyncio
+import logging
+from typing import Callable, List, Tuple
+
+from app.core.readiness import readiness
+from app.messaging.handlers import handle_audit_event, handle_outing_created, handle_weather_alert
+from app.messaging.rabbitmq import RabbitMQClient
+
+logger = logging.getLogger(__name__)
+
+# (routing key, queue name, handler) for every queue this service consumes.
+CONSUMERS: List[Tuple[str, str, Callable]] = [
+    ("audit.*", "persistence_audit_queue", handle_audit_event),
+    ("outing.created", "persistence_outing_queue", handle_outing_created),
+    ("weather.alert", "persistence_weather_queue", handle_weather_alert),
+]
+
+
+async def start_consumers(client: RabbitMQClient):
+    async def subscribe(routing_key: str, queue_name: str, handler: Callable):
+        try:
+            await client.subscribe(routing_key, queue_name, handler)
+            readiness.mark(queue_name)
+        except Exception as e:
+            logger.error(f"Consumer for {queue_name} not started: {e}")
+
+    await asyncio.gather(*(subscribe(*consumer) for consumer in CONSUMERS))
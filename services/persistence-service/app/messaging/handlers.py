@@ -1,8 +1,11 @@
+import asyncio
 import logging
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.models import AuditLog
+from app.models import AuditLog, Outing
 from app.core.database import SessionLocal
+from app.messaging.rabbitmq import rabbitmq_client
+from app.services.contention import refresh_contention
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +30,35 @@ async def handle_audit_event(data: dict):
         db.close()
 
 
+def _refresh_outing_contention(outing_id: str) -> list:
+    db: Session = SessionLocal()
+    try:
+        outing = db.query(Outing).filter(Outing.id == outing_id).first()
+        if not outing:
+            logger.warning(f"Outing {outing_id} not found, skipping contention refresh")
+            return []
+        updates = []
+        for amenity_id in outing.target_amenities or []:
+            update = refresh_contention(db, amenity_id, outing.planned_date, outing.time_slot)
+            if update:
+                updates.append({"lake_id": str(outing.lake_id), **update})
+        db.commit()
+        logger.info(f"Refreshed contention for {len(outing.target_amenities or [])} amenities of outing {outing_id}")
+        return updates
+    except Exception as e:
+        logger.error(f"Failed to refresh contention for outing {outing_id}: {e}")
+        db.rollback()
+        return []
+    finally:
+        db.close()
+
+
 async def handle_outing_created(data: dict):
     logger.info(f"Outing created event received: {data}")
+    outing_id = data.get("outing_id") or data.get("id")
+    if outing_id:
+        for update in await asyncio.to_thread(_refresh_outing_contention, outing_id):
+            await rabbitmq_client.publish_event("contention.updated", update)
 
 
 async def handle_weather_alert(data: dict):
@@ -0,0 +1,141 @@
+"""
+Live lake updates.
+
+Every API process binds its own exclusive queue to the outing.*,
+contention.* and rental.* events on lake_platform_events and fans them out
+to the SSE and WebSocket clients watching the event's lake (app/api/live.py).
+
+Each connection owns a Subscription: a small map of pending updates keyed by
+the entity they describe, so a burst of updates to the same amenity slot or
+outing collapses to the latest one. Publishing never blocks or waits on a
+client; a client that falls LIVE_MAX_PENDING distinct updates behind has its
+backlog dropped and receives a single "resync" event telling it to refetch.
+An idle connection costs one parked coroutine and an empty dict.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ROUTING_KEYS = ("outing.*", "contention.*", "rental.*")
+RESYNC = "resync"
+
+
+def _event_key(routing_key: str, data: dict) -> Optional[tuple]:
+    kind = routing_key.split(".", 1)[0]
+    if kind == "outing":
+        return kind, data.get("outing_id") or data.get("id")
+    if kind == "contention":
+        return kind, data.get("amenity_id"), data.get("date"), data.get("time_slot")
+    if kind == "rental":
+        return kind, data.get("marina_id"), data.get("boat_type"), data.get("date"), data.get("time_slot")
+    return None
+
+
+class Subscription:
+    __slots__ = ("lake_id", "pending", "ready", "overflowed", "closed")
+
+    def __init__(self, lake_id: str):
+        self.lake_id = lake_id
+        self.pending: "OrderedDict[tuple, Tuple[str, dict]]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.overflowed = False
+        self.closed = False
+
+    def offer(self, key: tuple, event: str, data: dict):
+        if self.overflowed:
+            return
+        if key in self.pending:
+            self.pending.move_to_end(key)
+        elif len(self.pending) >= settings.LIVE_MAX_PENDING:
+            self.pending.clear()
+            self.overflowed = True
+            self.ready.set()
+            return
+        self.pending[key] = (event, data)
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+    # Waits for updates, then lingers for LIVE_COALESCE_MS so a burst goes
+    # out as one batch. Returns [] when timeout passes without updates (time
+    # for a heartbeat) and None once the subscription is closed.
+    async def next_batch(self, timeout: float) -> Optional[List[Tuple[str, dict]]]:
+        if not self.ready.is_set():
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        if not self.closed and not self.overflowed and settings.LIVE_COALESCE_MS:
+            await asyncio.sleep(settings.LIVE_COALESCE_MS / 1000)
+        if self.closed:
+            return None
+
+        self.ready.clear()
+        if self.overflowed:
+            self.overflowed = False
+            self.pending.clear()
+            return [(RESYNC, {"lake_id": self.lake_id})]
+        batch = list(self.pending.values())
+        self.pending.clear()
+        return batch
+
+
+class LiveHub:
+    def __init__(self):
+        self.subscriptions: Dict[str, Set[Subscription]] = {}
+        self.connections = 0
+
+    # None when the process already holds LIVE_MAX_CONNECTIONS streams.
+    def subscribe(self, lake_id: str) -> Optional[Subscription]:
+        if self.connections >= settings.LIVE_MAX_CONNECTIONS:
+            return None
+        subscription = Subscription(lake_id)
+        self.subscriptions.setdefault(lake_id, set()).add(subscription)
+        self.connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self.subscriptions.get(subscription.lake_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self.subscriptions[subscription.lake_id]
+        self.connections -= 1
+
+    # Ends every open stream, e.g. at shutdown so the server doesn't wait on
+    # idle clients.
+    def close_all(self):
+        for subscribers in self.subscriptions.values():
+            for subscription in subscribers:
+                subscription.close()
+
+    def publish(self, routing_key: str, data: dict):
+        lake_id = data.get("lake_id")
+        subscribers = self.subscriptions.get(str(lake_id)) if lake_id else None
+        if not subscribers:
+            return
+        key = _event_key(routing_key, data)
+        if key is None:
+            return
+        event = routing_key.split(".", 1)[0]
+        payload = {"event": routing_key, **data}
+        for subscription in subscribers:
+            subscription.offer(key, event, payload)
+
+
+live_hub = LiveHub()
+
+
+async def start_live_updates(client):
+    try:
+        await client.subscribe_broadcast(ROUTING_KEYS, live_hub.publish, settings.LIVE_QUEUE_MAX_LENGTH)
+    except Exception as e:
+        logger.error(f"Live updates not started: {e}")
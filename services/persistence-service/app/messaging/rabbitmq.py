@@ -1,7 +1,7 @@
 import asyncio
 import json
 import logging
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Tuple
 import aio_pika
 from aio_pika import Message, ExchangeType
 
@@ -16,10 +16,21 @@ class RabbitMQClient:
         self.channel = None
         self.exchange = None
         self.handlers: Dict[str, Callable] = {}
+        self.consumers: List[Tuple[aio_pika.abc.AbstractQueue, str]] = []
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def is_connected(self) -> bool:
+        return self.connection is not None and not self.connection.is_closed and self.exchange is not None
 
     async def connect(self):
         try:
-            self.connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)
+            self.connection = await aio_pika.connect_robust(
+                settings.RABBITMQ_URL,
+                timeout=settings.RABBITMQ_CONNECT_TIMEOUT
+            )
             self.channel = await self.connection.channel()
             await self.channel.set_qos(prefetch_count=10)
 
@@ -34,6 +45,17 @@ class RabbitMQClient:
             logger.error(f"Failed to connect to RabbitMQ: {e}")
             raise
 
+    async def connect_with_retry(self):
+        delay = 1.0
+        while True:
+            try:
+                await self.connect()
+                return
+            except Exception:
+                logger.info(f"Retrying RabbitMQ connection in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.RABBITMQ_RETRY_MAX_DELAY)
+
     async def publish(self, routing_key: str, message: dict):
         if not self.channel or not self.exchange:
             raise RuntimeError("RabbitMQ not connected")
@@ -52,29 +74,94 @@ class RabbitMQClient:
             logger.error(f"Failed to publish message: {e}")
             raise
 
+    async def publish_event(self, routing_key: str, message: dict):
+        try:
+            await self.publish(routing_key, message)
+        except Exception as e:
+            logger.warning(f"Dropped {routing_key} event: {e}")
+
     async def subscribe(self, routing_key: str, queue_name: str, handler: Callable):
         if not self.channel or not self.exchange:
             raise RuntimeError("RabbitMQ not connected")
 
         try:
-            queue = await self.channel.declare_queue(queue_name, durable=True)
-            await queue.bind(self.exchange, routing_key)
+            # Each consumer gets its own channel so queue declarations and
+            # binds run concurrently and prefetch is applied per queue.
+            channel = await self.connection.channel()
+            await channel.set_qos(prefetch_count=10)
+
+            queue = await channel.declare_queue(queue_name, durable=True)
+            await queue.bind(self.exchange.name, routing_key)
 
             async def message_handler(message: aio_pika.IncomingMessage):
-                async with message.process():
-                    try:
-                        data = json.loads(message.body.decode())
-                        logger.debug(f"Received message from {routing_key}: {data}")
-                        await handler(data)
-                    except Exception as e:
-                        logger.error(f"Error processing message: {e}")
-
-            await queue.consume(message_handler)
+                self.in_flight += 1
+                self._idle.clear()
+                try:
+                    async with message.process():
+                        try:
+                            data = json.loads(message.body.decode())
+                            logger.debug(f"Received message from {routing_key}: {data}")
+                            await handler(data)
+                        except Exception as e:
+                            logger.error(f"Error processing message: {e}")
+                finally:
+                    self.in_flight -= 1
+                    if self.in_flight == 0:
+                        self._idle.set()
+
+            consumer_tag = await queue.consume(message_handler)
+            self.consumers.append((queue, consumer_tag))
             logger.info(f"Subscribed to {routing_key} on queue {queue_name}")
         except Exception as e:
             logger.error(f"Failed to subscribe to {routing_key}: {e}")
             raise
 
+    async def subscribe_broadcast(self, routing_keys, handler: Callable, max_length: int):
+        # A server-named, exclusive queue per process, so every process sees
+        # every matching event and the queue goes away with the connection.
+        # Deliveries are not acknowledged and the handler is synchronous:
+        # this is for best-effort fan-out, and x-max-length drops the oldest
+        # messages if the process falls behind.
+        if not self.channel or not self.exchange:
+            raise RuntimeError("RabbitMQ not connected")
+
+        channel = await self.connection.channel()
+        queue = await channel.declare_queue(
+            exclusive=True,
+            auto_delete=True,
+            arguments={"x-max-length": max_length, "x-overflow": "drop-head"},
+        )
+        for routing_key in routing_keys:
+            await queue.bind(self.exchange.name, routing_key)
+
+        async def message_handler(message: aio_pika.IncomingMessage):
+            try:
+                handler(message.routing_key, json.loads(message.body.decode()))
+            except Exception as e:
+                logger.error(f"Error processing {message.routing_key} broadcast: {e}")
+
+        consumer_tag = await queue.consume(message_handler, no_ack=True)
+        self.consumers.append((queue, consumer_tag))
+        logger.info(f"Subscribed to {', '.join(routing_keys)} on exclusive queue {queue.name}")
+
+    async def drain(self, timeout: float):
+        # Stop new deliveries, then let in-flight handlers finish and ack.
+        # Prefetched but unstarted messages are requeued when the channel
+        # closes.
+        for queue, consumer_tag in self.consumers:
+            try:
+                await queue.cancel(consumer_tag)
+            except Exception as e:
+                logger.warning(f"Failed to cancel consumer on {queue.name}: {e}")
+        self.consumers.clear()
+
+        if self.in_flight:
+            logger.info(f"Draining {self.in_flight} in-flight messages")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Drain timed out with {self.in_flight} messages still in flight")
+
     async def close(self):
         if self.connection:
             await self.connection.close()
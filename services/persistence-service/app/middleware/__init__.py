@@ -0,0 +1,9 @@
+from .rate_limit import RateLimitMiddleware
+from .load_shedding import LoadSheddingMiddleware
+from .compression import CompressionMiddleware
+
+__all__ = [
+    "RateLimitMiddleware",
+    "LoadSheddingMiddleware",
+    "CompressionMiddleware",
+]
@@ -0,0 +1,62 @@
+import logging
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.database import pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+class LoadSheddingMiddleware:
+    # Rejects /api requests with 503 + Retry-After while the service is
+    # saturated, instead of letting them queue in the threadpool until the
+    # client times out. Two signals are used: requests currently in flight
+    # in this process, and how long handlers have recently waited for a
+    # database connection (or are waiting right now beyond the pool size).
+    # Live update streams stay open indefinitely, so they are neither shed
+    # nor counted as in flight; LIVE_MAX_CONNECTIONS bounds them instead.
+    def __init__(self, app, prefix: str = "/api/", exclude: tuple = ("/api/v1/live/",)):
+        self.app = app
+        self.prefix = prefix
+        self.exclude = exclude
+        self.in_flight = 0
+        self.shedding = False
+        self.max_pool_waiting = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+    def overload_reason(self):
+        if self.in_flight >= settings.LOAD_SHED_MAX_IN_FLIGHT:
+            return f"{self.in_flight} requests in flight"
+        average_wait_ms = pool_stats.average_wait * 1000
+        if average_wait_ms >= settings.LOAD_SHED_POOL_WAIT_MS:
+            return f"database pool wait {average_wait_ms:.0f} ms"
+        if pool_stats.waiting >= self.max_pool_waiting:
+            return f"{pool_stats.waiting} requests waiting for a database connection"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix) or scope["path"].startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+
+        reason = self.overload_reason()
+        if reason:
+            if not self.shedding:
+                logger.warning(f"Shedding load: {reason}")
+                self.shedding = True
+            response = JSONResponse(
+                {"detail": "Service overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+        if self.shedding:
+            logger.info("Load back to normal, no longer shedding")
+            self.shedding = False
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
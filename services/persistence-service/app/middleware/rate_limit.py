@@ -0,0 +1,141 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Buckets for clients not seen recently are evicted beyond this many.
+MAX_LOCAL_BUCKETS = 100_000
+
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class LocalTokenBuckets:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str) -> Tuple[bool, float]:
+        # Runs on the event loop only, so no locking is needed.
+        now = time.monotonic()
+        tokens, updated = self.buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > MAX_LOCAL_BUCKETS:
+            self.buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class RedisTokenBuckets:
+    # Buckets shared by every instance through one atomic Lua script per
+    # request. Falls back to local buckets while Redis is unreachable so an
+    # outage does not take the API down with it.
+    def __init__(self, rate: float, burst: int, url: str):
+        import redis.asyncio as redis
+
+        self.rate = rate
+        self.burst = burst
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(_REDIS_TOKEN_BUCKET)
+        self.fallback = LocalTokenBuckets(rate, burst)
+        self.failing = False
+
+    async def take(self, key: str) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = await self.script(keys=[f"ratelimit:{key}"], args=[self.rate, self.burst])
+        except Exception as e:
+            if not self.failing:
+                logger.warning(f"Redis rate limiter unavailable, using local buckets: {e}")
+                self.failing = True
+            return await self.fallback.take(key)
+        if self.failing:
+            logger.info("Redis rate limiter recovered")
+            self.failing = False
+        return bool(allowed), float(tokens)
+
+
+def create_buckets():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        try:
+            return RedisTokenBuckets(settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST, settings.REDIS_URL)
+        except ImportError:
+            logger.error("RATE_LIMIT_BACKEND=redis requires the redis package; using local buckets")
+    return LocalTokenBuckets(settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST)
+
+
+def client_key(scope) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, prefix: str = "/api/", buckets=None):
+        self.app = app
+        self.prefix = prefix
+        self.buckets = buckets
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        if self.buckets is None:
+            self.buckets = create_buckets()
+        allowed, tokens = await self.buckets.take(client_key(scope))
+        if not allowed:
+            retry_after = max(1, math.ceil((1 - tokens) / settings.RATE_LIMIT_RATE))
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={
+                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Limit": str(self.buckets.burst),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        limit = str(self.buckets.burst).encode()
+        remaining = str(int(tokens)).encode()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-ratelimit-limit", limit),
+                    (b"x-ratelimit-remaining", remaining),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,25 +1,44 @@
 from .base import Base
 from .user import User
-from .lake import Lake
+from .lake import Lake, LakeBoundarySimplified, TileGeneration
 from .amenity import Amenity
 from .boat_ramp import BoatRamp
 from .marina import Marina
 from .outing import Outing
+from .outing_participant import OutingParticipant
+from .outing_reassignment import OutingReassignment
 from .amenity_contention import AmenityContention
 from .friendship import Friendship
 from .weather_forecast import WeatherForecast
 from .audit_log import AuditLog
+from .rental_inventory import RentalInventory, RentalBooking
+from .contention_history import AmenityContentionHistory, AmenityContentionBaseline
+from .availability import FacilitySchedule, AvailabilityWindow
+from .purge_job import PurgeJob
+from .export_watermark import ExportWatermark
 
 __all__ = [
     "Base",
     "User",
     "Lake",
+    "LakeBoundarySimplified",
+    "TileGeneration",
     "Amenity",
     "BoatRamp",
     "Marina",
     "Outing",
+    "OutingParticipant",
+    "OutingReassignment",
     "AmenityContention",
     "Friendship",
     "WeatherForecast",
     "AuditLog",
+    "RentalInventory",
+    "RentalBooking",
+    "AmenityContentionHistory",
+    "AmenityContentionBaseline",
+    "FacilitySchedule",
+    "AvailabilityWindow",
+    "PurgeJob",
+    "ExportWatermark",
 ]
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Numeric
+from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
+from .geometry import location_expression
 
 
 class Amenity(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "amenities"
+    __table_args__ = (
+        Index("ix_amenities_location", text(location_expression("amenities")), postgresql_using="gist"),
+    )
 
     lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), nullable=False, index=True)
     type = Column(String(50), nullable=False, index=True)
@@ -17,4 +21,4 @@ class Amenity(Base, UUIDMixin, TimestampMixin):
     seasonal_availability = Column(JSONB, nullable=True)
 
     lake = relationship("Lake", back_populates="amenities")
-    contention_records = relationship("AmenityContention", back_populates="amenity", cascade="all, delete-orphan")
+    contention_records = relationship("AmenityContention", back_populates="amenity", cascade="all, delete-orphan", passive_deletes=True)
@@ -14,6 +14,6 @@ class AmenityContention(Base, UUIDMixin):
     time_slot = Column(String(20), nullable=False)
     planned_groups_count = Column(Integer, default=0)
     contention_score = Column(Numeric(5, 2), default=0.0, index=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
 
     amenity = relationship("Amenity", back_populates="contention_records")
@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Date, DateTime, Index, SmallInteger, String
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+from .amenity import Amenity
+from .boat_ramp import BoatRamp
+from .marina import Marina
+
+# facility_type values in facility_schedules and availability_windows.
+FACILITY_MODELS = {
+    "amenity": Amenity,
+    "boat_ramp": BoatRamp,
+    "marina": Marina,
+}
+
+
+class FacilitySchedule(Base):
+    # hours_of_operation / seasonal_availability normalized by
+    # app.jobs.availability_windows: one row per facility and ISO weekday it
+    # opens on (1 = Monday). Times are minutes after local midnight for
+    # kind 0, or an offset in minutes from sunrise (1) / sunset (2); see
+    # app.services.schedules. Seasons are month * 100 + day, inclusive, and
+    # may wrap over the new year; null means year-round.
+    __tablename__ = "facility_schedules"
+    __table_args__ = (
+        Index("ix_facility_schedules_lake_day", "lake_id", "day_of_week"),
+    )
+
+    facility_type = Column(String(20), primary_key=True)
+    facility_id = Column(UUID(as_uuid=True), primary_key=True)
+    day_of_week = Column(SmallInteger, primary_key=True)
+    lake_id = Column(UUID(as_uuid=True), nullable=False)
+    opens_kind = Column(SmallInteger, nullable=False)
+    opens_minute = Column(SmallInteger, nullable=False)
+    closes_kind = Column(SmallInteger, nullable=False)
+    closes_minute = Column(SmallInteger, nullable=False)
+    season_start = Column(SmallInteger, nullable=True)
+    season_end = Column(SmallInteger, nullable=True)
+    # updated_at of the facility row this schedule was parsed from.
+    source_updated_at = Column(DateTime, nullable=False)
+
+
+class AvailabilityWindow(Base):
+    # Concrete open window per facility and day, sunrise/sunset resolved for
+    # the lake's coordinates, precomputed for AVAILABILITY_HORIZON_DAYS.
+    # Days a facility is closed have no row.
+    __tablename__ = "availability_windows"
+    __table_args__ = (
+        Index("ix_availability_windows_day_lake", "day", "lake_id", "facility_type", "opens_minute"),
+    )
+
+    facility_type = Column(String(20), primary_key=True)
+    facility_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True)
+    lake_id = Column(UUID(as_uuid=True), nullable=False)
+    opens_minute = Column(SmallInteger, nullable=False)
+    closes_minute = Column(SmallInteger, nullable=False)
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Numeric
+from sqlalchemy import Column, String, Boolean, ForeignKey, Numeric, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
+from .geometry import location_expression
 
 
 class BoatRamp(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "boat_ramps"
+    __table_args__ = (
+        Index("ix_boat_ramps_location", text(location_expression("boat_ramps")), postgresql_using="gist"),
+    )
 
     lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, REAL, SmallInteger, func
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base
+
+# Row kinds in amenity_contention_history.
+SNAPSHOT = 1
+ATTENDANCE = 2
+
+
+class AmenityContentionHistory(Base):
+    # Append-only and range-partitioned by month on observed_on (see
+    # app/jobs/partitions.py). Columns are ordered and sized to pack tightly:
+    # slots are smallint codes from app.core.time_slots and scores are stored
+    # in hundredths. There is deliberately no surrogate key or foreign key,
+    # and no index: the table is only read by the rollup job, which scans
+    # whole months, so appends stay cheap and old months can be dropped
+    # wholesale.
+    __tablename__ = "amenity_contention_history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (observed_on)"}
+    __mapper_args__ = {"primary_key": ["amenity_id", "recorded_at", "kind"]}
+
+    amenity_id = Column(UUID(as_uuid=True), nullable=False)
+    recorded_at = Column(DateTime, nullable=False, server_default=func.now())
+    observed_on = Column(Date, nullable=False)
+    slot = Column(SmallInteger, nullable=False)
+    kind = Column(SmallInteger, nullable=False)
+    planned_groups = Column(SmallInteger, nullable=True)
+    attendance = Column(SmallInteger, nullable=True)
+    score_centi = Column(SmallInteger, nullable=True)
+
+
+class AmenityContentionBaseline(Base):
+    # Rolled up from amenity_contention_history by app.jobs.contention_rollup.
+    # day_of_week is ISO (1 = Monday).
+    __tablename__ = "amenity_contention_baselines"
+
+    amenity_id = Column(UUID(as_uuid=True), ForeignKey("amenities.id", ondelete="CASCADE"), primary_key=True)
+    day_of_week = Column(SmallInteger, primary_key=True)
+    slot = Column(SmallInteger, primary_key=True)
+    sample_days = Column(Integer, nullable=False)
+    avg_planned_groups = Column(REAL, nullable=True)
+    avg_attendance = Column(REAL, nullable=True)
+    p90_attendance = Column(REAL, nullable=True)
+    avg_score = Column(REAL, nullable=True)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
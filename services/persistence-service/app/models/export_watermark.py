@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, String
+from .base import Base
+
+
+class ExportWatermark(Base):
+    # How far the analytics export (app/jobs/analytics_export.py) has read
+    # each source table: every row whose watermark column is at or before
+    # exported_through has been written to Parquet.
+    __tablename__ = "export_watermarks"
+
+    source = Column(String(100), primary_key=True)
+    exported_through = Column(DateTime, nullable=False)
+    rows_exported = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
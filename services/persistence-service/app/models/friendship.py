@@ -1,16 +1,24 @@
-from sqlalchemy import Column, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
 
 
 class Friendship(Base, UUIDMixin, TimestampMixin):
+    # A pending request is a single requester -> addressee row. An accepted
+    # friendship is stored in both directions so every adjacency lookup is a
+    # plain index range scan on user_id.
     __tablename__ = "friendships"
-    __table_args__ = (UniqueConstraint('user_id', 'friend_id', name='uq_user_friend'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'friend_id', name='uq_user_friend'),
+        CheckConstraint('user_id <> friend_id', name='ck_friendships_not_self'),
+        Index('ix_friendships_user_status_friend', 'user_id', 'status', 'friend_id'),
+        Index('ix_friendships_friend_status', 'friend_id', 'status', postgresql_include=['user_id']),
+    )
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    friend_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    status = Column(String(20), default='pending', index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    friend_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), default='pending')
 
     user = relationship("User", foreign_keys=[user_id], back_populates="friendships")
     friend = relationship("User", foreign_keys=[friend_id])
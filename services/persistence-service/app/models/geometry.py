@@ -0,0 +1,21 @@
+from sqlalchemy.types import UserDefinedType
+
+
+class Geometry(UserDefinedType):
+    # PostGIS geometry column. Values are read and written through explicit
+    # ST_ functions (ST_GeomFromGeoJSON, ST_AsGeoJSON, ST_AsMVT) in SQL, so
+    # the type only has to render its DDL.
+    cache_ok = True
+
+    def __init__(self, geometry_type: str = "GEOMETRY", srid: int = 4326):
+        self.geometry_type = geometry_type
+        self.srid = srid
+
+    def get_col_spec(self, **kw):
+        return f"geometry({self.geometry_type}, {self.srid})"
+
+
+# Location of a point feature with numeric latitude/longitude columns, as
+# indexed by the ix_<table>_location GiST expression indexes.
+def location_expression(table: str) -> str:
+    return f"ST_SetSRID(ST_MakePoint({table}.longitude::float8, {table}.latitude::float8), 4326)"
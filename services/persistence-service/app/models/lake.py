@@ -1,17 +1,54 @@
-from sqlalchemy import Column, String, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, ForeignKey, String, Numeric, Index, SmallInteger, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred, relationship
 from .base import Base, UUIDMixin, TimestampMixin
+from .geometry import Geometry
 
 
 class Lake(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "lakes"
+    __table_args__ = (
+        Index("ix_lakes_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_lakes_name_prefix", text('lower(name) COLLATE "C"'), "id"),
+        Index("ix_lakes_boundary", "boundary", postgresql_using="gist"),
+    )
 
     name = Column(String(255), nullable=False, index=True)
     latitude = Column(Numeric(10, 8), nullable=False)
     longitude = Column(Numeric(11, 8), nullable=False)
+    # Full-resolution outline, deferred so that ordinary lake queries never
+    # load it. Maps read the simplified copies in lake_boundaries_simplified.
+    boundary = deferred(Column(Geometry("MULTIPOLYGON", 4326), nullable=True))
 
-    amenities = relationship("Amenity", back_populates="lake", cascade="all, delete-orphan")
-    boat_ramps = relationship("BoatRamp", back_populates="lake", cascade="all, delete-orphan")
-    marinas = relationship("Marina", back_populates="lake", cascade="all, delete-orphan")
-    outings = relationship("Outing", back_populates="lake", cascade="all, delete-orphan")
-    weather_forecasts = relationship("WeatherForecast", back_populates="lake", cascade="all, delete-orphan")
+    # Children are removed by the ON DELETE CASCADE foreign keys; with
+    # passive_deletes the ORM never loads them just to delete them.
+    amenities = relationship("Amenity", back_populates="lake", cascade="all, delete-orphan", passive_deletes=True)
+    boat_ramps = relationship("BoatRamp", back_populates="lake", cascade="all, delete-orphan", passive_deletes=True)
+    marinas = relationship("Marina", back_populates="lake", cascade="all, delete-orphan", passive_deletes=True)
+    outings = relationship("Outing", back_populates="lake", cascade="all, delete-orphan", passive_deletes=True)
+    weather_forecasts = relationship("WeatherForecast", back_populates="lake", cascade="all, delete-orphan", passive_deletes=True)
+
+
+class LakeBoundarySimplified(Base):
+    # lakes.boundary in web mercator, simplified to about half a pixel at
+    # each zoom in app.services.boundaries.SIMPLIFY_ZOOMS.
+    __tablename__ = "lake_boundaries_simplified"
+    __table_args__ = (
+        Index("ix_lake_boundaries_simplified_geom", "geom", postgresql_using="gist"),
+    )
+
+    lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), primary_key=True)
+    zoom = Column(SmallInteger, primary_key=True)
+    geom = Column(Geometry("MULTIPOLYGON", 3857), nullable=False)
+
+
+class TileGeneration(Base):
+    # Counters bumped by statement triggers on every table that feeds the
+    # vector tiles, striped per table and backend so that writers do not
+    # queue on one row lock. The tile generation is their sum; cached tiles
+    # from an older generation are stale.
+    __tablename__ = "tile_generation"
+
+    source_table = Column(String(63), primary_key=True)
+    stripe = Column(SmallInteger, primary_key=True, autoincrement=False)
+    generation = Column(BigInteger, nullable=False, default=0)
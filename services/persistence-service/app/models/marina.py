@@ -1,11 +1,16 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Numeric
+from sqlalchemy import Column, String, Boolean, ForeignKey, Numeric, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
+from .geometry import location_expression
 
 
 class Marina(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "marinas"
+    __table_args__ = (
+        Index("ix_marinas_location", text(location_expression("marinas")), postgresql_using="gist"),
+        Index("ix_marinas_rental_inventory", "rental_inventory", postgresql_using="gin", postgresql_ops={"rental_inventory": "jsonb_path_ops"}),
+    )
 
     lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
@@ -1,19 +1,36 @@
-from sqlalchemy import Column, String, Date, ForeignKey, Text, ARRAY
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from sqlalchemy import Column, String, Date, ForeignKey, Text, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
-from .base import Base, UUIDMixin, TimestampMixin
+from .base import Base, TimestampMixin
 
 
-class Outing(Base, UUIDMixin, TimestampMixin):
+class Outing(Base, TimestampMixin):
+    # Invitees and their RSVPs live in outing_participants.
+    #
+    # Range-partitioned by month on planned_date (see
+    # app/jobs/outing_partitions.py), so queries for upcoming dates touch one
+    # or two small partitions and inserts only maintain this month's indexes.
+    # planned_date is part of the primary key, as partitioning requires, so
+    # the database only enforces (id, planned_date). Lookups by id alone
+    # rely on ids being generated here (uuid4); the API never accepts one
+    # from clients.
     __tablename__ = "outings"
+    __table_args__ = (
+        Index("ix_outings_user_date", "user_id", "planned_date"),
+        Index("ix_outings_lake_date_slot", "lake_id", "planned_date", "time_slot"),
+        Index("ix_outings_target_amenities", "target_amenities", postgresql_using="gin"),
+        Index("ix_outings_updated_at", "updated_at"),
+        {"postgresql_partition_by": "RANGE (planned_date)"},
+    )
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), nullable=False, index=True)
-    planned_date = Column(Date, nullable=False, index=True)
-    time_slot = Column(String(20), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), nullable=False)
+    planned_date = Column(Date, primary_key=True)
+    time_slot = Column(String(20), nullable=False)
     target_amenities = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
-    invited_friends = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
-    rsvp_status = Column(JSONB, nullable=True)
     notes = Column(Text, nullable=True)
 
     user = relationship("User", back_populates="outings")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, ForeignKeyConstraint, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base, TimestampMixin
+
+
+class OutingParticipant(Base, TimestampMixin):
+    # One row per invitee, so an RSVP is a single-row upsert rather than a
+    # rewrite of the outing, and concurrent responses never overwrite each
+    # other. Rows go away with the outing or user (ON DELETE CASCADE).
+    # planned_date mirrors the outing's (kept in step by ON UPDATE CASCADE)
+    # because the partitioned outings table is keyed by (id, planned_date).
+    __tablename__ = "outing_participants"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["outing_id", "planned_date"], ["outings.id", "outings.planned_date"],
+            name="outing_participants_outing_fkey", ondelete="CASCADE", onupdate="CASCADE",
+        ),
+        Index("ix_outing_participants_user_status", "user_id", "status", "planned_date", postgresql_include=["outing_id"]),
+    )
+
+    outing_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    planned_date = Column(Date, nullable=False)
+    status = Column(String(20), nullable=False, default="invited")
+    responded_at = Column(DateTime, nullable=True)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Date, ForeignKey, ForeignKeyConstraint, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base, TimestampMixin
+
+
+class OutingReassignment(Base, TimestampMixin):
+    # A recommendation from the weekend allocation optimizer
+    # (app/services/allocation.py): the outing should use to_amenity_id
+    # instead of the from_amenity_id it targets. Each optimizer run replaces
+    # the rows of its lake and dates. Contention scores count the outing at
+    # to_amenity_id while it still targets from_amenity_id.
+    __tablename__ = "outing_reassignments"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["outing_id", "planned_date"], ["outings.id", "outings.planned_date"],
+            name="outing_reassignments_outing_fkey", ondelete="CASCADE", onupdate="CASCADE",
+        ),
+        Index("ix_outing_reassignments_lake_date", "lake_id", "planned_date"),
+        Index("ix_outing_reassignments_to_amenity", "to_amenity_id", "planned_date"),
+    )
+
+    outing_id = Column(UUID(as_uuid=True), primary_key=True)
+    from_amenity_id = Column(UUID(as_uuid=True), ForeignKey("amenities.id", ondelete="CASCADE"), primary_key=True)
+    planned_date = Column(Date, nullable=False)
+    lake_id = Column(UUID(as_uuid=True), ForeignKey("lakes.id", ondelete="CASCADE"), nullable=False)
+    to_amenity_id = Column(UUID(as_uuid=True), ForeignKey("amenities.id", ondelete="CASCADE"), nullable=False)
+    distance_m = Column(Integer, nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from .base import Base, UUIDMixin, TimestampMixin
+
+
+class PurgeJob(Base, UUIDMixin, TimestampMixin):
+    # Background deletion of a lake or user too large to delete in one
+    # request; see app/services/purge.py. status is queued, running, done or
+    # failed. total_rows is counted when the job is queued, deleted_rows is
+    # advanced after every committed batch.
+    __tablename__ = "purge_jobs"
+
+    entity_type = Column(String(20), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    total_rows = Column(Integer, nullable=False, default=0)
+    deleted_rows = Column(Integer, nullable=False, default=0)
+    current_table = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Date, Integer, ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from .base import Base, UUIDMixin, TimestampMixin
+
+
+class RentalInventory(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "rental_inventory"
+    __table_args__ = (
+        UniqueConstraint('marina_id', 'boat_type', 'date', 'time_slot', name='uq_rental_inventory_slot'),
+        CheckConstraint('available >= 0 AND available <= capacity', name='ck_rental_inventory_available'),
+    )
+
+    marina_id = Column(UUID(as_uuid=True), ForeignKey("marinas.id", ondelete="CASCADE"), nullable=False, index=True)
+    boat_type = Column(String(50), nullable=False)
+    date = Column(Date, nullable=False, index=True)
+    time_slot = Column(String(20), nullable=False)
+    capacity = Column(Integer, nullable=False)
+    available = Column(Integer, nullable=False)
+
+    marina = relationship("Marina")
+
+
+class RentalBooking(Base, UUIDMixin, TimestampMixin):
+    __tablename__ = "rental_bookings"
+
+    inventory_id = Column(UUID(as_uuid=True), ForeignKey("rental_inventory.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), default='confirmed', nullable=False)
+
+    inventory = relationship("RentalInventory")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
@@ -6,6 +6,11 @@ from .base import Base, UUIDMixin, TimestampMixin
 
 class User(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_username_trgm", "username", postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}),
+        Index("ix_users_username_prefix", text('lower(username) COLLATE "C"'), "id"),
+        Index("ix_users_schedule_preferences", "schedule_preferences", postgresql_using="gin", postgresql_ops={"schedule_preferences": "jsonb_path_ops"}),
+    )
 
     username = Column(String(255), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -17,6 +22,6 @@ class User(Base, UUIDMixin, TimestampMixin):
     weather_preferences = Column(JSONB, nullable=True)
     notification_preferences = Column(JSONB, nullable=True)
 
-    outings = relationship("Outing", back_populates="user", cascade="all, delete-orphan")
-    friendships = relationship("Friendship", foreign_keys="Friendship.user_id", back_populates="user", cascade="all, delete-orphan")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    outings = relationship("Outing", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    friendships = relationship("Friendship", foreign_keys="Friendship.user_id", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    audit_logs = relationship("AuditLog", back_populates="user", passive_deletes=True)
@@ -17,6 +17,6 @@ class WeatherForecast(Base, UUIDMixin):
     wind_speed = Column(Numeric(5, 2), nullable=True)
     conditions = Column(String(255), nullable=True)
     raw_data = Column(JSONB, nullable=True)
-    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
     lake = relationship("Lake", back_populates="weather_forecasts")
@@ -0,0 +1,30 @@
+from .auth import PasswordUpdate, TokenRequest
+from .user import UserCreate, UserImport, UserUpdate
+from .lake import LakeBoundaryUpdate, LakeCreate, LakeUpdate
+from .amenity import AmenityCreate, AmenityUpdate, AttendanceCreate
+from .boat_ramp import BoatRampCreate, BoatRampUpdate
+from .marina import MarinaUpdate, RentalBookingCreate, RentalSlotSet
+from .outing import OutingCreate, OutingUpdate, ParticipantsInvite, ParticipantStatusUpdate
+
+__all__ = [
+    "TokenRequest",
+    "PasswordUpdate",
+    "UserCreate",
+    "UserImport",
+    "UserUpdate",
+    "LakeCreate",
+    "LakeUpdate",
+    "LakeBoundaryUpdate",
+    "AmenityCreate",
+    "AmenityUpdate",
+    "AttendanceCreate",
+    "BoatRampCreate",
+    "BoatRampUpdate",
+    "MarinaUpdate",
+    "RentalSlotSet",
+    "RentalBookingCreate",
+    "OutingCreate",
+    "OutingUpdate",
+    "ParticipantsInvite",
+    "ParticipantStatusUpdate",
+]
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from uuid import UUID
+from datetime import date
+
+from app.core.time_slots import TIME_SLOTS
+
+
+class AmenityCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    lake_id: UUID
+    type: str = Field(max_length=50)
+    name: Optional[str] = Field(None, max_length=255)
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    capacity_score: Optional[int] = Field(None, ge=0)
+    hours_of_operation: Optional[dict] = None
+    seasonal_availability: Optional[dict] = None
+
+
+class AmenityUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    type: str = Field(None, max_length=50)
+    name: Optional[str] = Field(None, max_length=255)
+    latitude: float = Field(None, ge=-90, le=90)
+    longitude: float = Field(None, ge=-180, le=180)
+    capacity_score: Optional[int] = Field(None, ge=0)
+    hours_of_operation: Optional[dict] = None
+    seasonal_availability: Optional[dict] = None
+
+
+class AttendanceCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    date: date
+    time_slot: str = Field(pattern=f"^({'|'.join(TIME_SLOTS)})$")
+    attendance: int = Field(ge=0, le=32767)
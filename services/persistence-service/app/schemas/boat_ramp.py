@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from uuid import UUID
+
+
+class BoatRampCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    lake_id: UUID
+    name: str = Field(max_length=255)
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    hours_of_operation: Optional[dict] = None
+    seasonal_availability: Optional[dict] = None
+    is_active: Optional[bool] = None
+
+
+class BoatRampUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(None, max_length=255)
+    latitude: float = Field(None, ge=-90, le=90)
+    longitude: float = Field(None, ge=-180, le=180)
+    hours_of_operation: Optional[dict] = None
+    seasonal_availability: Optional[dict] = None
+    is_active: Optional[bool] = None
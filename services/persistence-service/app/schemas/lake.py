@@ -0,0 +1,27 @@
+from typing import Any, List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class LakeCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(max_length=255)
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+
+
+class LakeUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(None, max_length=255)
+    latitude: float = Field(None, ge=-90, le=90)
+    longitude: float = Field(None, ge=-180, le=180)
+
+
+class LakeBoundaryUpdate(BaseModel):
+    # A GeoJSON Polygon or MultiPolygon geometry in WGS 84 longitude/latitude.
+    model_config = ConfigDict(extra="forbid")
+
+    type: str = Field(pattern="^(Polygon|MultiPolygon)$")
+    coordinates: List[Any] = Field(min_length=1)
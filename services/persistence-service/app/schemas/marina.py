@@ -0,0 +1,33 @@
+from datetime import date
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from uuid import UUID
+
+
+class MarinaUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(None, max_length=255)
+    latitude: float = Field(None, ge=-90, le=90)
+    longitude: float = Field(None, ge=-180, le=180)
+    rental_inventory: Optional[List[dict]] = None
+    hours_of_operation: Optional[dict] = None
+    is_active: Optional[bool] = None
+
+
+class RentalSlotSet(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    boat_type: str = Field(max_length=50)
+    date: date
+    time_slot: str = Field(max_length=20)
+    capacity: int = Field(ge=0, le=2147483647)
+
+
+class RentalBookingCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_id: UUID
+    boat_type: str = Field(max_length=50)
+    date: date
+    time_slot: str = Field(max_length=20)
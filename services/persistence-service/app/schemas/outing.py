@@ -0,0 +1,39 @@
+from datetime import date
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from uuid import UUID
+
+
+class OutingCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_id: UUID
+    lake_id: UUID
+    planned_date: date
+    time_slot: str = Field(max_length=20)
+    target_amenities: Optional[List[UUID]] = None
+    # Stored as outing_participants rows, not on the outing.
+    invited_friends: List[UUID] = []
+    notes: Optional[str] = None
+
+
+class OutingUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    lake_id: UUID = None
+    planned_date: date = None
+    time_slot: str = Field(None, max_length=20)
+    target_amenities: Optional[List[UUID]] = None
+    notes: Optional[str] = None
+
+
+class ParticipantsInvite(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_ids: List[UUID] = Field(min_length=1, max_length=1000)
+
+
+class ParticipantStatusUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    status: str = Field(pattern="^(invited|accepted|declined|maybe)$")
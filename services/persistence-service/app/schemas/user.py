@@ -0,0 +1,47 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from uuid import UUID
+
+
+class UserCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    username: str = Field(max_length=255)
+    email: str = Field(max_length=255, pattern=r"^[^@\s]+@[^@\s]+$")
+    # bcrypt only uses the first 72 bytes of a password.
+    password: str = Field(min_length=8, max_length=72)
+    preferred_lake_id: Optional[UUID] = None
+    owns_boat: Optional[bool] = None
+    preferred_marina_id: Optional[UUID] = None
+    schedule_preferences: Optional[dict] = None
+    weather_preferences: Optional[dict] = None
+    notification_preferences: Optional[dict] = None
+
+
+class UserImport(BaseModel):
+    # Bulk import of existing accounts, whose passwords are already bcrypt
+    # hashes; new accounts go through UserCreate.
+    model_config = ConfigDict(extra="forbid")
+
+    username: str = Field(max_length=255)
+    email: str = Field(max_length=255, pattern=r"^[^@\s]+@[^@\s]+$")
+    password_hash: str = Field(pattern=r"^\$2[aby]\$\d\d\$[./A-Za-z0-9]{53}$")
+    preferred_lake_id: Optional[UUID] = None
+    owns_boat: Optional[bool] = None
+    preferred_marina_id: Optional[UUID] = None
+    schedule_preferences: Optional[dict] = None
+    weather_preferences: Optional[dict] = None
+    notification_preferences: Optional[dict] = None
+
+
+class UserUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    username: str = Field(None, max_length=255)
+    email: str = Field(None, max_length=255, pattern=r"^[^@\s]+@[^@\s]+$")
+    preferred_lake_id: Optional[UUID] = None
+    owns_boat: Optional[bool] = None
+    preferred_marina_id: Optional[UUID] = None
+    schedule_preferences: Optional[dict] = None
+    weather_preferences: Optional[dict] = None
+    notification_preferences: Optional[dict] = None
@@ -0,0 +1,335 @@
+"""
+Weekend amenity allocation.
+
+Groups pick amenities one at a time, so the first to plan crowd a popular
+amenity while others of the same type nearby stay quiet. The optimizer
+looks at every outing of a lake for a weekend at once and recommends moves
+that minimize the highest contention score per amenity type in each date
+and slot, then the distance groups are moved:
+
+1. Each (outing, targeted amenity) pair is a unit that may move to any
+   amenity of the same type at the lake, except ones the outing already
+   targets. Staying is free; a move costs its distance plus
+   MOVE_PENALTY_KM, so the outings' own choices are kept wherever possible.
+2. The lowest reachable maximum score is found by bisection. At score s an
+   amenity has room for floor(s * capacity / 100 - HISTORY_WEIGHT * usual
+   attendance) units, and as any unit may use any amenity of its type, s is
+   reachable exactly when that room covers the demand.
+3. Units are placed within that room at minimum total cost by a min-cost
+   flow over a transportation graph. Units with the same origin and
+   exclusions are interchangeable, so there is one source per such group
+   rather than per outing, and 50k outings make a graph of a few hundred
+   nodes, relaxed with NumPy.
+
+Moves are stored in outing_reassignments and the resulting scores in
+amenity_contention, as if the moves were followed; refresh_contention
+counts reassigned outings the same way.
+"""
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.time_slots import slot_code
+from app.models import Amenity, AmenityContention, AmenityContentionBaseline, Outing, OutingReassignment
+from app.services.contention import DEFAULT_CAPACITY, HISTORY_WEIGHT, MAX_SCORE
+
+logger = logging.getLogger(__name__)
+
+MOVE_PENALTY_KM = 1.0
+# Cost of placing a unit on an amenity its outing already targets. Such
+# placements are only made when nothing else fits, and are then dropped.
+BLOCKED_COST = 1e9
+EARTH_RADIUS_KM = 6371.0088
+
+
+@dataclass(frozen=True)
+class SlotAllocation:
+    before: np.ndarray
+    after: np.ndarray
+    # (outing_id, from amenity index, to amenity index)
+    moves: List[Tuple[UUID, int, int]]
+
+
+def distance_matrix(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    lat = np.radians(latitudes)[:, None]
+    lon = np.radians(longitudes)[:, None]
+    haversine = (
+        np.sin((lat - lat.T) / 2) ** 2
+        + np.cos(lat) * np.cos(lat.T) * np.sin((lon - lon.T) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(haversine, 0.0, 1.0)))
+
+
+# Same formula as contention.contention_score, over arrays of amenities.
+def scores(units: np.ndarray, capacity: np.ndarray, history: np.ndarray) -> np.ndarray:
+    return np.round(np.minimum(MAX_SCORE, MAX_SCORE * (units + HISTORY_WEIGHT * history) / capacity), 2)
+
+
+def room(score: float, capacity: np.ndarray, history: np.ndarray) -> np.ndarray:
+    return np.maximum(np.floor(score * capacity / MAX_SCORE - HISTORY_WEIGHT * history + 1e-9), 0).astype(np.int64)
+
+
+def lowest_max_score(demand: int, capacity: np.ndarray, history: np.ndarray) -> float:
+    low = 0.0
+    high = MAX_SCORE * (demand + HISTORY_WEIGHT * history.max()) / capacity.min()
+    for _ in range(60):
+        middle = (low + high) / 2
+        if room(middle, capacity, history).sum() >= demand:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+# Ships supply[s] units from each source into at most limits[j] per sink at
+# minimum total cost, by successive shortest paths. Distances over the
+# residual graph are relaxed a whole cost matrix at a time; reverse edges
+# (undoing flow[s, j] at cost -cost[s, j]) let later units displace earlier
+# ones onto cheaper alternatives.
+def min_cost_transport(supply: np.ndarray, limits: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    sources, sinks = cost.shape
+    source_index = np.arange(sources)
+    sink_index = np.arange(sinks)
+    flow = np.zeros((sources, sinks), dtype=np.int64)
+    remaining = supply.astype(np.int64)
+    free = limits.astype(np.int64)
+
+    while remaining.sum() > 0:
+        # Bellman-Ford from every source with supply left. Labels only
+        # change on strict improvement, which keeps zero-cost cycles out of
+        # the predecessor links.
+        to_source = np.where(remaining > 0, 0.0, np.inf)
+        via_sink = np.full(sources, -1)
+        to_sink = np.full(sinks, np.inf)
+        via_source = np.full(sinks, -1)
+        for _ in range(sources + sinks + 1):
+            through = to_source[:, None] + cost
+            best_source = through.argmin(axis=0)
+            candidate = through[best_source, sink_index]
+            sink_improved = candidate < to_sink - 1e-9
+            to_sink = np.where(sink_improved, candidate, to_sink)
+            via_source = np.where(sink_improved, best_source, via_source)
+
+            back = np.where(flow > 0, to_sink[None, :] - cost, np.inf)
+            best_sink = back.argmin(axis=1)
+            candidate = back[source_index, best_sink]
+            source_improved = candidate < to_source - 1e-9
+            if not source_improved.any():
+                break
+            to_source = np.where(source_improved, candidate, to_source)
+            via_sink = np.where(source_improved, best_sink, via_sink)
+
+        open_sinks = np.where(free > 0, to_sink, np.inf)
+        sink = int(open_sinks.argmin())
+        if not np.isfinite(open_sinks[sink]):
+            raise ValueError("Not enough room for the demand")
+
+        forward, backward = [], []
+        column = sink
+        while True:
+            source = int(via_source[column])
+            forward.append((source, column))
+            if via_sink[source] < 0:
+                break
+            column = int(via_sink[source])
+            backward.append((source, column))
+        amount = min([remaining[source], free[sink]] + [flow[edge] for edge in backward])
+        for edge in forward:
+            flow[edge] += amount
+        for edge in backward:
+            flow[edge] -= amount
+        remaining[source] -= amount
+        free[sink] -= amount
+    return flow
+
+
+# Allocates one date and slot. outings are (outing_id, amenity indexes)
+# pairs; the first outings of a group, in the order given, are the ones
+# moved.
+def allocate_slot(
+    outings: Sequence[Tuple[UUID, Sequence[int]]],
+    types: Sequence[str],
+    capacity: np.ndarray,
+    history: np.ndarray,
+    distance_km: np.ndarray,
+) -> SlotAllocation:
+    before = np.zeros(len(types), dtype=np.int64)
+    groups: Dict[Tuple[int, Tuple[int, ...]], List[UUID]] = defaultdict(list)
+    for outing_id, targets in outings:
+        targets = sorted(set(targets))
+        for origin in targets:
+            before[origin] += 1
+            excluded = tuple(target for target in targets if target != origin and types[target] == types[origin])
+            groups[(origin, excluded)].append(outing_id)
+
+    by_type = defaultdict(list)
+    for key in groups:
+        by_type[types[key[0]]].append(key)
+
+    after = before.copy()
+    moves = []
+    for amenity_type, keys in by_type.items():
+        members = np.array([index for index, candidate in enumerate(types) if candidate == amenity_type])
+        if len(members) < 2:
+            continue
+        best = lowest_max_score(int(before[members].sum()), capacity[members], history[members])
+        position = {int(index): column for column, index in enumerate(members)}
+
+        supply = np.array([len(groups[key]) for key in keys])
+        cost = distance_km[np.ix_([origin for origin, _ in keys], members)] + MOVE_PENALTY_KM
+        for row, (origin, excluded) in enumerate(keys):
+            cost[row, position[origin]] = 0.0
+            for index in excluded:
+                cost[row, position[index]] = BLOCKED_COST
+        flow = min_cost_transport(supply, room(best, capacity[members], history[members]), cost)
+
+        for row, key in enumerate(keys):
+            origin = key[0]
+            movers = iter(groups[key])
+            for column in np.flatnonzero(flow[row]):
+                target = int(members[column])
+                if target == origin or cost[row, column] >= BLOCKED_COST:
+                    continue
+                count = int(flow[row, column])
+                moves.extend((next(movers), origin, target) for _ in range(count))
+                after[origin] -= count
+                after[target] += count
+    return SlotAllocation(before, after, moves)
+
+
+# The Saturday and Sunday of the weekend on or after day.
+def weekend_dates(day: date) -> List[date]:
+    saturday = day + timedelta(days=(5 - day.weekday()) % 7)
+    return [saturday, saturday + timedelta(days=1)]
+
+
+# Optimizes one lake's weekend and replaces its recommended reassignments
+# and contention scores. The caller commits.
+def optimize_weekend(db: Session, lake_id: UUID, day: date) -> dict:
+    started = time.monotonic()
+    dates = weekend_dates(day)
+    amenities = db.execute(
+        select(Amenity.id, Amenity.type, Amenity.capacity_score, Amenity.latitude, Amenity.longitude)
+        .where(Amenity.lake_id == lake_id)
+        .order_by(Amenity.id)
+    ).all()
+    amenity_ids = [amenity.id for amenity in amenities]
+    index = {amenity_id: position for position, amenity_id in enumerate(amenity_ids)}
+    types = [amenity.type for amenity in amenities]
+    capacity = np.array([max(amenity.capacity_score or DEFAULT_CAPACITY, 1) for amenity in amenities], dtype=float)
+    distance_km = distance_matrix(
+        np.array([float(amenity.latitude) for amenity in amenities]),
+        np.array([float(amenity.longitude) for amenity in amenities]),
+    )
+
+    slots: Dict[Tuple[date, str], List[Tuple[UUID, List[int]]]] = defaultdict(list)
+    outing_count = 0
+    for outing_id, planned_date, time_slot, targets in db.execute(
+        select(Outing.id, Outing.planned_date, Outing.time_slot, Outing.target_amenities)
+        .where(Outing.lake_id == lake_id, Outing.planned_date.in_(dates), Outing.target_amenities.isnot(None))
+        .order_by(Outing.id)
+    ):
+        outing_count += 1
+        known = [index[target] for target in targets if target in index]
+        if known:
+            slots[(planned_date, time_slot)].append((outing_id, known))
+    # Slots scored by an earlier run are rewritten too, in case their
+    # outings have since gone.
+    if amenity_ids:
+        for key in db.execute(
+            select(AmenityContention.date, AmenityContention.time_slot)
+            .where(AmenityContention.amenity_id.in_(amenity_ids), AmenityContention.date.in_(dates))
+            .distinct()
+        ):
+            slots.setdefault(tuple(key), [])
+
+    baselines = {}
+    if amenity_ids:
+        baselines = {
+            (baseline.amenity_id, baseline.day_of_week, baseline.slot): baseline.avg_attendance or 0.0
+            for baseline in db.execute(
+                select(AmenityContentionBaseline).where(
+                    AmenityContentionBaseline.amenity_id.in_(amenity_ids),
+                    AmenityContentionBaseline.day_of_week.in_([weekend_day.isoweekday() for weekend_day in dates]),
+                )
+            ).scalars()
+        }
+
+    now = datetime.utcnow()
+    reassignments, contention, summaries = [], [], []
+    for (planned_date, time_slot), outings in sorted(slots.items()):
+        history = np.array([
+            baselines.get((amenity_id, planned_date.isoweekday(), slot_code(time_slot)), 0.0)
+            for amenity_id in amenity_ids
+        ])
+        allocation = allocate_slot(outings, types, capacity, history, distance_km)
+        for outing_id, origin, target in allocation.moves:
+            reassignments.append({
+                "outing_id": outing_id,
+                "from_amenity_id": amenity_ids[origin],
+                "planned_date": planned_date,
+                "lake_id": lake_id,
+                "to_amenity_id": amenity_ids[target],
+                "distance_m": int(round(distance_km[origin, target] * 1000)),
+                "created_at": now,
+                "updated_at": now,
+            })
+        after = scores(allocation.after, capacity, history)
+        contention.extend(
+            {
+                "amenity_id": amenity_id,
+                "date": planned_date,
+                "time_slot": time_slot,
+                "planned_groups_count": int(allocation.after[position]),
+                "contention_score": float(after[position]),
+            }
+            for position, amenity_id in enumerate(amenity_ids)
+        )
+        before = scores(allocation.before, capacity, history)
+        summaries.append({
+            "date": planned_date.isoformat(),
+            "time_slot": time_slot,
+            "outings": len(outings),
+            "reassignments": len(allocation.moves),
+            "max_score_before": float(before.max()) if len(before) else 0.0,
+            "max_score_after": float(after.max()) if len(after) else 0.0,
+        })
+
+    db.execute(delete(OutingReassignment).where(
+        OutingReassignment.lake_id == lake_id, OutingReassignment.planned_date.in_(dates)
+    ))
+    if reassignments:
+        db.execute(insert(OutingReassignment), reassignments)
+    if contention:
+        stmt = pg_insert(AmenityContention)
+        db.execute(stmt.on_conflict_do_update(
+            constraint="uq_amenity_date_time",
+            set_={
+                "planned_groups_count": stmt.excluded.planned_groups_count,
+                "contention_score": stmt.excluded.contention_score,
+                "updated_at": now,
+            },
+        ), contention)
+
+    summary = {
+        "lake_id": str(lake_id),
+        "dates": [weekend_day.isoformat() for weekend_day in dates],
+        "outings": outing_count,
+        "reassignments": len(reassignments),
+        "slots": summaries,
+        "seconds": round(time.monotonic() - started, 2),
+    }
+    logger.info(
+        f"Allocated lake {lake_id} for {dates[0]}: {outing_count} outings, {len(reassignments)} reassignments "
+        f"in {summary['seconds']}s"
+    )
+    return summary
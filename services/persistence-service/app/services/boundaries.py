@@ -0,0 +1,220 @@
+"""
+Lake boundaries and Mapbox vector tiles.
+
+lakes.boundary holds the full-resolution outline. Rendering it directly
+would ship thousands of vertices per lake at country zoom, so every outline
+is also stored in lake_boundaries_simplified, projected to web mercator and
+simplified to half a pixel at each of SIMPLIFY_ZOOMS. A tile at zoom z reads
+the copy for the smallest band at or above z, so outlines stay within half
+a pixel of the original; zooms past the last band reuse its copy.
+
+Tiles are built in one ST_AsMVT query per tile: a "lakes" polygon layer and,
+from TILE_POINTS_MIN_ZOOM up, "amenities", "boat_ramps" and "marinas" point
+layers served from the ix_<table>_location GiST indexes. Rendered tiles are
+kept in a per-process LRU tagged with the tile generation, the sum of the
+tile_generation counters that triggers bump on every write to those tables,
+so edits from any process or job invalidate every cache within
+TILE_GENERATION_CHECK_SECONDS.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import BigInteger, cast, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import TileGeneration
+from app.models.geometry import location_expression
+
+SIMPLIFY_ZOOMS = (4, 7, 10, 13, 16)
+MAX_ZOOM = 22
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+# Web mercator ground resolution at the equator, metres per 256px-tile pixel.
+_EARTH_CIRCUMFERENCE = 40075016.686
+
+
+def tolerance(zoom: int) -> float:
+    return _EARTH_CIRCUMFERENCE / (256 * 2 ** zoom) / 2
+
+
+# Simplification band that serves tiles at this zoom.
+def band(zoom: int) -> int:
+    return next((candidate for candidate in SIMPLIFY_ZOOMS if candidate >= zoom), SIMPLIFY_ZOOMS[-1])
+
+
+_SET_BOUNDARY = text("""
+    UPDATE lakes
+    SET boundary = ST_Multi(ST_CollectionExtract(ST_MakeValid(ST_SetSRID(ST_GeomFromGeoJSON(:geojson), 4326)), 3)),
+        updated_at = :now
+    WHERE id = :lake_id
+""")
+
+_DELETE_SIMPLIFIED = text("DELETE FROM lake_boundaries_simplified WHERE lake_id = :lake_id")
+
+_INSERT_SIMPLIFIED = text("""
+    INSERT INTO lake_boundaries_simplified (lake_id, zoom, geom)
+    SELECT id, :zoom, simplified
+    FROM (
+        SELECT id, ST_Multi(ST_CollectionExtract(ST_MakeValid(
+            ST_SimplifyPreserveTopology(ST_Transform(boundary, 3857), :tolerance)
+        ), 3)) AS simplified
+        FROM lakes
+        WHERE id = :lake_id AND boundary IS NOT NULL
+    ) AS source
+    WHERE NOT ST_IsEmpty(simplified)
+""")
+
+_BOUNDARY_GEOJSON = text("SELECT ST_AsGeoJSON(boundary, 6) FROM lakes WHERE id = :lake_id")
+
+_SIMPLIFIED_GEOJSON = text("""
+    SELECT ST_AsGeoJSON(ST_Transform(geom, 4326), 6)
+    FROM lake_boundaries_simplified
+    WHERE lake_id = :lake_id AND zoom = :zoom
+""")
+
+
+def _point_layer(table: str, columns: str) -> str:
+    location = location_expression(table)
+    return f"""
+    {table}_layer AS (
+        SELECT {columns}, ST_AsMVTGeom(ST_Transform({location}, 3857), bounds.tile, :extent, :buffer) AS geom
+        FROM {table}, bounds
+        WHERE :points AND {location} && bounds.search
+    )"""
+
+
+_RENDER_TILE = text(f"""
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS tile,
+               ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS search,
+               ST_TileEnvelope(:z, :x, :y, margin => :margin) AS search_mercator
+    ),
+    lakes_layer AS (
+        SELECT lakes.id::text AS id, lakes.name,
+               ST_AsMVTGeom(simplified.geom, bounds.tile, :extent, :buffer) AS geom
+        FROM lake_boundaries_simplified AS simplified
+        JOIN lakes ON lakes.id = simplified.lake_id, bounds
+        WHERE simplified.zoom = :band AND simplified.geom && bounds.search_mercator
+    ),
+    {_point_layer("amenities", "amenities.id::text AS id, amenities.type, amenities.name")},
+    {_point_layer("boat_ramps", "boat_ramps.id::text AS id, boat_ramps.name, boat_ramps.is_active")},
+    {_point_layer("marinas", "marinas.id::text AS id, marinas.name, marinas.is_active")}
+    SELECT coalesce((SELECT ST_AsMVT(lakes_layer, 'lakes', :extent, 'geom') FROM lakes_layer), ''::bytea)
+        || coalesce((SELECT ST_AsMVT(amenities_layer, 'amenities', :extent, 'geom') FROM amenities_layer), ''::bytea)
+        || coalesce((SELECT ST_AsMVT(boat_ramps_layer, 'boat_ramps', :extent, 'geom') FROM boat_ramps_layer), ''::bytea)
+        || coalesce((SELECT ST_AsMVT(marinas_layer, 'marinas', :extent, 'geom') FROM marinas_layer), ''::bytea)
+""")
+
+
+# Stores a lake's outline from a GeoJSON Polygon/MultiPolygon and rebuilds
+# its simplified copies. Returns False if the lake doesn't exist.
+def set_boundary(db: Session, lake_id: UUID, geometry: dict) -> bool:
+    params = {"lake_id": lake_id, "geojson": json.dumps(geometry), "now": datetime.utcnow()}
+    if db.execute(_SET_BOUNDARY, params).rowcount == 0:
+        return False
+    refresh_simplified(db, lake_id)
+    return True
+
+
+def refresh_simplified(db: Session, lake_id: UUID):
+    db.execute(_DELETE_SIMPLIFIED, {"lake_id": lake_id})
+    for zoom in SIMPLIFY_ZOOMS:
+        db.execute(_INSERT_SIMPLIFIED, {"lake_id": lake_id, "zoom": zoom, "tolerance": tolerance(zoom)})
+
+
+# The outline as a GeoJSON geometry dict: full resolution, or simplified
+# for display at the given zoom. None if the lake has no boundary.
+def get_boundary_geojson(db: Session, lake_id: UUID, zoom: Optional[int] = None) -> Optional[dict]:
+    if zoom is None:
+        geojson = db.execute(_BOUNDARY_GEOJSON, {"lake_id": lake_id}).scalar()
+    else:
+        geojson = db.execute(_SIMPLIFIED_GEOJSON, {"lake_id": lake_id, "zoom": band(zoom)}).scalar()
+    return json.loads(geojson) if geojson else None
+
+
+def render_tile(db: Session, z: int, x: int, y: int) -> bytes:
+    params = {
+        "z": z, "x": x, "y": y, "band": band(z),
+        "points": z >= settings.TILE_POINTS_MIN_ZOOM,
+        "extent": TILE_EXTENT, "buffer": TILE_BUFFER, "margin": TILE_BUFFER / TILE_EXTENT,
+    }
+    return bytes(db.execute(_RENDER_TILE, params).scalar() or b"")
+
+
+class TileCache:
+    # LRU of rendered tiles bounded by total bytes. All entries belong to
+    # self.generation; seeing a newer generation in the database empties it.
+    def __init__(self, max_bytes: int, check_seconds: float):
+        self.max_bytes = max_bytes
+        self.check_seconds = check_seconds
+        self.generation: Optional[int] = None
+        self._tiles: "OrderedDict[Tuple[int, int, int], bytes]" = OrderedDict()
+        self._bytes = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    # The database generation, read at most once per check_seconds.
+    def current_generation(self, db: Session) -> int:
+        now = time.monotonic()
+        if self.generation is not None and now - self._checked_at < self.check_seconds:
+            return self.generation
+        generation = db.execute(select(cast(func.coalesce(func.sum(TileGeneration.generation), 0), BigInteger))).scalar()
+        with self._lock:
+            if generation != self.generation:
+                self._tiles.clear()
+                self._bytes = 0
+                self.generation = generation
+            self._checked_at = now
+        return generation
+
+    def get(self, key: Tuple[int, int, int], generation: int) -> Optional[bytes]:
+        with self._lock:
+            if generation != self.generation:
+                return None
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key: Tuple[int, int, int], generation: int, tile: bytes):
+        if len(tile) > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            previous = self._tiles.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._tiles[key] = tile
+            self._bytes += len(tile)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._tiles.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+            self.generation = None
+
+
+tile_cache = TileCache(settings.TILE_CACHE_MAX_BYTES, settings.TILE_GENERATION_CHECK_SECONDS)
+
+
+# The tile for (z, x, y) at generation, from the cache or rendered. The
+# generation is read before rendering, so a cached tile is never older than
+# the generation it is filed under.
+def get_tile(db: Session, z: int, x: int, y: int, generation: int) -> bytes:
+    key = (z, x, y)
+    tile = tile_cache.get(key, generation)
+    if tile is None:
+        tile = render_tile(db, z, x, y)
+        tile_cache.put(key, generation, tile)
+    return tile
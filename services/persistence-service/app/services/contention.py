@@ -0,0 +1,134 @@
+"""
+Amenity contention scoring.
+
+The score for an amenity, date and time slot combines the groups currently
+planning to visit with the attendance usually observed for that weekday and
+slot, relative to the amenity's capacity. Historical attendance comes from
+the precomputed amenity_contention_baselines table (one primary-key lookup),
+never from the raw history.
+"""
+import logging
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, exists, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.time_slots import slot_code
+from app.models import (
+    Amenity, AmenityContention, AmenityContentionBaseline, AmenityContentionHistory, Outing, OutingReassignment,
+)
+from app.models.contention_history import ATTENDANCE, SNAPSHOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 10
+# How much of the usual attendance for the weekday/slot is added on top of
+# the groups that planned ahead.
+HISTORY_WEIGHT = 0.5
+MAX_SCORE = 100.0
+SMALLINT_MAX = 32767
+
+
+def _smallint(value: float) -> int:
+    return max(0, min(int(round(value)), SMALLINT_MAX))
+
+
+def get_baseline(db: Session, amenity_id: UUID, planned_date: date, time_slot: str) -> Optional[AmenityContentionBaseline]:
+    return db.get(AmenityContentionBaseline, (amenity_id, planned_date.isoweekday(), slot_code(time_slot)))
+
+
+def contention_score(planned_groups: int, capacity: Optional[int], baseline: Optional[AmenityContentionBaseline]) -> float:
+    historical = baseline.avg_attendance if baseline and baseline.avg_attendance is not None else 0.0
+    demand = planned_groups + HISTORY_WEIGHT * historical
+    return round(min(MAX_SCORE, MAX_SCORE * demand / max(capacity or DEFAULT_CAPACITY, 1)), 2)
+
+
+def contention_level(score: float) -> str:
+    if score < 40:
+        return "low"
+    if score < 75:
+        return "medium"
+    return "high"
+
+
+# Groups planning to use the amenity in the slot. Outings count where the
+# weekend allocation optimizer recommended them (see app/services/
+# allocation.py): not at an amenity they were moved away from, and at the
+# one they were moved to while they still target the original.
+def planned_groups_query(amenity_id: UUID, planned_date: date, time_slot: str):
+    staying = select(func.count(Outing.id)).where(
+        Outing.planned_date == planned_date,
+        Outing.time_slot == time_slot,
+        Outing.target_amenities.contains([amenity_id]),
+        ~exists().where(
+            OutingReassignment.outing_id == Outing.id,
+            OutingReassignment.planned_date == Outing.planned_date,
+            OutingReassignment.from_amenity_id == amenity_id,
+        ),
+    ).scalar_subquery()
+    moved_in = select(func.count()).select_from(OutingReassignment).join(Outing, and_(
+        Outing.id == OutingReassignment.outing_id, Outing.planned_date == OutingReassignment.planned_date
+    )).where(
+        OutingReassignment.to_amenity_id == amenity_id,
+        OutingReassignment.planned_date == planned_date,
+        Outing.time_slot == time_slot,
+        Outing.target_amenities.any(OutingReassignment.from_amenity_id),
+    ).scalar_subquery()
+    return staying + moved_in
+
+
+# Recomputes the current contention for one amenity/date/slot from the
+# planned outings, stores it in amenity_contention and appends a snapshot to
+# the history. The caller commits.
+def refresh_contention(db: Session, amenity_id: UUID, planned_date: date, time_slot: str) -> Optional[dict]:
+    capacity = db.execute(select(Amenity.capacity_score).where(Amenity.id == amenity_id)).first()
+    if capacity is None:
+        return None
+
+    planned_groups = db.execute(select(planned_groups_query(amenity_id, planned_date, time_slot))).scalar()
+    score = contention_score(planned_groups, capacity[0], get_baseline(db, amenity_id, planned_date, time_slot))
+
+    stmt = pg_insert(AmenityContention).values(
+        amenity_id=amenity_id,
+        date=planned_date,
+        time_slot=time_slot,
+        planned_groups_count=planned_groups,
+        contention_score=score,
+    )
+    db.execute(stmt.on_conflict_do_update(
+        constraint="uq_amenity_date_time",
+        set_={
+            "planned_groups_count": stmt.excluded.planned_groups_count,
+            "contention_score": stmt.excluded.contention_score,
+            "updated_at": datetime.utcnow(),
+        },
+    ))
+    db.execute(insert(AmenityContentionHistory).values(
+        amenity_id=amenity_id,
+        observed_on=planned_date,
+        slot=slot_code(time_slot),
+        kind=SNAPSHOT,
+        planned_groups=_smallint(planned_groups),
+        score_centi=_smallint(score * 100),
+    ))
+    return {
+        "amenity_id": str(amenity_id),
+        "date": planned_date.isoformat(),
+        "time_slot": time_slot,
+        "planned_groups_count": planned_groups,
+        "contention_score": score,
+        "contention_level": contention_level(score),
+    }
+
+
+def record_attendance(db: Session, amenity_id: UUID, observed_on: date, time_slot: str, attendance: int):
+    db.execute(insert(AmenityContentionHistory).values(
+        amenity_id=amenity_id,
+        observed_on=observed_on,
+        slot=slot_code(time_slot),
+        kind=ATTENDANCE,
+        attendance=_smallint(attendance),
+    ))
@@ -0,0 +1,321 @@
+"""
+Weekend demand simulation for capacity planning.
+
+Estimates, ahead of a busy weekend, how likely each amenity of a lake is to
+saturate (contention score at or above a threshold, by default demand at
+or beyond capacity) in each date and time slot. Every scenario samples, per
+date and slot:
+
+- how many groups come. Users who prefer the lake and whose
+  schedule_preferences leave that day and slot open each come with a
+  probability calibrated so that the mean matches the outings held on the
+  same weekday and slot over the last history_weeks. The probability itself
+  is drawn from a beta distribution fitted to how much those historical
+  counts varied. Without such users, a gamma-Poisson fitted to the same
+  counts is used. Outings already planned are a floor;
+- which amenities they use. Groups target as many amenities as outings
+  historically did, split across amenities by shares drawn from a
+  Dirichlet over historical amenity_contention planned groups. Outings
+  already planned keep their targets;
+- walk-in attendance, Poisson around the amenity's baseline.
+
+demand_factor scales groups and walk-ins for holidays the weekday history
+doesn't capture. Scenarios run vectorized with NumPy, in chunks across a
+pool of spawned processes; each worker returns only saturation counts and
+a score histogram per amenity and slot.
+"""
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import extract, func, select
+from sqlalchemy.orm import Session
+
+from app.core.time_slots import TIME_SLOTS, slot_code
+from app.models import Amenity, AmenityContention, AmenityContentionBaseline, Outing, User
+from app.services.contention import DEFAULT_CAPACITY, HISTORY_WEIGHT, MAX_SCORE
+
+logger = logging.getLogger(__name__)
+
+SCORE_BINS = int(MAX_SCORE) + 1
+# Scenarios per chunk. Chunks don't depend on the number of workers, so a
+# seed gives the same result however the run is spread.
+CHUNK_SCENARIOS = 1000
+
+
+@dataclass(frozen=True)
+class DemandModel:
+    # One entry per (date, time slot) in slots; amenity arrays are indexed
+    # like amenity_ids.
+    slots: List[Tuple[date, str]]
+    amenity_ids: List[UUID]
+    capacity: np.ndarray          # (amenities,)
+    available_users: np.ndarray   # (slots,)
+    group_mean: np.ndarray        # (slots,)
+    group_var: np.ndarray         # (slots,)
+    units_per_group: np.ndarray   # (slots,)
+    planned_groups: np.ndarray    # (slots,)
+    planned_units: np.ndarray     # (slots, amenities)
+    share_alpha: np.ndarray       # (slots, amenities)
+    attendance: np.ndarray        # (slots, amenities)
+    demand_factor: float = 1.0
+
+
+def _preference_path(day: date, time_slot: str) -> Tuple[str, ...]:
+    if day.weekday() == 5:
+        return ("weekend", "saturday", time_slot)
+    if day.weekday() == 6:
+        return ("weekend", "sunday", time_slot)
+    return ("weekday", time_slot)
+
+
+# Users who prefer the lake and haven't ruled out each slot; missing
+# preferences count as available.
+def _available_users(db: Session, lake_id: UUID, slots: Sequence[Tuple[date, str]]) -> np.ndarray:
+    counts = db.execute(
+        select(*(
+            func.count().filter(
+                User.schedule_preferences[_preference_path(day, time_slot)].astext.is_distinct_from("false")
+            )
+            for day, time_slot in slots
+        )).where(User.preferred_lake_id == lake_id)
+    ).one()
+    return np.array(counts, dtype=np.int64)
+
+
+def build_model(
+    db: Session, lake_id: UUID, dates: Sequence[date], history_weeks: int, demand_factor: float = 1.0,
+    today: Optional[date] = None,
+) -> DemandModel:
+    today = today or date.today()
+    since = today - timedelta(weeks=history_weeks)
+    slots = [(day, time_slot) for day in dates for time_slot in TIME_SLOTS]
+    weekdays = sorted({day.isoweekday() for day in dates})
+
+    amenities = db.execute(
+        select(Amenity.id, Amenity.capacity_score).where(Amenity.lake_id == lake_id).order_by(Amenity.id)
+    ).all()
+    amenity_ids = [amenity.id for amenity in amenities]
+    index = {amenity_id: position for position, amenity_id in enumerate(amenity_ids)}
+    capacity = np.array([max(amenity.capacity_score or DEFAULT_CAPACITY, 1) for amenity in amenities], dtype=float)
+
+    # Groups and targets per past date and slot, on the target weekdays.
+    history = {}
+    for planned_date, time_slot, groups, targets in db.execute(
+        select(
+            Outing.planned_date, Outing.time_slot, func.count(),
+            func.avg(func.coalesce(func.cardinality(Outing.target_amenities), 0)),
+        )
+        .where(Outing.lake_id == lake_id, Outing.planned_date >= since, Outing.planned_date < today)
+        .group_by(Outing.planned_date, Outing.time_slot)
+    ):
+        if planned_date.isoweekday() in weekdays:
+            history[(planned_date, time_slot)] = (groups, float(targets or 0))
+    past_days = {weekday: [] for weekday in weekdays}
+    day = since
+    while day < today:
+        if day.isoweekday() in past_days:
+            past_days[day.isoweekday()].append(day)
+        day += timedelta(days=1)
+
+    shares = {}
+    if amenity_ids:
+        for amenity_id, weekday, time_slot, groups in db.execute(
+            select(
+                AmenityContention.amenity_id, extract("isodow", AmenityContention.date),
+                AmenityContention.time_slot, func.sum(AmenityContention.planned_groups_count),
+            )
+            .where(
+                AmenityContention.amenity_id.in_(amenity_ids),
+                AmenityContention.date >= since,
+                AmenityContention.date < today,
+            )
+            .group_by(AmenityContention.amenity_id, extract("isodow", AmenityContention.date), AmenityContention.time_slot)
+        ):
+            shares[(amenity_id, int(weekday), time_slot)] = float(groups or 0)
+
+    baselines = {}
+    if amenity_ids:
+        baselines = {
+            (amenity_id, weekday, slot): attendance or 0.0
+            for amenity_id, weekday, slot, attendance in db.execute(
+                select(
+                    AmenityContentionBaseline.amenity_id, AmenityContentionBaseline.day_of_week,
+                    AmenityContentionBaseline.slot, AmenityContentionBaseline.avg_attendance,
+                ).where(
+                    AmenityContentionBaseline.amenity_id.in_(amenity_ids),
+                    AmenityContentionBaseline.day_of_week.in_(weekdays),
+                )
+            )
+        }
+
+    planned_groups = np.zeros(len(slots), dtype=np.int64)
+    planned_units = np.zeros((len(slots), len(amenity_ids)), dtype=np.int64)
+    slot_index = {slot: position for position, slot in enumerate(slots)}
+    for planned_date, time_slot, targets in db.execute(
+        select(Outing.planned_date, Outing.time_slot, Outing.target_amenities)
+        .where(Outing.lake_id == lake_id, Outing.planned_date.in_(dates))
+    ):
+        position = slot_index.get((planned_date, time_slot))
+        if position is None:
+            continue
+        planned_groups[position] += 1
+        for target in targets or []:
+            if target in index:
+                planned_units[position, index[target]] += 1
+
+    group_mean = np.zeros(len(slots))
+    group_var = np.zeros(len(slots))
+    units_per_group = np.ones(len(slots))
+    share_alpha = np.ones((len(slots), len(amenity_ids)))
+    attendance = np.zeros((len(slots), len(amenity_ids)))
+    for position, (day, time_slot) in enumerate(slots):
+        weekday = day.isoweekday()
+        samples = [history.get((past, time_slot), (0, 0.0)) for past in past_days[weekday]]
+        counts = np.array([groups for groups, _ in samples], dtype=float)
+        if len(counts):
+            group_mean[position] = counts.mean()
+            group_var[position] = counts.var()
+        if counts.sum():
+            units_per_group[position] = max(sum(groups * targets for groups, targets in samples) / counts.sum(), 1.0)
+        for column, amenity_id in enumerate(amenity_ids):
+            share_alpha[position, column] += shares.get((amenity_id, weekday, time_slot), 0.0)
+            attendance[position, column] = baselines.get((amenity_id, weekday, slot_code(time_slot)), 0.0)
+
+    return DemandModel(
+        slots=slots,
+        amenity_ids=amenity_ids,
+        capacity=capacity,
+        available_users=_available_users(db, lake_id, slots),
+        group_mean=group_mean,
+        group_var=group_var,
+        units_per_group=units_per_group,
+        planned_groups=planned_groups,
+        planned_units=planned_units,
+        share_alpha=share_alpha,
+        attendance=attendance,
+        demand_factor=demand_factor,
+    )
+
+
+def _sample_groups(model: DemandModel, position: int, scenarios: int, rng: np.random.Generator) -> np.ndarray:
+    mean = model.group_mean[position] * model.demand_factor
+    var = model.group_var[position] * model.demand_factor ** 2
+    users = int(model.available_users[position])
+    if mean <= 0:
+        groups = np.zeros(scenarios, dtype=np.int64)
+    elif users > 0:
+        # Beta-binomial: the binomial's own variance is n p (1 - p); what
+        # the history varied beyond that goes into the spread of p.
+        p = min(mean / users, 1.0)
+        p_var = max(var - users * p * (1 - p), 0.0) / users ** 2
+        concentration = p * (1 - p) / p_var - 1 if p_var > 0 else 0.0
+        if 0 < p < 1 and concentration > 0:
+            probability = rng.beta(p * concentration, (1 - p) * concentration, scenarios)
+        else:
+            probability = np.full(scenarios, p)
+        groups = rng.binomial(users, probability)
+    elif var > mean:
+        groups = rng.poisson(rng.gamma(mean ** 2 / (var - mean), (var - mean) / mean, scenarios))
+    else:
+        groups = rng.poisson(mean, scenarios)
+    return np.maximum(groups, model.planned_groups[position])
+
+
+# Splits extra[s] units across amenities with shares drawn from
+# Dirichlet(alpha), for every scenario s at once: normalized gammas for the
+# shares, then one binomial per amenity on what is left.
+def _dirichlet_multinomial(extra: np.ndarray, alpha: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    gammas = rng.gamma(alpha, size=(len(extra), len(alpha)))
+    shares = gammas / gammas.sum(axis=1, keepdims=True)
+    counts = np.zeros(shares.shape, dtype=np.int64)
+    remaining = extra.copy()
+    rest = np.ones(len(extra))
+    for column in range(len(alpha) - 1):
+        probability = np.divide(shares[:, column], rest, out=np.ones(len(extra)), where=rest > 0)
+        counts[:, column] = rng.binomial(remaining, np.clip(probability, 0.0, 1.0))
+        remaining -= counts[:, column]
+        rest -= shares[:, column]
+    counts[:, -1] = remaining
+    return counts
+
+
+# Runs scenarios of the model and returns, per slot and amenity, how many
+# scenarios saturated and a histogram of whole-point scores.
+def simulate_chunk(model: DemandModel, scenarios: int, threshold: float, seed) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    slot_count, amenity_count = len(model.slots), len(model.amenity_ids)
+    saturated = np.zeros((slot_count, amenity_count), dtype=np.int64)
+    histogram = np.zeros((slot_count, amenity_count, SCORE_BINS), dtype=np.int64)
+    if amenity_count == 0:
+        return saturated, histogram
+    columns = np.arange(amenity_count) * SCORE_BINS
+
+    for position in range(slot_count):
+        groups = _sample_groups(model, position, scenarios, rng)
+        wanted = groups * model.units_per_group[position]
+        units = np.floor(wanted).astype(np.int64)
+        units += rng.random(scenarios) < wanted - units
+        extra = np.maximum(units - model.planned_units[position].sum(), 0)
+        load = model.planned_units[position] + _dirichlet_multinomial(extra, model.share_alpha[position], rng)
+        walk_ins = rng.poisson(model.attendance[position] * model.demand_factor, (scenarios, amenity_count))
+
+        score = np.minimum(MAX_SCORE, MAX_SCORE * (load + HISTORY_WEIGHT * walk_ins) / model.capacity)
+        saturated[position] = (score >= threshold).sum(axis=0)
+        bins = np.floor(score).astype(np.int64) + columns
+        histogram[position] = np.bincount(bins.ravel(), minlength=amenity_count * SCORE_BINS).reshape(
+            amenity_count, SCORE_BINS
+        )
+    return saturated, histogram
+
+
+def _percentile(histogram: np.ndarray, fraction: float) -> np.ndarray:
+    cumulative = histogram.cumsum(axis=-1)
+    return (cumulative < fraction * cumulative[..., -1:]).sum(axis=-1)
+
+
+def simulate(model: DemandModel, scenarios: int, workers: int, threshold: float = MAX_SCORE, seed=None) -> dict:
+    if scenarios < 1:
+        raise ValueError(f"At least one scenario is needed, got {scenarios}")
+    started = time.monotonic()
+    chunks = max(1, -(-scenarios // CHUNK_SCENARIOS))
+    sizes = [min(CHUNK_SCENARIOS, scenarios - position * CHUNK_SCENARIOS) for position in range(chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+
+    if workers > 1 and chunks > 1:
+        with ProcessPoolExecutor(min(workers, chunks), mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(simulate_chunk, [model] * chunks, sizes, [threshold] * chunks, seeds))
+    else:
+        results = [simulate_chunk(model, size, threshold, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    saturated = sum(result[0] for result in results)
+    histogram = sum(result[1] for result in results)
+
+    scores = np.arange(SCORE_BINS)
+    mean = (histogram * scores).sum(axis=-1) / scenarios
+    p90 = _percentile(histogram, 0.9)
+    elapsed = round(time.monotonic() - started, 2)
+    logger.info(f"Simulated {scenarios} scenarios of {len(model.slots)} slots on {chunks} chunks in {elapsed}s")
+    return {
+        "scenarios": scenarios,
+        "threshold": threshold,
+        "slots": [
+            {"date": day.isoformat(), "time_slot": time_slot} for day, time_slot in model.slots
+        ],
+        "amenities": [
+            {
+                "amenity_id": str(amenity_id),
+                "saturation_probability": [round(float(saturated[position, column]) / scenarios, 4)
+                                           for position in range(len(model.slots))],
+                "mean_score": [round(float(mean[position, column]), 1) for position in range(len(model.slots))],
+                "p90_score": [int(p90[position, column]) for position in range(len(model.slots))],
+            }
+            for column, amenity_id in enumerate(model.amenity_ids)
+        ],
+        "seconds": elapsed,
+    }
@@ -0,0 +1,127 @@
+"""
+Outing invitees and RSVPs.
+
+Each invitee is a row in outing_participants keyed by (outing_id, user_id),
+so inviting, responding and uninviting touch only that row: concurrent
+responders never lose each other's updates and the outing row itself is
+never rewritten. Per-status counts are a range scan on the primary key;
+"my pending invites" is a range scan on ix_outing_participants_user_status.
+Rows carry their outing's planned_date, which the foreign key to the
+partitioned outings table needs; it is copied from the outing on insert.
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Outing, OutingParticipant, User
+
+INVITED = "invited"
+ACCEPTED = "accepted"
+DECLINED = "declined"
+MAYBE = "maybe"
+STATUSES = (INVITED, ACCEPTED, DECLINED, MAYBE)
+
+
+# Invites users to an outing; users already invited keep their status and
+# ids that aren't users are skipped. Returns the number of new invitations.
+def invite(db: Session, outing_id: UUID, user_ids: Iterable[UUID]) -> int:
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return 0
+    now = datetime.utcnow()
+    invitees = (
+        select(
+            Outing.id,
+            Outing.planned_date,
+            User.id,
+            literal(INVITED),
+            literal(now, OutingParticipant.created_at.type),
+            literal(now, OutingParticipant.updated_at.type),
+        )
+        .select_from(Outing)
+        .join(User, User.id.in_(user_ids))
+        .where(Outing.id == outing_id)
+    )
+    stmt = insert(OutingParticipant).from_select(
+        ["outing_id", "planned_date", "user_id", "status", "created_at", "updated_at"], invitees
+    ).on_conflict_do_nothing(index_elements=["outing_id", "user_id"])
+    return db.execute(stmt).rowcount
+
+
+# Records one user's RSVP, inviting them if they weren't yet. Returns None
+# if the outing doesn't exist.
+def set_status(db: Session, outing_id: UUID, user_id: UUID, status: str) -> Optional[dict]:
+    now = datetime.utcnow()
+    responded_at = None if status == INVITED else now
+    participant = select(
+        Outing.id,
+        Outing.planned_date,
+        literal(user_id, OutingParticipant.user_id.type),
+        literal(status),
+        literal(responded_at, OutingParticipant.responded_at.type),
+        literal(now, OutingParticipant.created_at.type),
+        literal(now, OutingParticipant.updated_at.type),
+    ).where(Outing.id == outing_id)
+    stmt = insert(OutingParticipant).from_select(
+        ["outing_id", "planned_date", "user_id", "status", "responded_at", "created_at", "updated_at"], participant
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["outing_id", "user_id"],
+        set_={"status": status, "responded_at": responded_at, "updated_at": now},
+    ).returning(OutingParticipant.user_id, OutingParticipant.status, OutingParticipant.responded_at)
+    return db.execute(stmt).one_or_none()
+
+
+def remove(db: Session, outing_id: UUID, user_id: UUID) -> bool:
+    result = db.execute(
+        delete(OutingParticipant).where(OutingParticipant.outing_id == outing_id, OutingParticipant.user_id == user_id)
+    )
+    return result.rowcount > 0
+
+
+def status_counts(db: Session, outing_id: UUID) -> Dict[str, int]:
+    counts = dict.fromkeys(STATUSES, 0)
+    counts.update(db.execute(
+        select(OutingParticipant.status, func.count())
+        .where(OutingParticipant.outing_id == outing_id)
+        .group_by(OutingParticipant.status)
+    ).all())
+    return counts
+
+
+def list_participants(
+    db: Session, outing_id: UUID, status: Optional[str] = None, skip: int = 0, limit: int = 100
+) -> List:
+    query = (
+        select(OutingParticipant.user_id, User.username, OutingParticipant.status, OutingParticipant.responded_at)
+        .join(User, User.id == OutingParticipant.user_id)
+        .where(OutingParticipant.outing_id == outing_id)
+    )
+    if status:
+        query = query.where(OutingParticipant.status == status)
+    return db.execute(query.order_by(OutingParticipant.user_id).offset(skip).limit(limit)).all()
+
+
+# Outings user_id was invited to and hasn't answered, soonest first. The
+# date is filtered on both sides: on the participant rows to bound the index
+# range scan, and on outings to prune past partitions.
+def pending_invites(db: Session, user_id: UUID, since: date, skip: int = 0, limit: int = 100) -> List:
+    return db.execute(
+        select(Outing)
+        .join(OutingParticipant, and_(
+            OutingParticipant.outing_id == Outing.id, OutingParticipant.planned_date == Outing.planned_date
+        ))
+        .where(
+            OutingParticipant.user_id == user_id,
+            OutingParticipant.status == INVITED,
+            OutingParticipant.planned_date >= since,
+            Outing.planned_date >= since,
+        )
+        .order_by(Outing.planned_date, Outing.id)
+        .offset(skip)
+        .limit(limit)
+    ).scalars().all()
@@ -0,0 +1,221 @@
+"""
+Lake and user deletion.
+
+Every child table references its parent with ON DELETE CASCADE, so a
+single DELETE of the parent row removes everything below it without the
+ORM loading a single child. That DELETE is one transaction, though, holding
+row locks on every child until it commits, so entities with more than
+PURGE_SYNC_MAX_ROWS dependent rows are instead queued as a purge job: the
+job deletes the children in batches of PURGE_BATCH_SIZE, one short
+transaction per batch, records its progress in purge_jobs after each batch,
+and finally deletes the parent row itself.
+
+facility_schedules and availability_windows refer to amenities, boat ramps
+and marinas by (facility_type, facility_id), without a foreign key, so
+their rows are deleted explicitly, by the job or next to the inline DELETE.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.models import AvailabilityWindow, FacilitySchedule, Lake, PurgeJob, User
+from app.models.availability import FACILITY_MODELS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Tables without a foreign key to the facility rows they describe.
+FACILITY_TABLES = (AvailabilityWindow.__tablename__, FacilitySchedule.__tablename__)
+
+_LAKE_FACILITIES = " OR ".join(
+    f"(facility_type = '{facility_type}' AND facility_id IN (SELECT id FROM {model.__tablename__} WHERE lake_id = :entity_id))"
+    for facility_type, model in FACILITY_MODELS.items()
+)
+
+# Deletion order per entity type, deepest tables first so that each batch
+# cascades to as few rows as possible. Each step is (table, condition,
+# nullify): nullify steps clear a SET NULL reference instead of deleting.
+# Tables that only cascade are listed too, so that they are counted.
+PLANS = {
+    "lake": (Lake, [
+        ("outing_participants", "outing_id IN (SELECT id FROM outings WHERE lake_id = :entity_id)", False),
+        ("outing_reassignments", "lake_id = :entity_id", False),
+        ("outings", "lake_id = :entity_id", False),
+        ("weather_forecasts", "lake_id = :entity_id", False),
+        ("availability_windows", _LAKE_FACILITIES, False),
+        ("facility_schedules", _LAKE_FACILITIES, False),
+        ("amenity_contention", "amenity_id IN (SELECT id FROM amenities WHERE lake_id = :entity_id)", False),
+        ("amenity_contention_baselines", "amenity_id IN (SELECT id FROM amenities WHERE lake_id = :entity_id)", False),
+        ("amenities", "lake_id = :entity_id", False),
+        ("boat_ramps", "lake_id = :entity_id", False),
+        ("rental_bookings", "inventory_id IN (SELECT rental_inventory.id FROM rental_inventory "
+                            "JOIN marinas ON marinas.id = rental_inventory.marina_id WHERE marinas.lake_id = :entity_id)", False),
+        ("rental_inventory", "marina_id IN (SELECT id FROM marinas WHERE lake_id = :entity_id)", False),
+        ("marinas", "lake_id = :entity_id", False),
+        ("lake_boundaries_simplified", "lake_id = :entity_id", False),
+    ]),
+    "user": (User, [
+        ("outing_participants", "user_id = :entity_id", False),
+        ("outing_participants", "outing_id IN (SELECT id FROM outings WHERE user_id = :entity_id)", False),
+        ("outing_reassignments", "outing_id IN (SELECT id FROM outings WHERE user_id = :entity_id)", False),
+        ("outings", "user_id = :entity_id", False),
+        ("friendships", "user_id = :entity_id", False),
+        ("friendships", "friend_id = :entity_id", False),
+        ("rental_bookings", "user_id = :entity_id", False),
+        ("audit_log", "user_id = :entity_id", True),
+    ]),
+}
+
+
+def count_dependents(conn, entity_type: str, entity_id: UUID, cap: Optional[int] = None) -> int:
+    # With a cap, each table stops counting after cap rows, which is enough
+    # to decide between deleting inline and queueing a job.
+    total = 0
+    for table, condition, _ in PLANS[entity_type][1]:
+        if cap is None:
+            sql = f"SELECT count(*) FROM {table} WHERE {condition}"
+        else:
+            sql = f"SELECT count(*) FROM (SELECT 1 FROM {table} WHERE {condition} LIMIT :cap) AS capped"
+        total += conn.execute(text(sql), {"entity_id": entity_id, "cap": cap}).scalar()
+        if cap is not None and total > cap:
+            break
+    return total
+
+
+def _active_job(db: Session, entity_type: str, entity_id: UUID) -> Optional[PurgeJob]:
+    return db.query(PurgeJob).filter(
+        PurgeJob.entity_type == entity_type,
+        PurgeJob.entity_id == entity_id,
+        PurgeJob.status.in_([QUEUED, RUNNING]),
+    ).first()
+
+
+# Deletes the entity right away if it is small, otherwise queues (or returns
+# the already active) purge job for it. Returns None when deleted inline;
+# raises LookupError if the entity does not exist.
+def delete_or_queue(db: Session, entity_type: str, entity_id: UUID) -> Optional[PurgeJob]:
+    model = PLANS[entity_type][0]
+    job = _active_job(db, entity_type, entity_id)
+    if job:
+        return job
+    if not db.query(model.id).filter(model.id == entity_id).first():
+        raise LookupError(entity_id)
+
+    if count_dependents(db, entity_type, entity_id, cap=settings.PURGE_SYNC_MAX_ROWS) <= settings.PURGE_SYNC_MAX_ROWS:
+        for table, condition, _ in PLANS[entity_type][1]:
+            if table in FACILITY_TABLES:
+                db.execute(text(f"DELETE FROM {table} WHERE {condition}"), {"entity_id": entity_id})
+        db.execute(delete(model).where(model.id == entity_id))
+        db.commit()
+        return None
+
+    job = PurgeJob(entity_type=entity_type, entity_id=entity_id, status=QUEUED, total_rows=0, deleted_rows=0)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    logger.info(f"Queued purge job {job.id} for {entity_type} {entity_id}")
+    return job
+
+
+def _claim(conn: Connection, job_id: UUID):
+    # A running job whose progress hasn't moved for PURGE_STALE_SECONDS is
+    # assumed to belong to a dead process and may be taken over.
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.PURGE_STALE_SECONDS)
+    return conn.execute(
+        update(PurgeJob)
+        .where(
+            PurgeJob.id == job_id,
+            (PurgeJob.status == QUEUED) | ((PurgeJob.status == RUNNING) & (PurgeJob.updated_at < stale)),
+        )
+        .values(status=RUNNING, started_at=func.coalesce(PurgeJob.started_at, now), updated_at=now)
+        .returning(PurgeJob.entity_type, PurgeJob.entity_id, PurgeJob.deleted_rows)
+    ).first()
+
+
+# ctid is only unique within one partition, so batches of partitioned
+# tables are picked by primary key instead.
+PARTITIONED_KEYS = {
+    "outings": "id, planned_date",
+}
+
+
+def _batch_statement(table: str, condition: str, nullify: bool):
+    # ctid lets one statement shape serve every table, composite keys
+    # included, and turns each batch into a TID scan.
+    batch = f"ctid = ANY(ARRAY(SELECT ctid FROM {table} WHERE {condition} LIMIT :batch_size))"
+    if table in PARTITIONED_KEYS:
+        key = PARTITIONED_KEYS[table]
+        batch = f"({key}) IN (SELECT {key} FROM {table} WHERE {condition} LIMIT :batch_size)"
+    if nullify:
+        return text(f"UPDATE {table} SET user_id = NULL WHERE {batch}")
+    return text(f"DELETE FROM {table} WHERE {batch}")
+
+
+def _progress(conn: Connection, job_id: UUID, **values):
+    conn.execute(update(PurgeJob).where(PurgeJob.id == job_id).values(updated_at=datetime.utcnow(), **values))
+
+
+def run_purge_job(job_id: UUID):
+    engine = get_engine()
+    with engine.begin() as conn:
+        claimed = _claim(conn, job_id)
+    if claimed is None:
+        return
+    entity_type, entity_id, deleted = claimed
+    model, steps = PLANS[entity_type]
+    logger.info(f"Purge job {job_id}: purging {entity_type} {entity_id}")
+
+    try:
+        with engine.begin() as conn:
+            _progress(conn, job_id, total_rows=deleted + count_dependents(conn, entity_type, entity_id) + 1)
+
+        params = {"entity_id": entity_id, "batch_size": settings.PURGE_BATCH_SIZE}
+        for table, condition, nullify in steps:
+            statement = _batch_statement(table, condition, nullify)
+            while True:
+                with engine.begin() as conn:
+                    affected = conn.execute(statement, params).rowcount
+                    deleted += affected
+                    _progress(conn, job_id, deleted_rows=deleted, current_table=table)
+                if affected < settings.PURGE_BATCH_SIZE:
+                    break
+
+        # Whatever was added while the job ran goes with the parent row.
+        with engine.begin() as conn:
+            conn.execute(delete(model).where(model.id == entity_id))
+            _progress(conn, job_id, status=DONE, deleted_rows=deleted + 1, current_table=None, finished_at=datetime.utcnow())
+    except Exception as e:
+        logger.exception(f"Purge job {job_id} failed")
+        with engine.begin() as conn:
+            _progress(conn, job_id, status=FAILED, error=str(e), finished_at=datetime.utcnow())
+        return
+    logger.info(f"Purge job {job_id}: {entity_type} {entity_id} purged ({deleted + 1} rows)")
+
+
+# Deletes the rows describing one amenity, boat ramp or marina, in the
+# caller's transaction, before the facility itself is deleted.
+def delete_facility_rows(db: Session, facility_type: str, facility_id: UUID):
+    for model in (AvailabilityWindow, FacilitySchedule):
+        db.execute(delete(model).where(model.facility_type == facility_type, model.facility_id == facility_id))
+
+
+# Jobs that were queued but never started, or whose process died.
+def pending_job_ids(db: Session) -> list:
+    stale = datetime.utcnow() - timedelta(seconds=settings.PURGE_STALE_SECONDS)
+    return db.execute(
+        select(PurgeJob.id)
+        .where((PurgeJob.status == QUEUED) | ((PurgeJob.status == RUNNING) & (PurgeJob.updated_at < stale)))
+        .order_by(PurgeJob.created_at)
+    ).scalars().all()
@@ -0,0 +1,227 @@
+"""
+Opening hours and seasons for amenities, boat ramps and marinas.
+
+hours_of_operation and seasonal_availability are free-form JSONB. This
+module parses the shapes in use into a normalized form (one open/close
+pair per ISO weekday, each a fixed time or an offset from sunrise/sunset,
+plus an optional season), and resolves that into concrete per-day
+windows in minutes after local midnight. Supported hours shapes:
+
+    {"open": "sunrise", "close": "sunset"}                  every day
+    {"weekday": "6:00 AM - 10:00 PM", "weekend": "5:00 AM - 11:00 PM"}
+    {"saturday": {"open": "7:00", "close": "sunset - 30"}, "sunday": "closed"}
+
+Day keys (monday..sunday) override weekday/weekend, which override
+open/close. Seasons are "March - November", "year-round" or
+{"start": "03-15", "end": "11-30"}.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from app.core.solar import sun_times
+
+FIXED = 0
+SUNRISE = 1
+SUNSET = 2
+
+MINUTES_PER_DAY = 24 * 60
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+WEEKDAYS = range(1, 6)
+WEEKEND = range(6, 8)
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+         ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+         ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1,
+    )
+    for name in names
+}
+
+_CLOCK = re.compile(r"^(\d{1,2})(?::(\d{2}))?\s*([ap])\.?\s*m?\.?$|^(\d{1,2}):(\d{2})$")
+_SOLAR = re.compile(r"^(sunrise|sunset)\s*(?:([+-])\s*(\d+)\s*(h|hr|hrs|hours?|m|min|mins|minutes?)?)?$")
+_RANGE = re.compile(r"\s+(?:-|–|to)\s+|\s*–\s*")
+_MONTH_DAY = re.compile(r"^(\d{1,2})-(\d{1,2})$")
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class TimeSpec:
+    kind: int
+    minute: int  # minutes after midnight, or the offset for sunrise/sunset
+
+
+@dataclass(frozen=True)
+class DaySchedule:
+    opens: TimeSpec
+    closes: TimeSpec
+
+
+def parse_time(value) -> TimeSpec:
+    text = str(value).strip().lower()
+    if text == "midnight":
+        return TimeSpec(FIXED, 0)
+    if text == "24:00":
+        return TimeSpec(FIXED, MINUTES_PER_DAY)
+    if text == "noon":
+        return TimeSpec(FIXED, 12 * 60)
+
+    solar = _SOLAR.match(text)
+    if solar:
+        offset = int(solar.group(3) or 0)
+        if solar.group(4) and solar.group(4).startswith("h"):
+            offset *= 60
+        if solar.group(2) == "-":
+            offset = -offset
+        return TimeSpec(SUNRISE if solar.group(1) == "sunrise" else SUNSET, offset)
+
+    clock = _CLOCK.match(text)
+    if clock:
+        if clock.group(1) is not None:
+            hour, minute, meridiem = int(clock.group(1)), int(clock.group(2) or 0), clock.group(3)
+            if not 1 <= hour <= 12:
+                raise ScheduleError(f"Invalid time: {value}")
+            hour = hour % 12 + (12 if meridiem == "p" else 0)
+        else:
+            hour, minute = int(clock.group(4)), int(clock.group(5))
+        if hour > 23 or minute > 59:
+            raise ScheduleError(f"Invalid time: {value}")
+        return TimeSpec(FIXED, hour * 60 + minute)
+
+    raise ScheduleError(f"Invalid time: {value}")
+
+
+def _parse_day(value) -> Optional[DaySchedule]:
+    if isinstance(value, dict):
+        if value.get("closed") is True:
+            return None
+        if "open" not in value or "close" not in value:
+            raise ScheduleError(f"Expected open and close: {value}")
+        return DaySchedule(parse_time(value["open"]), parse_time(value["close"]))
+
+    text = str(value).strip()
+    if text.lower() == "closed":
+        return None
+    if text.lower() in ("24 hours", "24h", "open 24 hours", "always"):
+        return DaySchedule(TimeSpec(FIXED, 0), TimeSpec(FIXED, MINUTES_PER_DAY))
+    parts = _RANGE.split(text)
+    if len(parts) != 2 and text.count("-") == 1:
+        parts = text.split("-")
+    if len(parts) != 2:
+        raise ScheduleError(f"Invalid hours: {value}")
+    return DaySchedule(parse_time(parts[0]), parse_time(parts[1]))
+
+
+# Hours per ISO weekday (1 = Monday); days missing from the result are
+# closed. None (no hours recorded) means open all day.
+def parse_hours(hours: Optional[dict]) -> Dict[int, DaySchedule]:
+    if not hours:
+        return {day: DaySchedule(TimeSpec(FIXED, 0), TimeSpec(FIXED, MINUTES_PER_DAY)) for day in range(1, 8)}
+    if not isinstance(hours, dict):
+        raise ScheduleError(f"Invalid hours: {hours}")
+
+    keys = {str(key).lower(): value for key, value in hours.items()}
+    schedule: Dict[int, Optional[DaySchedule]] = {}
+    if "open" in keys or "close" in keys:
+        every_day = _parse_day(keys)
+        schedule.update({day: every_day for day in range(1, 8)})
+    for group, days in (("weekday", WEEKDAYS), ("weekdays", WEEKDAYS), ("weekend", WEEKEND), ("weekends", WEEKEND)):
+        if group in keys:
+            group_schedule = _parse_day(keys[group])
+            schedule.update({day: group_schedule for day in days})
+    for day, name in enumerate(DAYS, start=1):
+        for key in (name, name[:3]):
+            if key in keys:
+                schedule[day] = _parse_day(keys[key])
+
+    if not schedule:
+        raise ScheduleError(f"No recognizable hours: {hours}")
+    return {day: day_schedule for day, day_schedule in schedule.items() if day_schedule is not None}
+
+
+def _month_day(value, end: bool) -> int:
+    text = str(value).strip().lower()
+    match = _MONTH_DAY.match(text)
+    if match:
+        return int(match.group(1)) * 100 + int(match.group(2))
+    if text in MONTHS:
+        month = MONTHS[text]
+        return month * 100 + (31 if end else 1)
+    raise ScheduleError(f"Invalid season boundary: {value}")
+
+
+# Season as (start, end) encoded month * 100 + day, inclusive, possibly
+# wrapping over the new year; None means open year-round.
+def parse_season(season: Optional[dict]) -> Optional[Tuple[int, int]]:
+    if not season:
+        return None
+    if not isinstance(season, dict):
+        raise ScheduleError(f"Invalid season: {season}")
+    keys = {str(key).lower(): value for key, value in season.items()}
+    if "start" in keys and "end" in keys:
+        return _month_day(keys["start"], end=False), _month_day(keys["end"], end=True)
+
+    value = keys.get("open_season") or keys.get("season")
+    if value is None:
+        raise ScheduleError(f"No recognizable season: {season}")
+    text = str(value).strip().lower()
+    if text.replace("-", " ") in ("year round", "all year", "always"):
+        return None
+    parts = _RANGE.split(text)
+    if len(parts) != 2 and text.count("-") == 1:
+        parts = text.split("-")
+    if len(parts) != 2:
+        raise ScheduleError(f"Invalid season: {value}")
+    return _month_day(parts[0], end=False), _month_day(parts[1], end=True)
+
+
+def in_season(season: Optional[Tuple[int, int]], day: date) -> bool:
+    if season is None:
+        return True
+    start, end = season
+    month_day = day.month * 100 + day.day
+    if start <= end:
+        return start <= month_day <= end
+    return month_day >= start or month_day <= end
+
+
+def _resolve(spec: TimeSpec, sunrise: Optional[int], sunset: Optional[int]) -> Optional[int]:
+    if spec.kind == FIXED:
+        return spec.minute
+    anchor = sunrise if spec.kind == SUNRISE else sunset
+    if anchor is None:
+        return None
+    return max(0, min(MINUTES_PER_DAY, anchor + spec.minute))
+
+
+# The open window on day as (opens, closes) minutes after local midnight, or
+# None if closed. Windows that run past midnight are cut at midnight.
+def open_window(
+    schedule: Dict[int, DaySchedule],
+    season: Optional[Tuple[int, int]],
+    day: date,
+    latitude: float,
+    longitude: float,
+    timezone: str,
+) -> Optional[Tuple[int, int]]:
+    day_schedule = schedule.get(day.isoweekday())
+    if day_schedule is None or not in_season(season, day):
+        return None
+
+    sunrise = sunset = None
+    if day_schedule.opens.kind != FIXED or day_schedule.closes.kind != FIXED:
+        sunrise, sunset = sun_times(latitude, longitude, day, timezone)
+    opens = _resolve(day_schedule.opens, sunrise, sunset)
+    closes = _resolve(day_schedule.closes, sunrise, sunset)
+    if opens is None or closes is None:
+        return None
+    if closes <= opens:
+        closes = MINUTES_PER_DAY
+    return opens, closes
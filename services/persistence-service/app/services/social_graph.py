@@ -0,0 +1,191 @@
+"""
+Friend graph queries.
+
+Accepted friendships are stored as two directed rows, (a, b) and (b, a), so
+"friends of X" is a range scan on ix_friendships_user_status_friend that
+never touches the heap, and every multi-hop query is a chain of the same
+scan with no OR conditions. A pending request is a single
+requester -> addressee row until it is accepted.
+"""
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Friendship, Outing, User
+
+ACCEPTED = "accepted"
+PENDING = "pending"
+
+
+def _accepted_edges(alias=Friendship):
+    return alias.status == ACCEPTED
+
+
+# Records a request from user_id to friend_id and returns the resulting
+# status. Requesting someone who already asked us accepts their request.
+def request_friendship(db: Session, user_id: UUID, friend_id: UUID) -> str:
+    reverse = db.execute(
+        select(Friendship.status).where(Friendship.user_id == friend_id, Friendship.friend_id == user_id)
+    ).scalar()
+    if reverse == PENDING:
+        accept_friendship(db, user_id, friend_id)
+        return ACCEPTED
+    if reverse == ACCEPTED:
+        return ACCEPTED
+
+    stmt = insert(Friendship).values(user_id=user_id, friend_id=friend_id, status=PENDING)
+    db.execute(stmt.on_conflict_do_nothing(constraint="uq_user_friend"))
+    return db.execute(
+        select(Friendship.status).where(Friendship.user_id == user_id, Friendship.friend_id == friend_id)
+    ).scalar()
+
+
+def accept_friendship(db: Session, user_id: UUID, requester_id: UUID) -> bool:
+    accepted = db.execute(
+        update(Friendship)
+        .where(
+            Friendship.user_id == requester_id,
+            Friendship.friend_id == user_id,
+            Friendship.status == PENDING,
+        )
+        .values(status=ACCEPTED, updated_at=datetime.utcnow())
+        .returning(Friendship.id)
+    ).first()
+    if accepted is None:
+        return False
+
+    stmt = insert(Friendship).values(user_id=user_id, friend_id=requester_id, status=ACCEPTED)
+    db.execute(stmt.on_conflict_do_update(
+        constraint="uq_user_friend",
+        set_={"status": ACCEPTED, "updated_at": datetime.utcnow()},
+    ))
+    return True
+
+
+# Unfriends, declines or withdraws: removes the rows in both directions.
+def remove_friendship(db: Session, user_id: UUID, friend_id: UUID) -> int:
+    result = db.execute(
+        delete(Friendship).where(or_(
+            and_(Friendship.user_id == user_id, Friendship.friend_id == friend_id),
+            and_(Friendship.user_id == friend_id, Friendship.friend_id == user_id),
+        ))
+    )
+    return result.rowcount
+
+
+def list_friends(db: Session, user_id: UUID, skip: int = 0, limit: int = 100) -> List:
+    return db.execute(
+        select(User.id, User.username, Friendship.updated_at.label("since"))
+        .join(User, User.id == Friendship.friend_id)
+        .where(Friendship.user_id == user_id, _accepted_edges())
+        .order_by(User.username)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+
+def list_requests(db: Session, user_id: UUID, outgoing: bool = False) -> List:
+    if outgoing:
+        own, other = Friendship.user_id, Friendship.friend_id
+    else:
+        own, other = Friendship.friend_id, Friendship.user_id
+    return db.execute(
+        select(User.id, User.username, Friendship.created_at.label("requested_at"))
+        .join(User, User.id == other)
+        .where(own == user_id, Friendship.status == PENDING)
+        .order_by(Friendship.created_at.desc())
+    ).all()
+
+
+def mutual_friends(db: Session, user_id: UUID, other_id: UUID) -> List:
+    mine = aliased(Friendship)
+    theirs = aliased(Friendship)
+    return db.execute(
+        select(User.id, User.username)
+        .select_from(mine)
+        .join(theirs, and_(
+            theirs.friend_id == mine.friend_id,
+            theirs.user_id == other_id,
+            _accepted_edges(theirs),
+        ))
+        .join(User, User.id == mine.friend_id)
+        .where(mine.user_id == user_id, _accepted_edges(mine))
+        .order_by(User.username)
+    ).all()
+
+
+# Friends of friends ranked by the number of mutual friends.
+def friend_suggestions(db: Session, user_id: UUID, limit: int = 20) -> List:
+    first = aliased(Friendship)
+    second = aliased(Friendship)
+    known = aliased(Friendship)
+    already_known = (
+        select(literal(1))
+        .where(known.user_id == user_id, known.friend_id == second.friend_id)
+        .exists()
+    )
+    candidates = (
+        select(second.friend_id.label("user_id"), func.count().label("mutual_friends"))
+        .select_from(first)
+        .join(second, and_(second.user_id == first.friend_id, _accepted_edges(second)))
+        .where(
+            first.user_id == user_id,
+            _accepted_edges(first),
+            second.friend_id != user_id,
+            ~already_known,
+        )
+        .group_by(second.friend_id)
+        .order_by(func.count().desc(), second.friend_id)
+        .limit(limit)
+        .subquery()
+    )
+    return db.execute(
+        select(User.id, User.username, candidates.c.mutual_friends)
+        .join(candidates, candidates.c.user_id == User.id)
+        .order_by(candidates.c.mutual_friends.desc(), User.username)
+    ).all()
+
+
+# Outings at a lake on a date planned by anyone within max_hops of user_id,
+# walked with one recursive CTE. UNION keeps (user, hops) pairs, so the
+# shortest distance per user is taken in the outer query.
+def network_outings(
+    db: Session,
+    user_id: UUID,
+    lake_id: UUID,
+    planned_date: date,
+    max_hops: int = 2,
+    time_slot: Optional[str] = None,
+) -> List:
+    seed = (
+        select(Friendship.friend_id.label("user_id"), literal(1).label("hops"))
+        .where(Friendship.user_id == user_id, _accepted_edges())
+        .cte("network", recursive=True)
+    )
+    edge = aliased(Friendship)
+    network = seed.union(
+        select(edge.friend_id, seed.c.hops + 1)
+        .select_from(seed)
+        .join(edge, and_(edge.user_id == seed.c.user_id, _accepted_edges(edge)))
+        .where(seed.c.hops < max_hops, edge.friend_id != user_id)
+    )
+    distance = (
+        select(network.c.user_id, func.min(network.c.hops).label("hops"))
+        .group_by(network.c.user_id)
+        .subquery()
+    )
+
+    query = (
+        select(Outing.id, Outing.time_slot, Outing.target_amenities, User.id.label("user_id"), User.username, distance.c.hops)
+        .join(distance, distance.c.user_id == Outing.user_id)
+        .join(User, User.id == Outing.user_id)
+        .where(Outing.lake_id == lake_id, Outing.planned_date == planned_date)
+        .order_by(distance.c.hops, User.username)
+    )
+    if time_slot:
+        query = query.where(Outing.time_slot == time_slot)
+    return db.execute(query).all()
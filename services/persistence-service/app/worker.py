@@ -0,0 +1,149 @@
+"""
+Standalone RabbitMQ consumer worker pool.
+
+Runs only the message consumers, with a configurable number of processes
+per queue, so event throughput scales independently of the HTTP API:
+
+    python -m app.worker
+    python -m app.worker --queue persistence_audit_queue --processes 4
+
+Each process consumes a single queue. On SIGTERM/SIGINT the supervisor
+asks every process to stop; processes cancel their consumers, finish and
+ack in-flight messages, and exit. Processes that die unexpectedly are
+restarted.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from typing import Dict, List
+
+from app.core.config import settings
+
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+logger = logging.getLogger(__name__)
+
+RESTART_BACKOFF_SECONDS = 1.0
+
+
+async def consume_queue(queue_name: str):
+    from app.messaging.consumers import CONSUMERS
+    # The shared client, so that handlers can publish follow-up events
+    # (e.g. contention.updated) over this process's connection.
+    from app.messaging.rabbitmq import rabbitmq_client as client
+
+    routing_key, _, handler = next(consumer for consumer in CONSUMERS if consumer[1] == queue_name)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    connecting = asyncio.create_task(client.connect_with_retry())
+    stopping = asyncio.create_task(stop.wait())
+    await asyncio.wait({connecting, stopping}, return_when=asyncio.FIRST_COMPLETED)
+    if stop.is_set():
+        connecting.cancel()
+        await client.close()
+        return
+
+    await client.subscribe(routing_key, queue_name, handler)
+    await stopping
+
+    logger.info(f"Stopping consumer for {queue_name}")
+    await client.drain(settings.WORKER_SHUTDOWN_TIMEOUT)
+    await client.close()
+
+
+def run_consumer(queue_name: str):
+    asyncio.run(consume_queue(queue_name))
+
+
+class WorkerPool:
+    def __init__(self, processes: Dict[str, int]):
+        self.processes = processes
+        self.context = multiprocessing.get_context("spawn")
+        self.workers: Dict[str, List[multiprocessing.Process]] = {queue_name: [] for queue_name in processes}
+        self.stopping = False
+
+    def _spawn(self, queue_name: str, index: int) -> multiprocessing.Process:
+        process = self.context.Process(
+            target=run_consumer,
+            args=(queue_name,),
+            name=f"{queue_name}-{index}",
+        )
+        process.start()
+        logger.info(f"Started {process.name} (pid {process.pid})")
+        return process
+
+    def start(self):
+        for queue_name, count in self.processes.items():
+            self.workers[queue_name] = [self._spawn(queue_name, index) for index in range(count)]
+
+    def stop(self, *_):
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info("Shutting down worker pool...")
+        for processes in self.workers.values():
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+    def supervise(self):
+        while not self.stopping:
+            for queue_name, processes in self.workers.items():
+                for index, process in enumerate(processes):
+                    if not process.is_alive() and not self.stopping:
+                        logger.warning(f"{process.name} exited with code {process.exitcode}, restarting")
+                        time.sleep(RESTART_BACKOFF_SECONDS)
+                        processes[index] = self._spawn(queue_name, index)
+            time.sleep(0.5)
+
+    def join(self):
+        # Children drain for up to WORKER_SHUTDOWN_TIMEOUT; allow a little
+        # extra for connection teardown before forcing them down.
+        deadline = time.monotonic() + settings.WORKER_SHUTDOWN_TIMEOUT + 5
+        for processes in self.workers.values():
+            for process in processes:
+                process.join(max(0.0, deadline - time.monotonic()))
+                if process.is_alive():
+                    logger.warning(f"{process.name} did not drain in time, killing")
+                    process.kill()
+                    process.join()
+        logger.info("Worker pool stopped")
+
+
+def main():
+    from app.messaging.consumers import CONSUMERS
+
+    queue_names = [queue_name for _, queue_name, _ in CONSUMERS]
+    parser = argparse.ArgumentParser(description="Run the persistence service message consumers")
+    parser.add_argument("--queue", action="append", choices=queue_names,
+                        help="Queue to consume (repeatable, default: all)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Processes per queue (default: WORKER_QUEUE_PROCESSES / WORKER_PROCESSES)")
+    args = parser.parse_args()
+
+    processes = {
+        queue_name: args.processes or settings.WORKER_QUEUE_PROCESSES.get(queue_name, settings.WORKER_PROCESSES)
+        for queue_name in (args.queue or queue_names)
+    }
+    processes = {queue_name: count for queue_name, count in processes.items() if count > 0}
+
+    pool = WorkerPool(processes)
+    signal.signal(signal.SIGTERM, pool.stop)
+    signal.signal(signal.SIGINT, pool.stop)
+    pool.start()
+    pool.supervise()
+    pool.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Weekend allocation optimizer benchmark.
+
+Builds a synthetic lake of --amenities amenities spread over a few types
+within about 10 km, and --outings outings over a weekend's two days and
+three time slots. Each outing targets one to three amenities chosen with a
+skewed popularity, so a handful of amenities are heavily oversubscribed.
+Then runs the optimizer (app.services.allocation.allocate_slot) on every
+date and slot, and reports the time taken, the moves recommended and the
+peak demand (planned groups plus usual attendance, as a percentage of
+capacity; the stored score is this capped at 100) before and after.
+
+Only the solver is timed: no database is needed. Loading the outings and
+writing the results add one indexed read and two bulk writes per run.
+
+Usage:
+    python scripts/benchmark_allocation.py --outings 50000 --amenities 250
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.allocation import allocate_slot, distance_matrix  # noqa: E402
+from app.services.contention import HISTORY_WEIGHT, MAX_SCORE  # noqa: E402
+
+TYPES = ("boat_ramp", "picnic_area", "fishing_pier", "swimming_area", "restroom")
+SLOTS = ("morning", "afternoon", "evening")
+
+
+def build_lake(amenities: int, rng: random.Random):
+    types = [TYPES[index % len(TYPES)] for index in range(amenities)]
+    capacity = np.array([rng.choice((10, 20, 20, 40, 80)) for _ in range(amenities)], dtype=float)
+    latitudes = np.array([34.0 + rng.uniform(0, 0.09) for _ in range(amenities)])
+    longitudes = np.array([-84.0 + rng.uniform(0, 0.11) for _ in range(amenities)])
+    # Zipf-like popularity: the first amenities of each type draw most groups.
+    popularity = np.array([1.0 / (1 + index // len(TYPES)) ** 1.2 for index in range(amenities)])
+    return types, capacity, distance_matrix(latitudes, longitudes), popularity
+
+
+def build_outings(count: int, types, popularity, rng: random.Random):
+    by_type = {}
+    for index, amenity_type in enumerate(types):
+        by_type.setdefault(amenity_type, []).append(index)
+    slots = {(day, slot): [] for day in range(2) for slot in SLOTS}
+    keys = list(slots)
+    for _ in range(count):
+        targets = []
+        for amenity_type in rng.sample(TYPES, rng.choice((1, 1, 2, 3))):
+            candidates = by_type[amenity_type]
+            targets.append(rng.choices(candidates, weights=[popularity[index] for index in candidates])[0])
+        slots[rng.choice(keys)].append((uuid.uuid4(), targets))
+    for outings in slots.values():
+        outings.sort(key=lambda outing: outing[0])
+    return slots
+
+
+def peak_demand(units, capacity, history) -> np.ndarray:
+    return MAX_SCORE * (units + HISTORY_WEIGHT * history) / capacity
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--outings", type=int, default=50000)
+    parser.add_argument("--amenities", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    types, capacity, distance_km, popularity = build_lake(args.amenities, rng)
+    slots = build_outings(args.outings, types, popularity, rng)
+    history = np.array([rng.choice((0.0, 0.0, 2.0, 6.0)) for _ in types])
+
+    total_moves = 0
+    started = time.perf_counter()
+    for (day, slot), outings in slots.items():
+        slot_started = time.perf_counter()
+        allocation = allocate_slot(outings, types, capacity, history, distance_km)
+        elapsed = time.perf_counter() - slot_started
+        before = peak_demand(allocation.before, capacity, history)
+        after = peak_demand(allocation.after, capacity, history)
+        distance = sum(distance_km[origin, target] for _, origin, target in allocation.moves)
+        total_moves += len(allocation.moves)
+        print(f"day {day} {slot:9s}  {len(outings):6d} outings  {len(allocation.moves):6d} moves "
+              f"({distance / max(len(allocation.moves), 1):.2f} km avg)  "
+              f"peak demand {before.max():6.1f}% -> {after.max():6.1f}%  "
+              f"amenities over 100%: {int((before > MAX_SCORE).sum()):3d} -> {int((after > MAX_SCORE).sum()):3d}  "
+              f"{elapsed * 1000:7.1f} ms")
+    elapsed = time.perf_counter() - started
+    print(f"total  {args.outings} outings, {total_moves} moves in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
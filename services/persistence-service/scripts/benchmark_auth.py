@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Authentication overhead benchmark.
+
+Times token verification on its own and as request overhead:
+
+    decode      full verification of a token never seen before (signature,
+                claims, expiry)
+    cached      verification of a token already in the claims cache, i.e.
+                every request after a client's first
+    request     per-request latency of a trivial endpoint with and without
+                the require_auth dependency, driven in-process through the
+                ASGI app, and the difference between the two
+
+With --hash, also runs --hashes concurrent bcrypt hashes through the
+password hashing pool and reports their throughput and the worst event
+loop stall seen meanwhile (requires bcrypt).
+
+No database or broker is needed.
+
+Usage:
+    python scripts/benchmark_auth.py --iterations 100000 --requests 20000
+    python scripts/benchmark_auth.py --hash --hashes 32
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from app.api.auth import require_auth  # noqa: E402
+from app.core.passwords import PasswordHasher  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.security import decode_token, issue_token, token_cache, verify_token  # noqa: E402
+
+
+def per_call_us(function, tokens, iterations: int) -> float:
+    count = len(tokens)
+    started = time.perf_counter()
+    for index in range(iterations):
+        function(tokens[index % count])
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench_tokens(iterations: int):
+    tokens = [issue_token(str(uuid.uuid4()), {"username": f"bench{index}"})[0] for index in range(1000)]
+    decode = per_call_us(decode_token, tokens, iterations)
+
+    token_cache.clear()
+    for token in tokens:
+        verify_token(token)
+    cached = per_call_us(verify_token, tokens, iterations)
+    print(f"decode  {decode:8.2f} us/token")
+    print(f"cached  {cached:8.2f} us/token")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_endpoint():
+        return {"ok": True}
+
+    @app.get("/authenticated", dependencies=[Depends(require_auth)])
+    async def authenticated_endpoint():
+        return {"ok": True}
+
+    return app
+
+
+async def request_latencies(app: FastAPI, path: str, headers: list, requests: int) -> list:
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": headers, "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await app(dict(scope), receive, send)
+        samples.append(time.perf_counter() - started)
+    if set(status) != {200}:
+        raise RuntimeError(f"{path} answered {sorted(set(status))}")
+    return samples
+
+
+def bench_requests(requests: int):
+    app = build_app()
+    token, _ = issue_token(str(uuid.uuid4()))
+    headers = [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())]
+
+    async def run():
+        # Warm up both routes (and the claims cache) before measuring.
+        await request_latencies(app, "/open", headers, 100)
+        await request_latencies(app, "/authenticated", headers, 100)
+        return (
+            await request_latencies(app, "/open", headers, requests),
+            await request_latencies(app, "/authenticated", headers, requests),
+        )
+
+    open_samples, auth_samples = asyncio.run(run())
+    open_median = statistics.median(open_samples) * 1e6
+    auth_median = statistics.median(auth_samples) * 1e6
+    print(f"request without auth  median {open_median:8.1f} us")
+    print(f"request with auth     median {auth_median:8.1f} us")
+    print(f"auth overhead         median {auth_median - open_median:8.1f} us/request")
+
+
+async def bench_hashing(hashes: int):
+    hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, hashes, settings.PASSWORD_BCRYPT_ROUNDS)
+    await hasher.hash("warm-up-password")
+
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def watch_loop():
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - started - 0.005)
+
+    watcher = asyncio.create_task(watch_loop())
+    started = time.perf_counter()
+    await asyncio.gather(*(hasher.hash(f"password-{index}") for index in range(hashes)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await watcher
+    hasher.shutdown()
+    print(f"bcrypt  {hashes} hashes at cost {settings.PASSWORD_BCRYPT_ROUNDS} on {settings.PASSWORD_HASH_WORKERS} "
+          f"processes: {hashes / elapsed:.1f} hashes/s, worst event loop stall {stall * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--hash", action="store_true", help="Also benchmark the password hashing pool")
+    parser.add_argument("--hashes", type=int, default=32)
+    args = parser.parse_args()
+
+    bench_tokens(args.iterations)
+    bench_requests(args.requests)
+    if args.hash:
+        asyncio.run(bench_hashing(args.hashes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Friend graph benchmark.
+
+Builds a synthetic social graph of --users users and roughly --edges
+directed accepted friendship rows (default: 1M, i.e. 500k friendships
+stored in both directions) inside the configured database, then times the
+social graph queries against random users:
+
+    list        friends of X
+    mutuals     mutual friends of X and Y
+    suggestions friends of friends ranked by mutual friends
+    network     2-hop outings at a lake on a date (recursive CTE)
+
+Synthetic users are created with the "bench_graph_" username prefix and
+are removed afterwards unless --keep is given. Rows are generated
+server-side with generate_series, so setup takes seconds, not minutes.
+
+Usage:
+    python scripts/benchmark_friend_graph.py --users 100000 --edges 1000000 --samples 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import SessionLocal, get_engine  # noqa: E402
+from app.services import social_graph  # noqa: E402
+
+PREFIX = "bench_graph_"
+
+
+def build_graph(users: int, edges: int, outings: int, bench_date: date):
+    with get_engine().begin() as conn:
+        conn.execute(text("""
+            INSERT INTO users (id, created_at, updated_at, username, email, password_hash, owns_boat)
+            SELECT gen_random_uuid(), now(), now(), :prefix || g, :prefix || g || '@example.invalid', 'x', false
+            FROM generate_series(1, :users) AS g
+        """), {"prefix": PREFIX, "users": users})
+        conn.execute(text("""
+            CREATE TEMP TABLE bench_graph_ids ON COMMIT DROP AS
+            SELECT row_number() OVER (ORDER BY id) AS n, id FROM users WHERE username LIKE :pattern
+        """), {"pattern": PREFIX + "%"})
+        conn.execute(text("CREATE INDEX ON bench_graph_ids (n)"))
+        conn.execute(text("""
+            INSERT INTO friendships (id, created_at, updated_at, user_id, friend_id, status)
+            SELECT gen_random_uuid(), now(), now(), a.id, b.id, 'accepted'
+            FROM (
+                SELECT DISTINCT least(x, y) AS x, greatest(x, y) AS y
+                FROM (
+                    SELECT 1 + floor(random() * :users)::int AS x, 1 + floor(random() * :users)::int AS y
+                    FROM generate_series(1, :pairs)
+                ) AS candidates
+                WHERE x <> y
+            ) AS pairs
+            CROSS JOIN LATERAL (VALUES (pairs.x, pairs.y), (pairs.y, pairs.x)) AS directed(from_n, to_n)
+            JOIN bench_graph_ids AS a ON a.n = directed.from_n
+            JOIN bench_graph_ids AS b ON b.n = directed.to_n
+        """), {"users": users, "pairs": edges // 2})
+
+        lake_id = conn.execute(text("SELECT id FROM lakes LIMIT 1")).scalar()
+        if lake_id is None:
+            lake_id = conn.execute(text("""
+                INSERT INTO lakes (id, created_at, updated_at, name, latitude, longitude)
+                VALUES (gen_random_uuid(), now(), now(), :name, 36.0, -82.0)
+                RETURNING id
+            """), {"name": PREFIX + "lake"}).scalar()
+        conn.execute(text("""
+            INSERT INTO outings (id, created_at, updated_at, user_id, lake_id, planned_date, time_slot)
+            SELECT gen_random_uuid(), now(), now(), ids.id, :lake_id, :planned_date, 'morning'
+            FROM bench_graph_ids AS ids
+            WHERE ids.n IN (SELECT 1 + floor(random() * :users)::int FROM generate_series(1, :outings))
+        """), {"lake_id": lake_id, "planned_date": bench_date, "users": users, "outings": outings})
+
+    with get_engine().connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE friendships"))
+    return lake_id
+
+
+def drop_graph():
+    with get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE username LIKE :pattern"), {"pattern": PREFIX + "%"})
+        conn.execute(text("DELETE FROM lakes WHERE name = :name"), {"name": PREFIX + "lake"})
+
+
+def timed(samples: int, query) -> list:
+    timings = []
+    db = SessionLocal()
+    try:
+        for _ in range(samples):
+            started = time.perf_counter()
+            query(db)
+            timings.append(time.perf_counter() - started)
+    finally:
+        db.close()
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+    print(f"{name:<12} n={len(timings):<5} "
+          f"median={statistics.median(timings) * 1000:7.2f} ms  "
+          f"p95={p95 * 1000:7.2f} ms  max={timings[-1] * 1000:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Directed friendship rows to generate")
+    parser.add_argument("--outings", type=int, default=20_000, help="Outings to plan on the benchmark date")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic graph afterwards")
+    args = parser.parse_args()
+
+    bench_date = date.today() + timedelta(days=365)
+    started = time.perf_counter()
+    lake_id = build_graph(args.users, args.edges, args.outings, bench_date)
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("""
+            SELECT count(*) FROM friendships f JOIN users u ON u.id = f.user_id WHERE u.username LIKE :pattern
+        """), {"pattern": PREFIX + "%"}).scalar()
+        user_ids = [row[0] for row in conn.execute(
+            text("SELECT id FROM users WHERE username LIKE :pattern"), {"pattern": PREFIX + "%"}
+        )]
+    print(f"Built {len(user_ids)} users / {rows} directed edges in {time.perf_counter() - started:.1f}s\n")
+
+    try:
+        pick = random.Random(42).choice
+        report("list", timed(args.samples, lambda db: social_graph.list_friends(db, pick(user_ids))))
+        report("mutuals", timed(args.samples, lambda db: social_graph.mutual_friends(db, pick(user_ids), pick(user_ids))))
+        report("suggestions", timed(args.samples, lambda db: social_graph.friend_suggestions(db, pick(user_ids))))
+        report("network", timed(args.samples, lambda db: social_graph.network_outings(
+            db, pick(user_ids), lake_id, bench_date, max_hops=2
+        )))
+    finally:
+        if not args.keep:
+            drop_graph()
+
+
+if __name__ == "__main__":
+    main()
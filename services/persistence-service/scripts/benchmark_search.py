@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+User search benchmark.
+
+Inserts --users synthetic users (default: 5M) with pronounceable random
+usernames, then times /users/search queries in prefix and fuzzy mode,
+including fetching the second page with the returned cursor. Synthetic
+users get the "bench_search_" email prefix and are removed afterwards
+unless --keep is given.
+
+Usage:
+    python scripts/benchmark_search.py --users 5000000 --samples 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.api.search import trigram_search  # noqa: E402
+from app.core import SessionLocal, get_engine  # noqa: E402
+from app.models import User  # noqa: E402
+
+PREFIX = "bench_search_"
+SYLLABLES = ["ka", "lo", "mi", "ne", "ra", "to", "su", "bo", "le", "an", "er", "is", "on", "ch", "sh", "ty"]
+
+
+def build_users(users: int):
+    syllables = "ARRAY[" + ", ".join(f"'{syllable}'" for syllable in SYLLABLES) + "]"
+    with get_engine().begin() as conn:
+        conn.execute(text(f"""
+            INSERT INTO users (id, created_at, updated_at, username, email, password_hash, owns_boat)
+            SELECT gen_random_uuid(), now(), now(),
+                   (SELECT string_agg(({syllables})[1 + floor(random() * {len(SYLLABLES)})::int], '')
+                    FROM generate_series(1, 3 + g % 4)) || g,
+                   :prefix || g || '@example.invalid', 'x', false
+            FROM generate_series(1, :users) AS g
+        """), {"prefix": PREFIX, "users": users})
+    with get_engine().connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE users"))
+
+
+def drop_users():
+    with get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": PREFIX + "%"})
+
+
+def random_query(rng: random.Random, mode: str) -> str:
+    word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    if mode == "fuzzy":
+        # Drop one character to exercise typo tolerance.
+        index = rng.randrange(len(word))
+        word = word[:index] + word[index + 1:]
+    return word
+
+
+def timed(samples: int, mode: str, rng: random.Random) -> list:
+    timings = []
+    serialize = lambda user: {"id": str(user.id), "username": user.username}
+    db = SessionLocal()
+    try:
+        for _ in range(samples):
+            q = random_query(rng, mode)
+            started = time.perf_counter()
+            page = trigram_search(db, User, User.username, q, mode, 20, None, serialize)
+            timings.append(time.perf_counter() - started)
+            if page["next_cursor"]:
+                started = time.perf_counter()
+                trigram_search(db, User, User.username, q, mode, 20, page["next_cursor"], serialize)
+                timings.append(time.perf_counter() - started)
+    finally:
+        db.close()
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"{name:<8} n={len(timings):<5} "
+          f"median={statistics.median(timings) * 1000:7.2f} ms  "
+          f"p95={p95 * 1000:7.2f} ms  max={timings[-1] * 1000:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic users afterwards")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    build_users(args.users)
+    print(f"Inserted {args.users} users in {time.perf_counter() - started:.1f}s\n")
+
+    try:
+        rng = random.Random(42)
+        report("prefix", timed(args.samples, "prefix", rng))
+        report("fuzzy", timed(args.samples, "fuzzy", rng))
+    finally:
+        if not args.keep:
+            drop_users()
+
+
+if __name__ == "__main__":
+    main()
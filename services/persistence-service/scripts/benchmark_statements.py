@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Statement preparation benchmark.
+
+Times what every request pays before its query reaches the database, for
+the hot lookups, written both ways:
+
+    query       the ORM Query the handlers used to build (db.query(...)
+                .filter(...)), turned into its statement
+    lambda      the lambda statement they use now (app/api/lookups.py and
+                the list_outings / list_amenities filters)
+
+Each iteration builds the statement, computes its cache key and fetches the
+compiled SQL from a warm compiled cache, as the engine does on execute. No
+database is needed; the round trip and loading the rows cost the same
+either way.
+
+With --execute, also times complete lookups of existing rows through a
+session on the configured database, both ways.
+
+Usage:
+    python scripts/benchmark_statements.py --iterations 20000
+    python scripts/benchmark_statements.py --execute --lookups 5000
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import exists, func, lambda_stmt, select  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.lookups import get_by_id  # noqa: E402
+from app.core import SessionLocal  # noqa: E402
+from app.models import Amenity, Lake, Outing, OutingParticipant  # noqa: E402
+
+
+def query_get(db, model, entity_id):
+    return db.query(model).filter(model.id == entity_id).limit(1)
+
+
+def lambda_get(model, entity_id):
+    return lambda_stmt(lambda: select(model).where(model.id == entity_id).limit(1))
+
+
+def query_outings(db, user_id, lake_id, start_date, invited_user_id):
+    query = db.query(Outing).filter(Outing.user_id == user_id).filter(Outing.lake_id == lake_id)
+    query = query.filter(Outing.planned_date >= start_date)
+    query = query.filter(exists().where(
+        OutingParticipant.outing_id == Outing.id,
+        OutingParticipant.planned_date == Outing.planned_date,
+        OutingParticipant.user_id == invited_user_id,
+    ))
+    return query.order_by(Outing.planned_date, Outing.id).offset(0).limit(100)
+
+
+def lambda_outings(user_id, lake_id, start_date, invited_user_id):
+    stmt = lambda_stmt(lambda: select(Outing))
+    stmt += lambda s: s.where(Outing.user_id == user_id)
+    stmt += lambda s: s.where(Outing.lake_id == lake_id)
+    stmt += lambda s: s.where(Outing.planned_date >= start_date)
+    stmt += lambda s: s.where(exists().where(
+        OutingParticipant.outing_id == Outing.id,
+        OutingParticipant.planned_date == Outing.planned_date,
+        OutingParticipant.user_id == invited_user_id,
+    ))
+    stmt += lambda s: s.order_by(Outing.planned_date, Outing.id)
+    return stmt + (lambda s: s.offset(0).limit(100))
+
+
+def query_amenities(db, lake_id, amenity_type):
+    query = db.query(Amenity).filter(Amenity.lake_id == lake_id).filter(Amenity.type == amenity_type)
+    return query.order_by(Amenity.id).offset(0).limit(100)
+
+
+def lambda_amenities(lake_id, amenity_type):
+    stmt = lambda_stmt(lambda: select(Amenity))
+    stmt += lambda s: s.where(Amenity.lake_id == lake_id)
+    stmt += lambda s: s.where(Amenity.type == amenity_type)
+    stmt += lambda s: s.order_by(Amenity.id)
+    return stmt + (lambda s: s.offset(0).limit(100))
+
+
+def query_amenities_version(db, lake_id, amenity_type):
+    query = db.query(Amenity).filter(Amenity.lake_id == lake_id).filter(Amenity.type == amenity_type)
+    return query.with_entities(func.count(Amenity.id), func.max(Amenity.updated_at))
+
+
+def lambda_amenities_version(lake_id, amenity_type):
+    stmt = lambda_stmt(lambda: select(func.count(Amenity.id), func.max(Amenity.updated_at)))
+    stmt += lambda s: s.where(Amenity.lake_id == lake_id)
+    return stmt + (lambda s: s.where(Amenity.type == amenity_type))
+
+
+def prepare(statement, dialect, cache: dict):
+    # What Connection.execute does before talking to the database: the
+    # cache key, then the compiled form from the cache.
+    return statement._compile_w_cache(
+        dialect, compiled_cache=cache, column_keys=[], for_executemany=False, schema_translate_map=None
+    )
+
+
+def per_call_us(build, iterations: int, dialect, cache: dict) -> float:
+    prepare(build(), dialect, cache)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        prepare(build(), dialect, cache)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench_prepare(iterations: int):
+    dialect = postgresql.dialect()
+    cache = {}
+    db = Session()
+    ids = [uuid.uuid4() for _ in range(4)]
+    day = date.today()
+    cases = [
+        ("get by id", lambda: query_get(db, Lake, ids[0])._statement_20(), lambda: lambda_get(Lake, ids[0])),
+        ("list_outings (4 filters)", lambda: query_outings(db, *ids[:2], day, ids[2])._statement_20(),
+         lambda: lambda_outings(*ids[:2], day, ids[2])),
+        ("list_amenities version", lambda: query_amenities_version(db, ids[3], "pier")._statement_20(),
+         lambda: lambda_amenities_version(ids[3], "pier")),
+        ("list_amenities page", lambda: query_amenities(db, ids[3], "pier")._statement_20(),
+         lambda: lambda_amenities(ids[3], "pier")),
+    ]
+    print(f"{'statement':26s} {'query':>10s} {'lambda':>10s} {'saved':>10s}")
+    for label, build_query, build_lambda in cases:
+        before = per_call_us(build_query, iterations, dialect, cache)
+        after = per_call_us(build_lambda, iterations, dialect, cache)
+        print(f"{label:26s} {before:7.1f} us {after:7.1f} us {before - after:7.1f} us")
+
+
+def bench_execute(lookups: int):
+    db = SessionLocal()
+    try:
+        lake_ids = db.execute(select(Lake.id).limit(1000)).scalars().all()
+        if not lake_ids:
+            raise SystemExit("No lakes in the configured database")
+
+        def timed(lookup) -> float:
+            started = time.perf_counter()
+            for index in range(lookups):
+                lookup(lake_ids[index % len(lake_ids)])
+                db.expunge_all()
+            return (time.perf_counter() - started) / lookups * 1e6
+
+        timed(lambda lake_id: get_by_id(db, Lake, lake_id))
+        before = timed(lambda lake_id: db.query(Lake).filter(Lake.id == lake_id).first())
+        after = timed(lambda lake_id: get_by_id(db, Lake, lake_id))
+        print(f"lake lookup  query {before:7.1f} us  lambda {after:7.1f} us  saved {before - after:7.1f} us")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--execute", action="store_true", help="Also time lookups on the configured database")
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+
+    bench_prepare(args.iterations)
+    if args.execute:
+        bench_execute(args.lookups)
+
+
+if __name__ == "__main__":
+    main()
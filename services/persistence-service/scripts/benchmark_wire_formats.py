@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Wire format benchmark for list responses.
+
+Builds synthetic list_amenities and list_outings payloads with the same
+shape the API returns and reports, for each wire format, the encoded size
+and the time to encode (serialize + compress):
+
+    json, json+gzip, json+br, msgpack, msgpack+gzip, msgpack+br
+
+Formats whose optional package (msgpack, brotli) is not installed are
+skipped. Compression settings match the service defaults.
+
+Usage:
+    python scripts/benchmark_wire_formats.py --items 100 1000 --repeat 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings  # noqa: E402
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+AMENITY_TYPES = ["rope_swing", "picnic_area", "fishing_spot", "swimming_area", "cliff_jump"]
+TIME_SLOTS = ["morning", "afternoon", "evening"]
+
+
+def amenities(count: int, rng: random.Random) -> list:
+    lake_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(5)]
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "lake_id": rng.choice(lake_ids),
+            "type": rng.choice(AMENITY_TYPES),
+            "name": f"Amenity {index}",
+            "latitude": round(36 + rng.random(), 8),
+            "longitude": round(-82 - rng.random(), 8),
+            "capacity_score": rng.randint(1, 10),
+        }
+        for index in range(count)
+    ]
+
+
+def outings(count: int, rng: random.Random) -> list:
+    lake_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(5)]
+    amenity_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(50)]
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "user_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "lake_id": rng.choice(lake_ids),
+            "planned_date": (date.today() + timedelta(days=rng.randint(0, 60))).isoformat(),
+            "time_slot": rng.choice(TIME_SLOTS),
+            "target_amenities": rng.sample(amenity_ids, rng.randint(0, 3)),
+        }
+        for _ in range(count)
+    ]
+
+
+def gzip_compress(data: bytes) -> bytes:
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encoders() -> dict:
+    encode_json = lambda payload: json.dumps(payload, separators=(",", ":")).encode()
+    formats = {
+        "json": encode_json,
+        "json+gzip": lambda payload: gzip_compress(encode_json(payload)),
+    }
+    if brotli is not None:
+        formats["json+br"] = lambda payload: brotli.compress(
+            encode_json(payload), quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+    if msgpack is not None:
+        encode_msgpack = lambda payload: msgpack.packb(payload, use_bin_type=True)
+        formats["msgpack"] = encode_msgpack
+        formats["msgpack+gzip"] = lambda payload: gzip_compress(encode_msgpack(payload))
+        if brotli is not None:
+            formats["msgpack+br"] = lambda payload: brotli.compress(
+                encode_msgpack(payload), quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+    return formats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    missing = [name for name, module in (("msgpack", msgpack), ("brotli", brotli)) if module is None]
+    if missing:
+        print(f"Skipping formats that need: {', '.join(missing)}\n")
+
+    rng = random.Random(42)
+    formats = encoders()
+    for resource, generate in (("amenities", amenities), ("outings", outings)):
+        for count in args.items:
+            payload = generate(count, rng)
+            baseline = None
+            print(f"{resource} x {count}")
+            for name, encode in formats.items():
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    encoded = encode(payload)
+                elapsed = (time.perf_counter() - started) / args.repeat
+                baseline = baseline or len(encoded)
+                print(f"  {name:<13} {len(encoded):>9} bytes  {len(encoded) / baseline:6.1%}  "
+                      f"{elapsed * 1000:8.3f} ms")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Cold start measurement for the persistence service.
+
+Launches the service with uvicorn several times and reports how long it
+takes from process launch until the first successful HTTP response, along
+with the readiness report at that moment.
+
+Usage:
+    python scripts/measure_cold_start.py --runs 5 --mode api
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def measure_once(port: int, mode: str, timeout: float) -> dict:
+    env = dict(os.environ, RUN_MODE=mode, PYTHONPATH=str(SERVICE_ROOT))
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_ROOT,
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                response = requests.get(f"http://127.0.0.1:{port}/health/live", timeout=0.5)
+                if response.status_code == 200:
+                    elapsed = time.perf_counter() - started
+                    ready = requests.get(f"http://127.0.0.1:{port}/health/ready", timeout=5).json()
+                    return {"seconds": elapsed, "ready": ready}
+            except requests.ConnectionError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"Service did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=["api", "worker", "all"], default="api")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    samples = []
+    for run in range(args.runs):
+        result = measure_once(args.port, args.mode, args.timeout)
+        samples.append(result["seconds"])
+        print(f"run {run + 1}: first response after {result['seconds'] * 1000:.0f} ms "
+              f"(readiness: {result['ready']['status']}, components: {result['ready']['components']})")
+
+    print(f"\nmode={args.mode} runs={args.runs} "
+          f"median={statistics.median(samples) * 1000:.0f} ms "
+          f"min={min(samples) * 1000:.0f} ms max={max(samples) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
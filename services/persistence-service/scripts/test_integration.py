@@ -7,13 +7,19 @@ Sets up test data:
 - Rope swing amenity
 - Boat ramp
 - Homer Simpson as a user
+
+Homer signs up first; the rest of the API needs his access token.
 """
 
 import requests
 import json
+import uuid
 from datetime import datetime
 
 API_BASE_URL = "http://localhost:8000/api/v1"
+PASSWORD = "doh!-doh!-doh!"
+
+session = requests.Session()
 
 
 def create_lake():
@@ -24,7 +30,7 @@ def create_lake():
         "longitude": -82.4167
     }
 
-    response = requests.post(f"{API_BASE_URL}/lakes/", json=lake_data)
+    response = session.post(f"{API_BASE_URL}/lakes/", json=lake_data)
     response.raise_for_status()
     lake = response.json()
     print(f"✓ Created lake: {lake['name']} (ID: {lake['id']})")
@@ -46,7 +52,7 @@ def create_amenity(lake_id):
         }
     }
 
-    response = requests.post(f"{API_BASE_URL}/amenities/", json=amenity_data)
+    response = session.post(f"{API_BASE_URL}/amenities/", json=amenity_data)
     response.raise_for_status()
     amenity = response.json()
     print(f"✓ Created amenity: {amenity['name']} (ID: {amenity['id']})")
@@ -70,20 +76,19 @@ def create_boat_ramp(lake_id):
         "is_active": True
     }
 
-    response = requests.post(f"{API_BASE_URL}/boat-ramps/", json=ramp_data)
+    response = session.post(f"{API_BASE_URL}/boat-ramps/", json=ramp_data)
     response.raise_for_status()
     ramp = response.json()
     print(f"✓ Created boat ramp: {ramp['name']} (ID: {ramp['id']})")
     return ramp
 
 
-def create_user(lake_id):
+def create_user():
     """Create Homer Simpson as a user."""
     user_data = {
         "username": "hsimpson",
         "email": "homer@example.com",
-        "password_hash": "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5NU7t.6cLxHQW",  # hashed "doh!"
-        "preferred_lake_id": lake_id,
+        "password": PASSWORD,
         "owns_boat": True,
         "schedule_preferences": {
             "weekday": {
@@ -117,31 +122,74 @@ def create_user(lake_id):
         }
     }
 
-    response = requests.post(f"{API_BASE_URL}/users/", json=user_data)
+    response = session.post(f"{API_BASE_URL}/users/", json=user_data)
     response.raise_for_status()
     user = response.json()
     print(f"✓ Created user: {user['username']} ({user['email']}) (ID: {user['id']})")
     return user
 
 
+def authenticate(username):
+    """Log in and send the access token with every later request."""
+    response = session.post(f"{API_BASE_URL}/auth/token", json={"username": username, "password": PASSWORD})
+    response.raise_for_status()
+    session.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    print(f"✓ Logged in as {username}")
+
+
+def set_preferred_lake(user_id, lake_id):
+    """Make Boone Lake Homer's preferred lake."""
+    response = session.patch(f"{API_BASE_URL}/users/{user_id}", json={"preferred_lake_id": lake_id})
+    response.raise_for_status()
+    print(f"✓ Set preferred lake of {response.json()['username']}")
+
+
+def verify_search_paging():
+    """Page through fuzzy search results that tie on score at every page boundary."""
+    name = f"Tie Lake {uuid.uuid4().hex[:8]}"
+    created = set()
+    for index in range(5):
+        response = session.post(f"{API_BASE_URL}/lakes/", json={"name": name, "latitude": 36.5, "longitude": -82.4 - index / 100})
+        response.raise_for_status()
+        created.add(response.json()["id"])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": name, "mode": "fuzzy", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = session.get(f"{API_BASE_URL}/lakes/search", params=params)
+        response.raise_for_status()
+        page = response.json()
+        seen.extend(result["id"] for result in page["results"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    if len(seen) != len(set(seen)) or not created <= set(seen):
+        raise AssertionError(f"Search paging over tied scores skipped or repeated lakes: {seen}")
+    print(f"✓ Paged through {len(created)} equally ranked lakes 2 at a time without gaps or repeats")
+
+
 def verify_setup():
     """Verify all data was created correctly."""
     print("\n--- Verification ---")
 
     # Check lakes
-    response = requests.get(f"{API_BASE_URL}/lakes/")
+    response = session.get(f"{API_BASE_URL}/lakes/")
     response.raise_for_status()
     lakes = response.json()
     print(f"✓ Total lakes: {len(lakes)}")
 
     # Check amenities
-    response = requests.get(f"{API_BASE_URL}/amenities/")
+    response = session.get(f"{API_BASE_URL}/amenities/")
     response.raise_for_status()
     amenities = response.json()
     print(f"✓ Total amenities: {len(amenities)}")
 
     # Check users
-    response = requests.get(f"{API_BASE_URL}/users/")
+    response = session.get(f"{API_BASE_URL}/users/")
     response.raise_for_status()
     users = response.json()
     print(f"✓ Total users: {len(users)}")
@@ -149,7 +197,7 @@ def verify_setup():
     # Show Homer's details
     if users:
         homer = users[0]
-        response = requests.get(f"{API_BASE_URL}/users/{homer['id']}")
+        response = session.get(f"{API_BASE_URL}/users/{homer['id']}")
         response.raise_for_status()
         homer_details = response.json()
         print(f"\n--- Homer Simpson Details ---")
@@ -172,6 +220,10 @@ def main():
 
         print("--- Creating Test Data ---")
 
+        # Create user and log in
+        user = create_user()
+        authenticate(user['username'])
+
         # Create lake
         lake = create_lake()
 
@@ -188,8 +240,8 @@ def main():
             else:
                 raise
 
-        # Create user
-        user = create_user(lake['id'])
+        set_preferred_lake(user['id'], lake['id'])
+        verify_search_paging()
 
         # Verify everything
         verify_setup()